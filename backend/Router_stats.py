@@ -1,26 +1,46 @@
 import paramiko
-import re
 import time
 import socket
-from typing import Dict, Any
+import select
+import re
+from dataclasses import asdict
+from typing import Dict, Any, List, Optional
+from backend.ssh_client import RouterSSHClient
+from backend.stats_parsers import (
+    ParseError, MemoryPool, detect_platform, get_parsers,
+    format_uptime, primary_memory_percent
+)
+
+PROMPT = re.compile(r"[\w.\-@/:()]+[>#]\s*$")
+PROMPT_TAIL = 128
+
+# Platform detected per host, so 'show version' runs once rather than every poll
+_platform_cache: Dict[str, str] = {}
 
 class RouterMonitorError(Exception):
     """Base exception for monitoring errors"""
     pass
 
 class SSHRouterMonitor:
-    def __init__(self, host: str, username: str, password: str):
+    def __init__(self, host: str, username: str, password: str, profile: str = "lean",
+                 interfaces: bool = False):
         self.host = host 
         self.username = username
         self.password = password
+        self.profile = profile
+        self.interfaces = interfaces
         self.ssh = None
         self.channel = None
         self.connected = False
+        self.platform = None
+        self.parsers = get_parsers("IOS")
+        self.bytes_received = 0
+        self._stale = False
 
     def connect(self) -> bool:
         """Handle both IP addresses and hostnames with proper DNS resolution"""
         try:
-            self.ssh = paramiko.SSHClient()
+            self.ssh = RouterSSHClient()
             self.ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             self.ssh.connect(
                 self.host,
@@ -33,6 +53,7 @@ class SSHRouterMonitor:
             self.channel = self.ssh.invoke_shell()
             self._wait_for_prompt()
             self._exec_command("terminal length 0\n")
+            self._detect_platform()
             self.connected = True
             return True
         except socket.gaierror as e:
@@ -42,104 +63,104 @@ class SSHRouterMonitor:
         except Exception as e:
             raise RouterMonitorError(f"Connection failed: {str(e)}") from e
 
+    def _wait_readable(self, timeout: float) -> bool:
+        """Block until the channel has data instead of polling on a timer"""
+        if self.channel.recv_ready():
+            return True
+        readable, _, _ = select.select([self.channel], [], [], max(timeout, 0))
+        return bool(readable)
+
+    def _recv(self) -> str:
+        data = self.channel.recv(4096)
+        self.bytes_received += len(data)
+        return data.decode('utf-8', 'ignore')
+
     def _wait_for_prompt(self, timeout: int = 10):
         """Wait for router prompt to appear"""
-        end_time = time.time() + timeout
+        end_time = time.monotonic() + timeout
         output = ""
-        while time.time() < end_time:
-            if self.channel.recv_ready():
-                output += self.channel.recv(4096).decode('utf-8', 'ignore')
-                if '#' in output or '>' in output:
-                    return
-            time.sleep(0.1)
+        while self._wait_readable(end_time - time.monotonic()):
+            output += self._recv()
+            if PROMPT.search(output[-PROMPT_TAIL:]):
+                return
+            if time.monotonic() >= end_time:
+                break
         raise RouterMonitorError("Prompt not detected - check credentials")
 
-    def _exec_command(self, command: str, timeout: int = 5) -> str:
+    def _exec_command(self, command: str, timeout: int = 5, done=None) -> str:
         """Execute command and return cleaned output"""
         try:
+            if self._stale:
+                # Discard what is left of an output we stopped reading early
+                self._read_until_prompt(2)
             self.channel.send(command)
-            return self._read_until_prompt(timeout)
+            return self._read_until_prompt(timeout, done)
         except Exception as e:
             raise RouterMonitorError(f"Command failed: {str(e)}") from e
 
-    def _read_until_prompt(self, timeout: int) -> str:
-        """Read output until router prompt appears"""
-        end_time = time.time() + timeout
-        output = []
-        while time.time() < end_time:
-            if self.channel.recv_ready():
-                data = self.channel.recv(4096).decode('utf-8', 'ignore')
-                output.append(data)
-                if any(prompt in data for prompt in ('#', '>')):
-                    break
-            time.sleep(0.1)
-        return ''.join(output).replace('\r', '')
+    def _read_until_prompt(self, timeout: int, done=None) -> str:
+        """Read output until router prompt appears, or until done matches"""
+        end_time = time.monotonic() + timeout
+        output = ""
+        self._stale = False
+        while self._wait_readable(end_time - time.monotonic()):
+            chunk = self._recv()
+            if not chunk and self.channel.closed:
+                break
+            output += chunk
+            if PROMPT.search(output[-PROMPT_TAIL:]):
+                break
+            if done is not None and done.search(output):
+                self._stale = True
+                break
+            if time.monotonic() >= end_time:
+                break
+        return output.replace('\r', '')
+
+    def _detect_platform(self):
+        """Pick the parser set for this device once per session"""
+        platform = _platform_cache.get(self.host)
+        if platform is None:
+            version_output = self._exec_command("show version\n", timeout=7)
+            platform = detect_platform(version_output)
+            _platform_cache[self.host] = platform
+        self.platform = platform
+        self.parsers = get_parsers(platform)
 
     def _parse_cpu(self, output: str) -> float:
-        """Parse CPU usage from various router outputs"""
-        patterns = [
-            r"CPU utilization for five seconds: (\d+%)/.*?",
-            r"CPU Total.*?(\d+)%",
-            r"Processor load:\s+(\d+)%",
-            r"CPU Load \d+ minutes:\s+(\d+)%"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, output)
-            if match:
-                try:
-                    return float(match.group(1).replace('%', ''))
-                except (ValueError, IndexError):
-                    continue
-        raise RouterMonitorError("CPU data not found in output")
+        """Parse current CPU usage with the platform template"""
+        try:
+            return self.parsers.parse_cpu(output).current
+        except ParseError as e:
+            raise RouterMonitorError(str(e)) from e
+
+    def _parse_memory_pools(self, output: str) -> List[MemoryPool]:
+        try:
+            return self.parsers.parse_memory(output)
+        except ParseError as e:
+            raise RouterMonitorError(str(e)) from e
 
     def _parse_memory(self, output: str) -> float:
-        """Parse memory usage with unit conversion"""
-        patterns = [
-            (r"Processor\s+\S+\s+(\d+)\s+(\d+)\s+(\d+)", 3),  # Cisco IOS
-            (r"(\d+)K\s+(\d+)K\s+(\d+)K", 3),  # Memory in KB
-            (r"(\d+)M\s+(\d+)M\s+(\d+)M", 3),  # Memory in MB
-        ]
-
-        for pattern, groups in patterns:
-            match = re.search(pattern, output)
-            if match:
-                try:
-                    if groups == 3:
-                        total = int(match.group(1))
-                        used = int(match.group(2))
-                        return (used / total) * 100
-                except (ValueError, ZeroDivisionError) as e:
-                    raise RouterMonitorError("Invalid memory values") from e
-        raise RouterMonitorError("Memory data not found in output")
+        """Parse memory usage percentage of the platform's main pool"""
+        try:
+            return primary_memory_percent(self.parsers, self._parse_memory_pools(output))
+        except ParseError as e:
+            raise RouterMonitorError("Invalid memory values") from e
+
+    def _parse_uptime_seconds(self, output: str) -> Optional[int]:
+        try:
+            return self.parsers.parse_uptime(output)
+        except ParseError:
+            return None
 
     def _parse_uptime(self, output: str) -> str:
-        """Parse uptime from various router formats"""
-        patterns = [
-            r"uptime is (.+)",
-            r"System uptime:\s+(.+)",
-            r"Uptime:\s+(.+)",
-            r"Router uptime:\s+(.+)"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, output)
-            if match:
-                return self._format_uptime(match.group(1))
-        return "N/A"
-
-    def _format_uptime(self, raw_uptime: str) -> str:
+        """Parse uptime into the compact display form"""
+        seconds = self._parse_uptime_seconds(output)
+        return self._format_uptime(seconds) if seconds is not None else "N/A"
+
+    def _format_uptime(self, seconds: int) -> str:
         """Normalize uptime format"""
-        replacements = [
-            (r"(\d+) years?", r"\1y"),
-            (r"(\d+) weeks?", r"\1w"),
-            (r"(\d+) days?", r"\1d"),
-            (r"(\d+) hours?", r"\1h"),
-            (r"(\d+) minutes?", r"\1m")
-        ]
-        for pattern, replacement in replacements:
-            raw_uptime = re.sub(pattern, replacement, raw_uptime)
-        return raw_uptime.replace(",", "").strip()
+        return format_uptime(seconds)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get router statistics including uptime"""
@@ -147,18 +168,62 @@ class SSHRouterMonitor:
             raise RouterMonitorError("Not connected to router")
 
         try:
-            cpu_output = self._exec_command("show processes cpu\n", timeout=7)
-            mem_output = self._exec_command("show memory statistics\n", timeout=7)
-            uptime_output = self._exec_command("show version | include uptime\n", timeout=5)
-            
-            return {
-                'cpu': self._parse_cpu(cpu_output),
-                'memory': self._parse_memory(mem_output),
-                'uptime': self._parse_uptime(uptime_output)
-            }
+            start_bytes = self.bytes_received
+            start_time = time.monotonic()
+            try:
+                stats = self._poll(self.profile)
+                profile = self.profile
+            except (RouterMonitorError, ParseError):
+                if self.profile != "lean":
+                    raise
+                # Device rejected the filters; fall back to unfiltered output
+                stats = self._poll("full")
+                profile = "full"
+            stats.update({
+                'platform': self.platform,
+                'profile': profile,
+                'poll_bytes': self.bytes_received - start_bytes,
+                'poll_seconds': round(time.monotonic() - start_time, 3)
+            })
+            return stats
         except Exception as e:
             raise RouterMonitorError(f"Failed to get stats: {str(e)}") from e
 
+    def _poll(self, profile: str) -> Dict[str, Any]:
+        parsers = self.parsers
+        cpu_command, memory_command, uptime_command = parsers.commands(profile)
+
+        uptime_output = self._exec_command(f"{uptime_command}\n", timeout=5)
+        mem_output = None
+        if memory_command != cpu_command:
+            mem_output = self._exec_command(f"{memory_command}\n", timeout=7)
+        # CPU goes last: its figures are on the first line, so once they are
+        # parsed the rest of the output is never read
+        cpu_output = self._exec_command(f"{cpu_command}\n", timeout=7, done=parsers.cpu_done)
+        if mem_output is None:
+            mem_output = cpu_output
+
+        pools = self._parse_memory_pools(mem_output)
+        uptime_seconds = self._parse_uptime_seconds(uptime_output)
+        stats = {
+            'cpu': self._parse_cpu(cpu_output),
+            'memory': primary_memory_percent(parsers, pools),
+            'uptime': self._format_uptime(uptime_seconds) if uptime_seconds is not None else "N/A",
+            'uptime_seconds': uptime_seconds,
+            'memory_pools': [asdict(pool) for pool in pools]
+        }
+        if self.interfaces:
+            stats['interfaces'] = self._poll_interfaces(profile)
+        return stats
+
+    def _poll_interfaces(self, profile: str) -> List[Dict[str, Any]]:
+        """Octet, error and drop counters for every interface"""
+        output = self._exec_command(f"{self.parsers.interfaces_command(profile)}\n", timeout=10)
+        try:
+            return [asdict(counters) for counters in self.parsers.parse_interfaces(output)]
+        except ParseError as e:
+            raise RouterMonitorError(str(e)) from e
+
     def disconnect(self):
         """Clean up connections"""
         try:
@@ -170,15 +235,36 @@ class SSHRouterMonitor:
             pass
         self.connected = False
 
-def get_router_stats(host: str, username: str, password: str) -> Dict[str, Any]:
+def get_router_stats(host: str, username: str, password: str, profile: str = "lean",
+                     interfaces: bool = False) -> Dict[str, Any]:
     """Retrieve router statistics with comprehensive error handling"""
-    monitor = SSHRouterMonitor(host, username, password)
+    monitor = SSHRouterMonitor(host, username, password, profile, interfaces)
     try:
         monitor.connect()
         return monitor.get_stats()
     except RouterMonitorError as e:
-        return {'error': str(e), 'cpu': None, 'memory': None, 'uptime': "N/A"}
+        return {'error': str(e), 'cpu': None, 'memory': None, 'uptime': "N/A", 'uptime_seconds': None}
     except Exception as e:
-        return {'error': f'Unexpected error: {str(e)}', 'cpu': None, 'memory': None, 'uptime': "N/A"}
+        return {'error': f'Unexpected error: {str(e)}', 'cpu': None, 'memory': None, 'uptime': "N/A", 'uptime_seconds': None}
     finally:
-        monitor.disconnect()
\ No newline at end of file
+        monitor.disconnect()
+
+def compare_poll_profiles(host: str, username: str, password: str) -> Dict[str, Any]:
+    """Poll once with each profile and report bytes and wall time saved by 'lean'"""
+    results = {}
+    for profile in ("full", "lean"):
+        stats = get_router_stats(host, username, password, profile)
+        if stats.get('error'):
+            raise RouterMonitorError(stats['error'])
+        results[profile] = {'bytes': stats['poll_bytes'], 'seconds': stats['poll_seconds']}
+    results['bytes_saved'] = results['full']['bytes'] - results['lean']['bytes']
+    results['seconds_saved'] = round(results['full']['seconds'] - results['lean']['seconds'], 3)
+    return results
+
+def get_stats_for_router(router: Dict[str, Any], interfaces: bool = False) -> Dict[str, Any]:
+    """Collect stats with the backend configured for the router (ssh or snmp)"""
+    if router.get('stats_backend') == 'snmp':
+        from backend.snmp_stats import get_router_stats_snmp
+        return get_router_stats_snmp(router)
+    return get_router_stats(router['ip'], router['username'], router['password'],
+                            interfaces=interfaces)
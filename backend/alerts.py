@@ -0,0 +1,200 @@
+import threading
+import warnings
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Any
+from backend.metrics_store import get_metrics_store
+from backend.events import make_event, record_events
+
+WINDOW = 60  # samples per series the anomaly detectors look back over
+METRICS = ("cpu", "memory")
+
+
+@dataclass(frozen=True)
+class Detector:
+    """One alert rule: a per-router score compared against raise/clear levels
+
+    The clear level sits below the raise level (hysteresis) and a condition
+    has to hold for a number of consecutive evaluations before the alert
+    changes state, so a value hovering around the limit does not flap.
+    """
+    name: str
+    metric: str
+    kind: str          # 'threshold', 'zscore' or 'ewma'
+    raise_level: float
+    clear_level: float
+    severity: str = "warning"
+    raise_after: int = 2
+    clear_after: int = 2
+    label: str = ""
+
+
+DETECTORS = [
+    Detector("cpu_high", "cpu", "threshold", 80, 70, "critical", label="CPU high"),
+    Detector("memory_high", "memory", "threshold", 85, 75, "critical", label="Memory high"),
+    Detector("cpu_zscore", "cpu", "zscore", 3.0, 2.0, label="CPU anomaly"),
+    Detector("memory_zscore", "memory", "zscore", 3.0, 2.0, label="Memory anomaly"),
+    Detector("cpu_ewma", "cpu", "ewma", 3.0, 2.0, label="CPU drift"),
+    Detector("memory_ewma", "memory", "ewma", 3.0, 2.0, label="Memory drift"),
+]
+
+# Floor for the spread used by the anomaly scores, so a perfectly flat
+# series does not turn a one-point wiggle into an infinite score
+MIN_SPREAD = {"cpu": 1.0, "memory": 0.5}
+EWMA_ALPHA = 0.1
+MIN_HISTORY = 10  # earlier samples needed before the anomaly scores count
+
+
+def window_matrix(store, routers: List[str], metric: str, window: int = WINDOW) -> np.ndarray:
+    """Last window samples of every router as rows, right-aligned and NaN padded"""
+    matrix = np.full((len(routers), window), np.nan)
+    for row, router in enumerate(routers):
+        _, values = store.window(router, metric, window)
+        if len(values):
+            matrix[row, window - len(values):] = values
+    return matrix
+
+def zscore_scores(matrix: np.ndarray, metric: str) -> np.ndarray:
+    """How many standard deviations the latest sample is from the earlier ones"""
+    history, latest = matrix[:, :-1], matrix[:, -1]
+    with warnings.catch_warnings():
+        # Rows with no history yet are expected and come out as NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(history, axis=1)
+        spread = np.maximum(np.nanstd(history, axis=1), MIN_SPREAD[metric])
+    scores = np.abs(latest - mean) / spread
+    scores[np.count_nonzero(~np.isnan(history), axis=1) < MIN_HISTORY] = np.nan
+    return scores
+
+def ewma_scores(matrix: np.ndarray, metric: str, alpha: float = EWMA_ALPHA) -> np.ndarray:
+    """Deviation of the latest sample from an exponentially weighted baseline"""
+    history, latest = matrix[:, :-1], matrix[:, -1]
+    # Weight (1 - alpha)^age for each earlier sample; missing samples weigh nothing
+    ages = np.arange(history.shape[1] - 1, -1, -1)
+    weights = np.where(np.isnan(history), 0.0, (1 - alpha) ** ages)
+    filled = np.nan_to_num(history)
+    total = weights.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (weights * filled).sum(axis=1) / total
+        variance = (weights * (filled - mean[:, None]) ** 2).sum(axis=1) / total
+    spread = np.maximum(np.sqrt(variance), MIN_SPREAD[metric])
+    scores = np.abs(latest - mean) / spread
+    scores[np.count_nonzero(weights, axis=1) < MIN_HISTORY] = np.nan
+    return scores
+
+
+class AlertEngine:
+    """Evaluates every detector for a batch of routers with array operations
+
+    Alert state (active flag and consecutive-evaluation streaks) is kept in
+    arrays with one row per router, so raising, clearing and deduplication
+    are also vectorized. Only transitions produce events.
+    """
+
+    def __init__(self, detectors=DETECTORS, store=None):
+        self.detectors = list(detectors)
+        self.store = store or get_metrics_store()
+        self.rows: Dict[str, int] = {}
+        size = 64
+        self.active = np.zeros((size, len(self.detectors)), dtype=bool)
+        self.raise_streak = np.zeros((size, len(self.detectors)), dtype=np.int32)
+        self.clear_streak = np.zeros((size, len(self.detectors)), dtype=np.int32)
+        self.values = np.full((size, len(self.detectors)), np.nan)
+        self.raise_levels = np.array([d.raise_level for d in self.detectors])
+        self.clear_levels = np.array([d.clear_level for d in self.detectors])
+        self.raise_after = np.array([d.raise_after for d in self.detectors])
+        self.clear_after = np.array([d.clear_after for d in self.detectors])
+        self._lock = threading.Lock()
+
+    def _row_indices(self, routers: List[str]) -> np.ndarray:
+        for router in routers:
+            if router not in self.rows:
+                self.rows[router] = len(self.rows)
+        size = len(self.active)
+        if len(self.rows) > size:
+            extra = max(size, len(self.rows) - size)
+            self.active = np.vstack([self.active, np.zeros((extra, len(self.detectors)), dtype=bool)])
+            self.raise_streak = np.vstack([self.raise_streak, np.zeros((extra, len(self.detectors)), dtype=np.int32)])
+            self.clear_streak = np.vstack([self.clear_streak, np.zeros((extra, len(self.detectors)), dtype=np.int32)])
+            self.values = np.vstack([self.values, np.full((extra, len(self.detectors)), np.nan)])
+        return np.array([self.rows[router] for router in routers], dtype=np.int64)
+
+    def scores(self, routers: List[str]) -> np.ndarray:
+        """(router, detector) matrix of current scores; NaN where there is no data"""
+        matrices = {metric: window_matrix(self.store, routers, metric) for metric in METRICS}
+        columns = []
+        for detector in self.detectors:
+            matrix = matrices[detector.metric]
+            if detector.kind == "threshold":
+                columns.append(matrix[:, -1])
+            elif detector.kind == "zscore":
+                columns.append(zscore_scores(matrix, detector.metric))
+            else:
+                columns.append(ewma_scores(matrix, detector.metric))
+        return np.column_stack(columns)
+
+    def evaluate(self, routers: List[str]) -> List[Dict[str, Any]]:
+        """Run all detectors for the routers that just got a sample, store and return transitions"""
+        if not routers:
+            return []
+        with self._lock:
+            rows = self._row_indices(routers)
+            scores = self.scores(routers)
+            known = ~np.isnan(scores)
+            over = known & (scores >= self.raise_levels)
+            under = known & (scores < self.clear_levels)
+
+            raise_streak = np.where(over, self.raise_streak[rows] + 1, 0)
+            clear_streak = np.where(under, self.clear_streak[rows] + 1, 0)
+            active = self.active[rows]
+            raised = ~active & (raise_streak >= self.raise_after)
+            cleared = active & (clear_streak >= self.clear_after)
+
+            self.raise_streak[rows] = raise_streak
+            self.clear_streak[rows] = clear_streak
+            self.active[rows] = (active | raised) & ~cleared
+            self.values[rows] = scores
+
+            transitions = []
+            for i, j in zip(*np.nonzero(raised | cleared)):
+                transitions.append(self._event(routers[i], self.detectors[j], bool(raised[i, j]), scores[i, j]))
+        record_events(transitions)
+        return transitions
+
+    def _event(self, router: str, detector: Detector, raised: bool, score: float) -> Dict[str, Any]:
+        state = "raised" if raised else "cleared"
+        if detector.kind == "threshold":
+            detail = f"{detector.metric} at {score:.1f}%"
+        else:
+            detail = f"{detector.metric} {score:.1f} standard deviations from baseline"
+        return make_event(
+            "alert", router, detector.severity if raised else "info",
+            f"{detector.label} {state}: {detail}",
+            alert=detector.name, state=state, metric=detector.metric, value=float(score)
+        )
+
+    def active_alerts(self, router: str) -> List[Tuple[str, str]]:
+        """(label, severity) of the alerts currently raised for a router"""
+        with self._lock:
+            row = self.rows.get(router)
+            if row is None:
+                return []
+            return [(d.label, d.severity) for d, on in zip(self.detectors, self.active[row]) if on]
+
+    def forget(self, router: str):
+        with self._lock:
+            row = self.rows.get(router)
+            if row is not None:
+                self.active[row] = False
+                self.raise_streak[row] = 0
+                self.clear_streak[row] = 0
+
+
+_engine = None
+
+def get_alert_engine() -> AlertEngine:
+    """Shared engine run by the fleet poller and read by the dashboard"""
+    global _engine
+    if _engine is None:
+        _engine = AlertEngine()
+    return _engine
@@ -0,0 +1,492 @@
+import asyncio
+import datetime
+import json
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs, unquote
+from bson import ObjectId
+from pymongo import MongoClient, DESCENDING
+import numpy as np
+from backend.Connect import get_routers
+from backend.events import list_events
+from backend.jobs import (
+    HANDLERS, submit_job, get_job, list_jobs, cancel_job, get_job_queue, FINISHED_STATES
+)
+
+API_HOST = "127.0.0.1"   # local tooling only; put a reverse proxy in front for anything else
+API_PORT = 8750
+API_TOKEN = os.environ.get("NETAPP_API_TOKEN")  # when set, requests need 'Authorization: Bearer <token>'
+MAX_CONNECTIONS = 64     # open client connections; more are answered 503 at once
+DEVICE_CONCURRENCY = 16  # stats/config fetches touching devices at once
+QUEUE_TIMEOUT = 30.0     # seconds a request may wait for a device slot before 503
+MAX_BODY = 1024 * 1024
+STREAM_POLL = 0.5        # seconds between job checks while streaming
+PUBLIC_FIELDS = ("name", "ip", "type", "platform", "stats_backend")
+
+client = MongoClient("mongodb://localhost:27017/")
+db = client["NetworkApp"]
+
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+           404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    __slots__ = ("method", "path", "query", "headers", "body", "params")
+
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self.params: Dict[str, str] = {}
+
+    def arg(self, name: str, default: Any = None) -> Any:
+        values = self.query.get(name)
+        return values[0] if values else default
+
+    def number(self, name: str, default: float) -> float:
+        try:
+            value = float(self.arg(name, default))
+        except ValueError:
+            value = math.nan
+        if not math.isfinite(value):
+            raise ApiError(400, f"Query parameter '{name}' must be a number")
+        return value
+
+    def date(self, name: str) -> Optional[datetime.datetime]:
+        value = self.arg(name)
+        if not value:
+            return None
+        try:
+            return datetime.datetime.fromisoformat(value)
+        except ValueError:
+            raise ApiError(400, f"Query parameter '{name}' must be an ISO date, e.g. 2024-05-01T12:00")
+
+    def json(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError:
+            raise ApiError(400, "Request body is not valid JSON")
+        if not isinstance(data, dict):
+            raise ApiError(400, "Request body must be a JSON object")
+        return data
+
+
+def to_json(value: Any) -> Any:
+    """json.dumps fallback for Mongo documents and NumPy results"""
+    if isinstance(value, (datetime.datetime, ObjectId)):
+        return str(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def encode(data: Any) -> bytes:
+    return json.dumps(data, default=to_json).encode()
+
+def public_router(router: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: router[field] for field in PUBLIC_FIELDS if field in router}
+
+def find_router(name: str) -> Dict[str, Any]:
+    for router in get_routers():
+        if router.get('name') == name:
+            return router
+    raise ApiError(404, f"Router {name} not found")
+
+def job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    job = dict(job)
+    job["id"] = str(job.pop("_id"))
+    job.pop("output", None)
+    return job
+
+
+class ApiServer:
+    """Local HTTP/JSON API over the backend
+
+    Plain asyncio, no web framework: one coroutine per connection, one
+    request per connection. Blocking backend calls run in a thread pool.
+    Device work (stats, config fetch) additionally waits for one of
+    DEVICE_CONCURRENCY slots and is refused with 503 after QUEUE_TIMEOUT.
+    Deployments are jobs on the shared JobQueue, so they keep their
+    per-device session limits, survive client disconnects and show up in
+    the GUI; /jobs/<id>/stream follows one as newline-delimited JSON.
+    Without a token only the public routes (health, inventory, handlers,
+    job list) are served; anything that touches a device, returns
+    configuration or log output, or changes state is refused with 403
+    rather than left open to any local process.
+    """
+
+    def __init__(self, host=API_HOST, port=API_PORT, token=API_TOKEN):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.routes: List[Tuple[str, re.Pattern, Callable, bool]] = []
+        self.executor = ThreadPoolExecutor(max_workers=DEVICE_CONCURRENCY + 8, thread_name_prefix="api")
+        self.connections = 0
+        self.served = 0
+        self.error: Optional[str] = None
+        self._device_slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._register_routes()
+
+    # -- routing ---------------------------------------------------------
+
+    def route(self, method: str, pattern: str, handler: Callable, public: bool = False):
+        """Register a handler; only public routes are served without a token"""
+        regex = "^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", pattern) + "$"
+        self.routes.append((method, re.compile(regex), handler, public))
+
+    def _register_routes(self):
+        self.route("GET", "/health", self.health, public=True)
+        self.route("GET", "/routers", self.routers, public=True)
+        self.route("GET", "/routers/{name}/stats", self.stats)
+        self.route("GET", "/routers/{name}/history/{metric}", self.history)
+        self.route("POST", "/routers/{name}/config", self.config)  # fetches and stores a snapshot
+        self.route("GET", "/routers/{name}/snapshots", self.snapshots)
+        self.route("GET", "/routers/{name}/diff", self.diff)
+        self.route("GET", "/handlers", self.handlers, public=True)
+        self.route("GET", "/jobs", self.jobs, public=True)
+        self.route("POST", "/jobs", self.create_job)
+        self.route("GET", "/jobs/{job_id}", self.job)  # includes the job's device output
+        self.route("DELETE", "/jobs/{job_id}", self.cancel)
+        self.route("GET", "/jobs/{job_id}/stream", self.stream_job)
+        self.route("GET", "/logs", self.logs)
+        self.route("GET", "/events", self.events)
+
+    def _match(self, request: Request) -> Tuple[Callable, bool]:
+        allowed = False
+        for method, regex, handler, public in self.routes:
+            match = regex.match(request.path)
+            if match:
+                allowed = True
+                if method == request.method:
+                    request.params = {key: unquote(value) for key, value in match.groupdict().items()}
+                    return handler, public
+        raise ApiError(405 if allowed else 404, f"No route for {request.method} {request.path}")
+
+    # -- helpers ---------------------------------------------------------
+
+    async def blocking(self, function: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def on_device(self, function: Callable, *args) -> Any:
+        """Run device work once a device slot is free, or fail with 503"""
+        try:
+            await asyncio.wait_for(self._device_slots.acquire(), QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise ApiError(503, f"All {DEVICE_CONCURRENCY} device slots busy; retry later")
+        try:
+            return await self.blocking(function, *args)
+        finally:
+            self._device_slots.release()
+
+    # -- endpoints -------------------------------------------------------
+
+    async def health(self, request):
+        return {"status": "ok", "served": self.served, "connections": self.connections,
+                "job_workers": get_job_queue().workers}
+
+    async def routers(self, request):
+        return [public_router(router) for router in await self.blocking(get_routers)]
+
+    async def stats(self, request):
+        from backend.Router_stats import get_stats_for_router
+        router = await self.blocking(find_router, request.params["name"])
+        interfaces = request.arg("interfaces", "0") in ("1", "true", "yes")
+        return await self.on_device(get_stats_for_router, router, interfaces)
+
+    async def history(self, request):
+        from backend.metrics_history import load_history
+        end = time.time()
+        start = end - request.number("hours", 24) * 3600
+        times, values = await self.blocking(load_history, request.params["name"], request.params["metric"], start, end)
+        return {"router": request.params["name"], "metric": request.params["metric"],
+                "t": times, "v": np.where(np.isnan(values), None, values)}
+
+    async def config(self, request):
+        from backend.config_backup import fetch_and_store
+        router = await self.blocking(find_router, request.params["name"])
+        user_ip = request.headers.get("x-forwarded-for", "api")
+        entry, config = await self.on_device(fetch_and_store, router, user_ip, "api")
+        return {"router": router['name'], "hash": entry['hash'] if entry else None, "config": config}
+
+    async def snapshots(self, request):
+        from backend.config_backup import list_snapshots
+        limit = int(request.number("limit", 50))
+        return await self.blocking(list_snapshots, request.params["name"], limit,
+                                   request.arg("changed") in ("1", "true"))
+
+    async def diff(self, request):
+        """Diff two stored snapshots (?from=<hash>&to=<hash>), 'to' defaulting to the latest"""
+        from backend.config_backup import load_snapshot, latest_snapshot
+        from backend.config_diff import diff_configs, diff_summary
+        left_hash = request.arg("from")
+        if not left_hash:
+            raise ApiError(400, "Pass ?from=<snapshot hash> (and optionally &to=<hash>)")
+        right_hash = request.arg("to")
+        if not right_hash:
+            latest = await self.blocking(latest_snapshot, request.params["name"])
+            if not latest:
+                raise ApiError(404, "No snapshots stored for this router")
+            right_hash = latest['hash']
+
+        def compute():
+            try:
+                left, right = load_snapshot(left_hash), load_snapshot(right_hash)
+            except KeyError as e:
+                raise ApiError(404, str(e))
+            rows = diff_configs(left, right)
+            changed = [{"tag": row.tag, "left": row.left, "right": row.right, "depth": row.depth}
+                       for row in rows if row.tag != "equal"]
+            return {"from": left_hash, "to": right_hash, "summary": diff_summary(rows), "rows": changed}
+        return await self.blocking(compute)
+
+    async def handlers(self, request):
+        return sorted(HANDLERS)
+
+    async def jobs(self, request):
+        states = request.arg("state")
+        jobs = await self.blocking(list_jobs, states.split(",") if states else None,
+                                   int(request.number("limit", 100)))
+        return [job_view(job) for job in jobs]
+
+    async def create_job(self, request):
+        """Queue a deployment: {"handler": "...", "router": "<name>", "args": {...}}"""
+        data = request.json()
+        handler = data.get("handler")
+        if handler not in HANDLERS:
+            raise ApiError(400, f"Unknown handler {handler!r}; see GET /handlers")
+        kwargs = dict(data.get("args") or {})
+        name = data.get("router")
+        if not name:
+            raise ApiError(400, "Missing 'router'")
+        router = await self.blocking(find_router, name)
+        if HANDLERS[handler][2] == "router":
+            kwargs["router"] = router
+        else:
+            kwargs["router_name"] = router['name']
+        job_id = await self.blocking(submit_job, handler, kwargs, data.get("description", ""))
+        if job_id is None:
+            raise ApiError(503, "Job store unavailable")
+        return 202, {"id": job_id, "stream": f"/jobs/{job_id}/stream"}
+
+    async def _load_job(self, job_id: str) -> Dict[str, Any]:
+        if not ObjectId.is_valid(job_id):
+            raise ApiError(404, "No such job")
+        job = await self.blocking(get_job, job_id)
+        if job is None:
+            raise ApiError(404, "No such job")
+        return job
+
+    async def job(self, request):
+        job = await self._load_job(request.params["job_id"])
+        view = job_view(job)
+        view["output"] = "".join(job.get("output", []))
+        return view
+
+    async def cancel(self, request):
+        await self._load_job(request.params["job_id"])
+        return {"cancelled": await self.blocking(cancel_job, request.params["job_id"])}
+
+    async def stream_job(self, request):
+        """Newline-delimited JSON: progress changes and output chunks until the job finishes"""
+        job_id = request.params["job_id"]
+        await self._load_job(job_id)
+
+        async def events():
+            seen_output = 0
+            last = None
+            while True:
+                job = await self.blocking(get_job, job_id)
+                if job is None:
+                    return
+                count = job.get("output_count", 0)
+                chunks = job.get("output", [])
+                fresh = min(count - seen_output, len(chunks))
+                if fresh > 0:
+                    yield {"output": "".join(chunks[-fresh:])}
+                seen_output = count
+                status = (job["state"], job.get("progress"), job.get("message"))
+                if status != last:
+                    last = status
+                    yield {"state": job["state"], "progress": job.get("progress"),
+                           "message": job.get("message"), "error": job.get("error")}
+                if job["state"] in FINISHED_STATES:
+                    return
+                await asyncio.sleep(STREAM_POLL)
+        return events()
+
+    async def logs(self, request):
+        limit = min(int(request.number("limit", 100)), 1000)
+        return await self.blocking(lambda: list(db.Logs.find().sort("timestamp", DESCENDING).limit(limit)))
+
+    async def events(self, request):
+        types = request.arg("type")
+        return await self.blocking(
+            list_events, request.arg("router"), types.split(",") if types else None,
+            request.date("since"), min(int(request.number("limit", 200)), 2000)
+        )
+
+    # -- HTTP ------------------------------------------------------------
+
+    async def _read_request(self, reader) -> Request:
+        request_line = await reader.readline()
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise ApiError(400, "Malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        length = headers.get("content-length", "0") or "0"
+        if not length.isdigit():
+            raise ApiError(400, "Invalid Content-Length")
+        length = int(length)
+        if length > MAX_BODY:
+            raise ApiError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        return Request(method.upper(), url.path.rstrip("/") or "/", parse_qs(url.query), headers, body)
+
+    @staticmethod
+    def _head(status: int, content_type: str, extra: str = "") -> bytes:
+        return (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\nConnection: close\r\n{extra}\r\n").encode()
+
+    async def _respond(self, writer, status: int, payload: Any):
+        body = encode(payload)
+        writer.write(self._head(status, "application/json", f"Content-Length: {len(body)}\r\n") + body)
+        await writer.drain()
+
+    async def _stream(self, writer, events):
+        writer.write(self._head(200, "application/x-ndjson", "Transfer-Encoding: chunked\r\n"))
+        async for event in events:
+            line = encode(event) + b"\n"
+            writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            if self.connections > MAX_CONNECTIONS:
+                await self._respond(writer, 503, {"error": "Too many connections"})
+                return
+            try:
+                request = await asyncio.wait_for(self._read_request(reader), 10)
+                if self.token and request.headers.get("authorization") != f"Bearer {self.token}":
+                    raise ApiError(401, "Missing or wrong bearer token")
+                handler, public = self._match(request)
+                if not self.token and not public:
+                    raise ApiError(403, "Set NETAPP_API_TOKEN to use this route")
+                result = await handler(request)
+                status = 200
+                if isinstance(result, tuple):
+                    status, result = result
+                self.served += 1
+                if hasattr(result, "__aiter__"):
+                    await self._stream(writer, result)
+                else:
+                    await self._respond(writer, status, result)
+            except ApiError as e:
+                await self._respond(writer, e.status, {"error": str(e)})
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                await self._respond(writer, 400, {"error": "Incomplete request"})
+            except (ConnectionError, OSError):
+                pass  # client went away, e.g. stopped following a stream
+            except Exception as e:
+                print(f"API error: {e}")
+                await self._respond(writer, 500, {"error": str(e)})
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    # -- lifecycle -------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Serve from a background thread; returns False if the port could not be bound"""
+        if self.running:
+            return True
+        self._ready.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+        return self.error is None and self.running
+
+    def stop(self):
+        if self._loop is not None and self.running:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+
+    def _run(self):
+        self._loop = loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._device_slots = asyncio.Semaphore(DEVICE_CONCURRENCY)
+        try:
+            server = loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+        except OSError as e:
+            self.error = f"Cannot listen on {self.host}:{self.port}: {e}"
+            self._ready.set()
+            loop.close()
+            return
+        get_job_queue().start()
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            server.close()
+            loop.run_until_complete(server.wait_closed())
+            loop.close()
+
+
+_server = None
+
+def get_api_server() -> ApiServer:
+    """Shared server, for embedding in another process"""
+    global _server
+    if _server is None:
+        _server = ApiServer()
+    return _server
+
+
+if __name__ == "__main__":
+    # Companion process: python -m backend.api_server [port]
+    import sys
+    server = ApiServer(port=int(sys.argv[1]) if len(sys.argv) > 1 else API_PORT)
+    if not server.start():
+        raise SystemExit(server.error)
+    print(f"API listening on http://{server.host}:{server.port}"
+          f"{' (bearer token required)' if server.token else ' (public routes only: no NETAPP_API_TOKEN)'}")
+    try:
+        while True:
+            time.sleep(10)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,477 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+from backend.metrics_store import get_metrics_store, set_metrics_store
+from backend.shm_ring import create_shared_store, open_shared_store, SharedStoreView
+from backend.poller import get_fleet_poller
+from backend.probe import get_probe_engine, ProbeState
+from backend.alerts import get_alert_engine
+from backend.interface_rates import get_interface_rates
+from backend.resilience import breaker_state
+
+# Unix socket where available, loopback TCP otherwise (Windows)
+COLLECTOR_SOCKET = os.environ.get("NETAPP_COLLECTOR_SOCKET",
+                                  os.path.join(tempfile.gettempdir(), "netapp-collector.sock"))
+COLLECTOR_TCP = ("127.0.0.1", 8751)
+USE_UNIX_SOCKET = hasattr(socket, "AF_UNIX")
+AUTOSTART = os.environ.get("NETAPP_COLLECTOR_AUTOSTART", "1") == "1"
+
+SUBSCRIBER_QUEUE = 256   # messages buffered per subscriber; a subscriber this far behind is dropped
+SNAPSHOT_SAMPLES = 60    # recent samples per series sent to a new subscriber
+SNAPSHOT_METRICS = ("cpu", "memory", "rtt", "icmp_rtt")
+TOP_INTERFACES = 20
+RECONNECT_DELAY = (1.0, 30.0)
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, default=str).encode() + b"\n"
+
+
+def alerts_message(routers) -> Dict[str, List[Tuple[str, str]]]:
+    engine = get_alert_engine()
+    return {name: engine.active_alerts(name) for name in routers}
+
+def breakers_message(ips) -> Dict[str, Dict[str, Any]]:
+    """Breaker snapshots of the routers that were ever contacted"""
+    states = {ip: breaker_state(ip) for ip in ips}
+    return {ip: state for ip, state in states.items() if state}
+
+
+class CollectorDaemon:
+    """Fleet polling and probing in their own process, published to subscribers
+
+    Runs the fleet poller and the probe engine continuously, independent of
+    any GUI window or login. Every poll cycle and probe sweep is encoded
+    once and written to all subscribers of a local socket as one JSON line,
+    so the device load is the same for one viewer or fifty. A subscriber
+    first receives a snapshot, then the live stream; one that falls
+    SUBSCRIBER_QUEUE messages behind is disconnected and catches up with a
+    fresh snapshot when it reconnects.
+
+    Samples themselves are written to a shared-memory ring that viewers map
+    read-only, so the stream only carries alerts, probe and breaker states
+    and the top interfaces. If the ring cannot be created the samples
+    travel in the stream instead.
+    """
+
+    def __init__(self, path=COLLECTOR_SOCKET, tcp=COLLECTOR_TCP):
+        self.path = path
+        self.tcp = tcp
+        self.poller = None
+        self.probe = None
+        self.store = None
+        self.shared = None
+        self.subscribers: Dict[asyncio.StreamWriter, asyncio.Queue] = {}
+        self.published = 0
+        self.error: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Start publishing and collecting; False if another collector owns the socket"""
+        if self.running:
+            return True
+        if collector_running(self.path, self.tcp):
+            self.error = "Another collector is already running"
+            return False
+        # Before the engines exist, so that they all write to the ring
+        self.shared = create_shared_store()
+        if self.shared is not None:
+            set_metrics_store(self.shared)
+        self.store = get_metrics_store()
+        self.poller = get_fleet_poller()
+        self.probe = get_probe_engine()
+        self._ready.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+        if self.error is not None:
+            return False
+        self.poller.listeners.append(self._on_cycle)
+        self.probe.listeners.append(self._on_sweep)
+        self.poller.start()
+        self.probe.start()
+        return True
+
+    def stop(self):
+        if self.poller is None:
+            return
+        self.poller.stop()
+        self.probe.stop()
+        for listeners, listener in ((self.poller.listeners, self._on_cycle), (self.probe.listeners, self._on_sweep)):
+            if listener in listeners:
+                listeners.remove(listener)
+        if self._loop is not None and self.running:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+        if self.shared is not None:
+            self.shared.close()
+
+    # -- messages --------------------------------------------------------
+
+    def _on_cycle(self, results: Dict[str, Dict[str, Any]]):
+        routers = {router['name']: router['ip'] for router in self.poller._routers.values()}
+        message = {
+            "type": "cycle",
+            "alerts": alerts_message(results),
+            "breakers": breakers_message([routers[name] for name in results if name in routers]),
+            "top_interfaces": get_interface_rates().top(TOP_INTERFACES),
+        }
+        if self.shared is None:
+            message["samples"] = {
+                name: {key: stats.get(key) for key in ('timestamp', 'cpu', 'memory', 'uptime_seconds', 'error')}
+                for name, stats in results.items()
+            }
+        self.publish(message)
+
+    def _on_sweep(self, results: List[Dict[str, Any]]):
+        states = {}
+        for result in results:
+            state = self.probe.state(result['host'])
+            if state is not None:
+                states[result['host']] = asdict(state)
+        self.publish({"type": "probe", "names": self.probe._routers, "states": states,
+                      "shared_store": self.shared is not None})
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything a new subscriber needs before the live stream"""
+        routers = {router['name']: router['ip'] for router in self.poller._routers.values()}
+        series = {}
+        if self.shared is None:  # otherwise subscribers read the ring
+            for name in routers:
+                for metric in SNAPSHOT_METRICS:
+                    times, values = self.store.window(name, metric, SNAPSHOT_SAMPLES)
+                    if len(times):
+                        series.setdefault(name, {})[metric] = [times.tolist(), values.tolist()]
+        with self.probe._lock:
+            probe_states = {ip: asdict(state) for ip, state in self.probe.states.items()}
+        return {
+            "type": "snapshot",
+            "shared_store": self.shared is not None,
+            "series": series,
+            "alerts": alerts_message(routers),
+            "breakers": breakers_message(routers.values()),
+            "probe": probe_states,
+            "top_interfaces": get_interface_rates().top(TOP_INTERFACES),
+        }
+
+    def publish(self, message: Dict[str, Any]):
+        """Encode once and queue for every subscriber (called from any thread)"""
+        if self._loop is None or not self.running:
+            return
+        self.published += 1
+        self._loop.call_soon_threadsafe(self._broadcast, encode(message))
+
+    def _broadcast(self, line: bytes):
+        for writer, queue in list(self.subscribers.items()):
+            try:
+                queue.put_nowait(line)
+            except asyncio.QueueFull:
+                # Too slow to keep up: drop it rather than buffer without bound
+                del self.subscribers[writer]
+                writer.close()
+
+    # -- socket ----------------------------------------------------------
+
+    async def _serve(self, reader, writer):
+        queue: asyncio.Queue = asyncio.Queue(SUBSCRIBER_QUEUE)
+        try:
+            snapshot = await asyncio.get_running_loop().run_in_executor(None, self.snapshot)
+            writer.write(encode(snapshot))
+            self.subscribers[writer] = queue
+            while writer in self.subscribers:
+                line = await queue.get()
+                writer.write(line)
+                await writer.drain()
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            pass  # subscriber went away, or the collector is shutting down
+        finally:
+            self.subscribers.pop(writer, None)
+            writer.close()
+
+    def _run(self):
+        self._loop = loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            if USE_UNIX_SOCKET:
+                if os.path.exists(self.path):
+                    os.unlink(self.path)  # stale socket; collector_running() found nobody listening
+                server = loop.run_until_complete(asyncio.start_unix_server(self._serve, self.path))
+                os.chmod(self.path, 0o600)
+            else:
+                server = loop.run_until_complete(asyncio.start_server(self._serve, *self.tcp))
+        except OSError as e:
+            self.error = f"Cannot open collector socket: {e}"
+            self._ready.set()
+            loop.close()
+            return
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            server.close()
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+            if USE_UNIX_SOCKET and os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+def _connect(path=COLLECTOR_SOCKET, tcp=COLLECTOR_TCP, timeout=1.0) -> socket.socket:
+    if USE_UNIX_SOCKET:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        target = path
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        target = tcp
+    sock.settimeout(timeout)
+    try:
+        sock.connect(target)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+def collector_running(path=COLLECTOR_SOCKET, tcp=COLLECTOR_TCP) -> bool:
+    try:
+        _connect(path, tcp, timeout=0.5).close()
+        return True
+    except OSError:
+        return False
+
+def spawn_collector(wait: float = 5.0) -> bool:
+    """Start 'python -m backend.collector' detached from this process and wait for its socket"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", "backend.collector"], cwd=root,
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError as e:
+        print(f"Cannot start collector: {e}")
+        return False
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if collector_running():
+            return True
+        time.sleep(0.2)
+    return False
+
+
+class InProcessView:
+    """Live dashboard data from engines running inside this process"""
+
+    remote = False
+
+    def __init__(self):
+        self.poller = get_fleet_poller()
+        self.probe = get_probe_engine()
+        self.store = get_metrics_store()
+
+    def start(self):
+        self.poller.start()
+        self.probe.start()
+
+    def stop(self):
+        self.poller.stop()
+        self.probe.stop()
+
+    def active_alerts(self, router: str) -> List[Tuple[str, str]]:
+        return get_alert_engine().active_alerts(router)
+
+    def probe_state(self, ip: str) -> Optional[ProbeState]:
+        return self.probe.state(ip)
+
+    def breaker(self, ip: str) -> Optional[Dict[str, Any]]:
+        return breaker_state(ip)
+
+    def top_interfaces(self, count: int) -> List[Dict[str, Any]]:
+        return get_interface_rates().top(count)
+
+
+class CollectorSubscription:
+    """Live dashboard data received from the collector process
+
+    Maps the collector's shared-memory ring and installs it as this
+    process's metrics store, so charts and cards read the collector's
+    samples in place. The stream is read in a background thread and
+    mirrored into plain dicts (alerts, probe and breaker states); when the
+    collector has no ring, the samples it streams are replayed into the
+    local store instead. Reconnects with backoff if the collector restarts.
+    """
+
+    remote = True
+
+    def __init__(self, path=COLLECTOR_SOCKET, tcp=COLLECTOR_TCP):
+        self.path = path
+        self.tcp = tcp
+        self.store = get_metrics_store()
+        self.shared: Optional[SharedStoreView] = None
+        self.listeners = []
+        self.connected = False
+        self.received = 0
+        self._alerts: Dict[str, List[Tuple[str, str]]] = {}
+        self._probe: Dict[str, ProbeState] = {}
+        self._breakers: Dict[str, Dict[str, Any]] = {}
+        self._top: List[Dict[str, Any]] = []
+        self._stop = threading.Event()
+        self._socket: Optional[socket.socket] = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def attach_shared_store(self) -> bool:
+        if self.shared is None:
+            ring = open_shared_store()
+            if ring is None:
+                return False
+            self.shared = SharedStoreView(ring, self.store)
+            set_metrics_store(self.shared)
+        return True
+
+    def start(self):
+        self.attach_shared_store()
+        if self._thread is None or not self._thread.is_alive() or self._stop.is_set():
+            # A new event per run, so a stopped reader still draining exits on its own
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop,), daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Unsubscribe; the collector keeps running for other viewers"""
+        self._stop.set()
+        if self.shared is not None:
+            set_metrics_store(self.store)
+            self.shared = None
+        if self._socket is not None:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def active_alerts(self, router: str) -> List[Tuple[str, str]]:
+        with self._lock:
+            return list(self._alerts.get(router, []))
+
+    def probe_state(self, ip: str) -> Optional[ProbeState]:
+        with self._lock:
+            return self._probe.get(ip)
+
+    def breaker(self, ip: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._breakers.get(ip)
+
+    def top_interfaces(self, count: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self._top[:count]
+
+    def apply(self, message: Dict[str, Any]):
+        """Fold one collector message into the local mirrors"""
+        kind = message.get("type")
+        with self._lock:
+            if kind == "snapshot":
+                if message.get("shared_store"):
+                    self.attach_shared_store()
+                # On a reconnect the snapshot overlaps what was already received
+                for router, metrics in message.get("series", {}).items():
+                    for metric, (times, values) in metrics.items():
+                        held, _ = self.store.window(router, metric, 1)
+                        newest = float(held[0]) if len(held) else float("-inf")
+                        for timestamp, value in zip(times, values):
+                            if timestamp > newest:
+                                self.store.append(router, metric, value, timestamp)
+                self._probe = {ip: ProbeState(**state) for ip, state in message.get("probe", {}).items()}
+            elif kind == "cycle":
+                for router, sample in message.get("samples", {}).items():
+                    if not sample.get("error"):
+                        self.store.append_sample(router, {'cpu': sample.get('cpu'), 'memory': sample.get('memory'),
+                                                          'uptime': sample.get('uptime_seconds')},
+                                                 sample.get('timestamp'))
+            elif kind == "probe":
+                names = message.get("names", {})
+                for ip, state in message.get("states", {}).items():
+                    self._probe[ip] = ProbeState(**state)
+                    if message.get("shared_store"):
+                        continue
+                    self.store.append_sample(names.get(ip, ip),
+                                             {'rtt': state['rtt_ms'], 'icmp_rtt': state['icmp_rtt_ms']},
+                                             state['last_probe'])
+            if "alerts" in message:
+                self._alerts.update(message["alerts"])
+            if "breakers" in message:
+                self._breakers.update(message["breakers"])
+            if "top_interfaces" in message:
+                self._top = message["top_interfaces"]
+        self.received += 1
+        for listener in self.listeners:
+            listener(message)
+
+    def _run(self, stop: threading.Event):
+        delay = RECONNECT_DELAY[0]
+        while not stop.is_set():
+            sock = None
+            try:
+                sock = self._socket = _connect(self.path, self.tcp)
+                sock.settimeout(None)
+                self.connected = True
+                delay = RECONNECT_DELAY[0]
+                with sock.makefile("rb") as stream:
+                    for line in stream:
+                        if stop.is_set():
+                            break
+                        self.apply(json.loads(line))
+            except (OSError, ValueError):
+                pass
+            finally:
+                if sock is not None:
+                    sock.close()
+                    if self._socket is sock:
+                        self._socket = None
+                        self.connected = False
+            if stop.wait(delay):
+                break
+            delay = min(RECONNECT_DELAY[1], delay * 2)
+
+
+def connect_live_view(autostart: bool = AUTOSTART):
+    """Subscribe to the collector process, starting one if needed; else collect in-process
+
+    Returns an object with start/stop and the read methods the dashboard uses.
+    """
+    if collector_running() or (autostart and spawn_collector()):
+        view = CollectorSubscription()
+    else:
+        view = InProcessView()
+    view.start()
+    return view
+
+
+if __name__ == "__main__":
+    # Collector process: python -m backend.collector
+    daemon = CollectorDaemon()
+    if not daemon.start():
+        raise SystemExit(daemon.error)
+    where = daemon.path if USE_UNIX_SOCKET else f"{daemon.tcp[0]}:{daemon.tcp[1]}"
+    print(f"Collector running; subscribers connect to {where}")
+    try:
+        while True:
+            time.sleep(30)
+            print(f"{len(daemon.subscribers)} subscribers, {daemon.published} messages published")
+    except KeyboardInterrupt:
+        daemon.stop()
@@ -1,7 +1,9 @@
 from pymongo import MongoClient
 import paramiko
 import re
+import bisect
 import datetime
+from backend.ssh_client import RouterSSHClient
 
 def get_router_list():
     """Fetch validated routers from MongoDB"""
@@ -51,7 +53,7 @@ def get_running_config_sections(router, user_ip):
 
 def ssh_get_running_config(router, user_ip):
     """SSH connection handler with command logging"""
-    ssh = paramiko.SSHClient()
+    ssh = RouterSSHClient()
     ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
     try:
         ssh.connect(
@@ -138,4 +140,93 @@ def split_config_sections(config):
             if "version" in line.lower() or "hostname" in line.lower()
         )
         
-    return sections
\ No newline at end of file
+    return sections
+
+
+class ConfigNode:
+    """One line of the running config with its indented child lines"""
+    __slots__ = ("text", "line_no", "depth", "parent", "row", "children", "digest")
+
+    def __init__(self, text, line_no, depth, parent=None):
+        self.text = text
+        self.line_no = line_no
+        self.depth = depth
+        self.parent = parent
+        self.row = len(parent.children) if parent is not None else 0
+        self.children = []
+        self.digest = None
+        if parent is not None:
+            parent.children.append(self)
+
+
+class ConfigTree:
+    """Parsed running config with a flat line index for fast searching"""
+
+    def __init__(self, config):
+        self.root = ConfigNode("", -1, -1)
+        self.nodes = []
+        self._build(config)
+        # One lowercase blob plus line start offsets lets a search run as
+        # repeated str.find() calls instead of a Python loop over every line
+        lowered = [node.text.lower() for node in self.nodes]
+        self._blob = "\n".join(lowered)
+        self._starts = []
+        offset = 0
+        for text in lowered:
+            self._starts.append(offset)
+            offset += len(text) + 1
+        self._last_term = ""
+        self._last_matches = []
+
+    def _build(self, config):
+        stack = [self.root]
+        for line in config.splitlines():
+            stripped = line.strip()
+            if not stripped or stripped == "!":
+                continue
+            depth = len(line) - len(line.lstrip(" "))
+            while stack[-1].depth >= depth:
+                stack.pop()
+            node = ConfigNode(stripped, len(self.nodes), depth, stack[-1])
+            self.nodes.append(node)
+            stack.append(node)
+
+    def search(self, term):
+        """Return line numbers containing term (case-insensitive)"""
+        term = term.lower()
+        if not term:
+            matches = []
+        elif self._last_term and term.startswith(self._last_term):
+            # Typing narrows the previous result set, so only re-check those lines
+            matches = [n for n in self._last_matches if term in self.nodes[n].text.lower()]
+        else:
+            matches = []
+            pos = self._blob.find(term)
+            while pos != -1:
+                line_no = bisect.bisect_right(self._starts, pos) - 1
+                matches.append(line_no)
+                # Skip to the next line so a line is only reported once
+                next_start = self._starts[line_no + 1] if line_no + 1 < len(self._starts) else len(self._blob)
+                pos = self._blob.find(term, next_start)
+        self._last_term = term
+        self._last_matches = matches
+        return matches
+
+
+def parse_config_tree(config):
+    """Parse running config text into an indentation-based tree"""
+    return ConfigTree(config)
+
+def get_running_config_tree(router, user_ip):
+    """Get running config as a ConfigTree with command logging"""
+    try:
+        return parse_config_tree(ssh_get_running_config(router, user_ip))
+    except Exception as e:
+        log_command(
+            router['ip'],
+            user_ip,
+            "show running-config",
+            str(e),
+            "error"
+        )
+        raise RuntimeError(f"Configuration retrieval failed: {str(e)}")
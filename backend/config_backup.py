@@ -0,0 +1,192 @@
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import threading
+import datetime
+import socket
+import zlib
+import re
+from backend.config import get_router_list, ssh_get_running_config
+from backend.session_budget import session_priority, BACKGROUND
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017/")
+db = client["NetworkApp"]
+config_blobs = db["ConfigBlobs"]
+config_snapshots = db["ConfigSnapshots"]
+
+BACKUP_INTERVAL = 6 * 60 * 60  # seconds between scheduled runs
+MAX_WORKERS = 16
+STOP_TIMEOUT = 2.0             # seconds stop() waits for a run in progress
+
+# Lines that change on every fetch without any real configuration change
+VOLATILE_LINES = re.compile(
+    r"^(Building configuration\.\.\.|Current configuration\s*:.*|"
+    r"! Last configuration change at.*|! NVRAM config last updated at.*|"
+    r"! No configuration change since last restart|ntp clock-period \d+)\s*$"
+)
+
+_indexes_ready = False
+
+def ensure_indexes():
+    """Create the snapshot index used for history browsing"""
+    global _indexes_ready
+    if not _indexes_ready:
+        config_snapshots.create_index([("router", ASCENDING), ("timestamp", DESCENDING)])
+        config_snapshots.create_index("hash")
+        _indexes_ready = True
+
+def normalize_config(config):
+    """Strip volatile lines so unchanged configs hash identically"""
+    lines = [line.rstrip() for line in config.replace('\r', '').splitlines()]
+    return "\n".join(line for line in lines if not VOLATILE_LINES.match(line)).strip() + "\n"
+
+def store_snapshot(router, config, source="backup"):
+    """Store a config blob under its SHA-256 and record it in the snapshot index"""
+    ensure_indexes()
+    text = normalize_config(config)
+    digest = hashlib.sha256(text.encode()).hexdigest()
+    now = datetime.datetime.now()
+
+    # Content addressed: a config seen before only costs an index entry
+    config_blobs.update_one(
+        {"_id": digest},
+        {"$setOnInsert": {
+            "data": zlib.compress(text.encode(), 9),
+            "size": len(text),
+            "created": now
+        }},
+        upsert=True
+    )
+
+    previous = latest_snapshot(router['name'])
+    entry = {
+        "router": router['name'],
+        "ip": router['ip'],
+        "timestamp": now,
+        "hash": digest,
+        "changed": previous is None or previous['hash'] != digest,
+        "source": source
+    }
+    config_snapshots.insert_one(entry)
+    return entry
+
+def load_snapshot(digest):
+    """Return the config text stored under digest"""
+    blob = config_blobs.find_one({"_id": digest}, {"data": 1})
+    if not blob:
+        raise KeyError(f"No stored configuration with hash {digest}")
+    return zlib.decompress(blob['data']).decode()
+
+def latest_snapshot(router_name):
+    return config_snapshots.find_one(
+        {"router": router_name},
+        {"_id": 0},
+        sort=[("timestamp", DESCENDING)]
+    )
+
+def list_snapshots(router_name, limit=50, changed_only=False):
+    """Snapshot history for one router, newest first"""
+    ensure_indexes()
+    query = {"router": router_name}
+    if changed_only:
+        query["changed"] = True
+    return list(config_snapshots.find(query, {"_id": 0})
+                .sort("timestamp", DESCENDING).limit(limit))
+
+def backup_router(router, user_ip):
+    try:
+        with session_priority(BACKGROUND):
+            config = ssh_get_running_config(router, user_ip)
+        entry = store_snapshot(router, config)
+        return {"router": router['name'], "status": "success",
+                "hash": entry['hash'], "changed": entry['changed']}
+    except Exception as e:
+        return {"router": router['name'], "status": "error", "error": str(e)}
+
+def fetch_and_store(router, user_ip, source="interactive"):
+    """Fetch one running config and record it as a snapshot"""
+    config = ssh_get_running_config(router, user_ip)
+    try:
+        entry = store_snapshot(router, config, source)
+    except Exception as e:
+        print(f"Snapshot storage failed: {e}")
+        entry = None
+    return entry, config
+
+def run_backup(routers=None, max_workers=MAX_WORKERS):
+    """Fetch and store running configs for the whole inventory in parallel"""
+    routers = get_router_list() if routers is None else routers
+    if not routers:
+        return []
+    user_ip = socket.gethostbyname(socket.gethostname())
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(routers))) as pool:
+        return list(pool.map(lambda r: backup_router(r, user_ip), routers))
+
+
+class BackupScheduler:
+    """Runs run_backup periodically in a background thread, or on demand"""
+
+    def __init__(self, interval=BACKUP_INTERVAL):
+        self.interval = interval
+        self.last_run = None
+        self.last_results = []
+        self.running = False
+        self.listeners = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive() or self._stop.is_set():
+            # Fresh events per run: a stopped thread still finishing keeps its
+            # own, and the wake-up stop() used does not trigger a backup now
+            self._stop = threading.Event()
+            self._wake = threading.Event()
+            self._thread = threading.Thread(target=self._loop, args=(self._stop, self._wake), daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """Stop the schedule; a backup in progress finishes in the background after timeout"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def run_now(self):
+        """Trigger a backup without waiting for the next scheduled run"""
+        self.start()
+        self._wake.set()
+
+    def _loop(self, stop, wake):
+        while not stop.is_set():
+            wake.wait(self.interval)
+            if stop.is_set():
+                break
+            wake.clear()
+            self.running = True
+            try:
+                self.last_results = run_backup()
+                for listener in self.listeners:
+                    listener(self.last_results)
+            except Exception as e:
+                print(f"Backup run failed: {e}")
+            finally:
+                self.running = False
+                self.last_run = datetime.datetime.now()
+
+
+_scheduler = None
+
+def get_backup_scheduler():
+    """Shared scheduler instance used by the GUI pages"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = BackupScheduler()
+    return _scheduler
+
+
+if __name__ == "__main__":
+    # On-demand run, e.g. from cron: python -m backend.config_backup
+    for result in run_backup():
+        print(result)
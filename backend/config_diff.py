@@ -0,0 +1,141 @@
+import hashlib
+import difflib
+from collections import defaultdict
+from backend.config import ConfigTree
+
+# Sections whose child lines are evaluated top to bottom, so reordering them
+# is a real change. Everything else is compared as an unordered set.
+ORDERED_SECTIONS = (
+    "ip access-list", "ipv6 access-list", "route-map", "policy-map",
+    "class-map", "banner", "object-group", "ip prefix-list"
+)
+
+
+class DiffRow:
+    """One line of a side-by-side diff"""
+    __slots__ = ("tag", "left", "right", "depth")
+
+    def __init__(self, tag, left, right, depth):
+        self.tag = tag  # "equal", "changed", "removed" or "added"
+        self.left = left
+        self.right = right
+        self.depth = depth
+
+    def __repr__(self):
+        return f"DiffRow({self.tag!r}, {self.left!r}, {self.right!r})"
+
+
+def is_ordered(node):
+    return node.text.lower().startswith(ORDERED_SECTIONS)
+
+def node_digest(node):
+    """Hash a line together with its children, cached on the node"""
+    if node.digest is None:
+        h = hashlib.blake2b(node.text.encode(), digest_size=12)
+        child_digests = [node_digest(child) for child in node.children]
+        if not is_ordered(node):
+            child_digests.sort()
+        for digest in child_digests:
+            h.update(digest)
+        node.digest = h.digest()
+    return node.digest
+
+def _as_tree(config):
+    return config if isinstance(config, ConfigTree) else ConfigTree(config)
+
+def _emit_subtree(rows, node, tag):
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if tag == "removed":
+            rows.append(DiffRow(tag, current.text, "", current.depth))
+        else:
+            rows.append(DiffRow(tag, "", current.text, current.depth))
+        stack.extend(reversed(current.children))
+
+def _first_token(node):
+    return node.text.split(" ", 1)[0]
+
+def _diff_pair(rows, left, right):
+    """Diff two nodes whose header lines are known to correspond"""
+    if node_digest(left) == node_digest(right):
+        return
+    if left.text == right.text:
+        rows.append(DiffRow("equal", left.text, right.text, left.depth))
+    else:
+        rows.append(DiffRow("changed", left.text, right.text, left.depth))
+    if is_ordered(left) and is_ordered(right):
+        _diff_ordered(rows, left.children, right.children)
+    else:
+        _diff_unordered(rows, left.children, right.children)
+
+def _diff_ordered(rows, left_children, right_children):
+    matcher = difflib.SequenceMatcher(
+        None,
+        [node_digest(n) for n in left_children],
+        [node_digest(n) for n in right_children],
+        autojunk=False
+    )
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            continue
+        left_part = left_children[i1:i2]
+        right_part = right_children[j1:j2]
+        for left, right in zip(left_part, right_part):
+            _diff_pair(rows, left, right)
+        for left in left_part[len(right_part):]:
+            _emit_subtree(rows, left, "removed")
+        for right in right_part[len(left_part):]:
+            _emit_subtree(rows, right, "added")
+
+def _diff_unordered(rows, left_children, right_children):
+    right_by_text = defaultdict(list)
+    for node in right_children:
+        right_by_text[node.text].append(node)
+
+    # Pair lines with identical text first; only their subtrees can differ
+    left_only = []
+    for node in left_children:
+        candidates = right_by_text.get(node.text)
+        if candidates:
+            _diff_pair(rows, node, candidates.pop(0))
+        else:
+            left_only.append(node)
+    right_only = [n for nodes in right_by_text.values() for n in nodes]
+    right_only.sort(key=lambda n: n.row)
+
+    # Remaining lines sharing a leading keyword are shown as modifications,
+    # e.g. "description A" next to "description B"
+    right_by_token = defaultdict(list)
+    for node in right_only:
+        right_by_token[_first_token(node)].append(node)
+    for node in left_only:
+        candidates = right_by_token.get(_first_token(node))
+        if candidates:
+            _diff_pair(rows, node, candidates.pop(0))
+        else:
+            _emit_subtree(rows, node, "removed")
+    for nodes in right_by_token.values():
+        for node in nodes:
+            _emit_subtree(rows, node, "added")
+
+def diff_configs(left, right):
+    """Section-aware diff of two configs (text or ConfigTree)
+
+    Section digests are compared first, so identical sections are skipped
+    without looking at their lines and only differing ones are diffed.
+    """
+    left_tree = _as_tree(left)
+    right_tree = _as_tree(right)
+    rows = []
+    _diff_pair(rows, left_tree.root, right_tree.root)
+    # The synthetic root row carries no configuration text
+    return [row for row in rows if row.depth >= 0]
+
+def diff_summary(rows):
+    """Count rows per change type"""
+    summary = {"changed": 0, "removed": 0, "added": 0}
+    for row in rows:
+        if row.tag in summary:
+            summary[row.tag] += 1
+    return summary
@@ -0,0 +1,224 @@
+import bisect
+import re
+import threading
+import time
+from collections import defaultdict
+from backend.config import parse_config_tree
+from backend.config_backup import config_snapshots, load_snapshot
+
+TOKEN_PATTERN = re.compile(r"\S+")
+WILDCARD = "*"  # trailing on a term: match every token starting with it
+MAX_RESULTS = 1000
+
+
+class IndexedConfig:
+    """One stored configuration as seen by the index"""
+    __slots__ = ("digest", "lines", "lowered", "sections", "tokens")
+
+    def __init__(self, digest, text):
+        tree = parse_config_tree(text)
+        self.digest = digest
+        self.lines = [node.text for node in tree.nodes]
+        self.lowered = [line.lower() for line in self.lines]
+        self.sections = []
+        for node in tree.nodes:
+            top = node
+            while top.parent is not tree.root:
+                top = top.parent
+            self.sections.append(top.line_no)
+        self.tokens = defaultdict(list)
+        for line_no, line in enumerate(self.lowered):
+            for token in set(TOKEN_PATTERN.findall(line)):
+                self.tokens[token].append(line_no)
+
+
+class ConfigIndex:
+    """Inverted index over the latest stored configuration of every router
+
+    Postings map token -> {config digest: [line numbers]}. Configurations are
+    content addressed, so routers with identical configs share one entry and
+    an unchanged router costs nothing on refresh.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.configs = {}
+        self.routers = {}      # router name -> (ip, digest)
+        self.holders = defaultdict(set)  # digest -> router names
+        self._vocabulary = []
+        self._vocabulary_dirty = False
+        self._lock = threading.RLock()
+
+    def _add_config(self, digest):
+        config = IndexedConfig(digest, load_snapshot(digest))
+        for token, line_nos in config.tokens.items():
+            self.postings[token][digest] = line_nos
+        self.configs[digest] = config
+        self._vocabulary_dirty = True
+
+    def _remove_config(self, digest):
+        config = self.configs.pop(digest)
+        for token in config.tokens:
+            docs = self.postings[token]
+            docs.pop(digest, None)
+            if not docs:
+                del self.postings[token]
+        self._vocabulary_dirty = True
+
+    def update_router(self, name, ip, digest):
+        """Point a router at a new configuration, indexing it if needed"""
+        with self._lock:
+            current = self.routers.get(name)
+            if current and current[1] == digest:
+                return False
+            if digest not in self.configs:
+                self._add_config(digest)
+            if current:
+                self.remove_router(name)
+            self.routers[name] = (ip, digest)
+            self.holders[digest].add(name)
+            return True
+
+    def remove_router(self, name):
+        with self._lock:
+            current = self.routers.pop(name, None)
+            if not current:
+                return
+            holders = self.holders[current[1]]
+            holders.discard(name)
+            if not holders:
+                del self.holders[current[1]]
+                self._remove_config(current[1])
+
+    def refresh(self):
+        """Bring the index up to date with the latest snapshot of each router"""
+        latest = list(config_snapshots.aggregate([
+            {"$sort": {"router": 1, "timestamp": -1}},
+            {"$group": {"_id": "$router", "ip": {"$first": "$ip"}, "hash": {"$first": "$hash"}}}
+        ]))
+        seen = set()
+        updated = 0
+        with self._lock:
+            for doc in latest:
+                seen.add(doc['_id'])
+                try:
+                    updated += self.update_router(doc['_id'], doc['ip'], doc['hash'])
+                except Exception as e:
+                    print(f"Index update failed for {doc['_id']}: {e}")
+            for name in set(self.routers) - seen:
+                self.remove_router(name)
+        return updated
+
+    def _expand(self, term):
+        """Postings of term, or of every token starting with it for "term*"
+
+        Exact by default, so "10.0.0.5" does not find 10.0.0.50 and
+        "CUST-A" does not find CUST-AB; "10.0.0.5*" finds both.
+        """
+        if not term.endswith(WILDCARD) or term == WILDCARD:
+            return [self.postings[term]] if term in self.postings else []
+        term = term[:-1]
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self.postings)
+            self._vocabulary_dirty = False
+        start = bisect.bisect_left(self._vocabulary, term)
+        matches = []
+        for token in self._vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            matches.append(self.postings[token])
+        return matches
+
+    def _candidate_lines(self, term):
+        lines = defaultdict(set)
+        for docs in self._expand(term):
+            for digest, line_nos in docs.items():
+                lines[digest].update(line_nos)
+        return lines
+
+    @staticmethod
+    def _phrase_pattern(terms):
+        """Regex for the terms as consecutive whole tokens of a line"""
+        parts = []
+        for term in terms:
+            if term.endswith(WILDCARD) and term != WILDCARD:
+                parts.append(re.escape(term[:-1]) + r"\S*")
+            else:
+                parts.append(re.escape(term))
+        return re.compile(r"(?<!\S)" + r"\s+".join(parts) + r"(?!\S)")
+
+    def search(self, query, limit=MAX_RESULTS):
+        """Find lines containing query, optionally restricted with in:<section>
+
+        Terms match whole tokens; end one with * to match a prefix.
+        Example queries: "neighbor 10.0.0.5", "vrf definition CUST-A",
+        "in:interface mpls ip", "neighbor 10.0.0.*".
+        """
+        section_filter = None
+        terms = []
+        for part in query.lower().split():
+            if part.startswith("in:") and len(part) > 3:
+                section_filter = part[3:]
+            else:
+                terms.append(part)
+        if not terms:
+            return []
+        phrase = self._phrase_pattern(terms)
+
+        results = []
+        with self._lock:
+            # Intersect per-token line sets, rarest token first
+            candidates = None
+            for term in sorted(terms, key=lambda t: len(self.postings.get(t, ()))):
+                lines = self._candidate_lines(term)
+                if candidates is None:
+                    candidates = lines
+                else:
+                    candidates = {d: candidates[d] & lines[d] for d in candidates if d in lines}
+                    candidates = {d: l for d, l in candidates.items() if l}
+                if not candidates:
+                    return []
+
+            for digest, line_nos in candidates.items():
+                config = self.configs[digest]
+                for line_no in sorted(line_nos):
+                    if not phrase.search(config.lowered[line_no]):
+                        continue
+                    section = config.lines[config.sections[line_no]]
+                    if section_filter and not section.lower().startswith(section_filter):
+                        continue
+                    for name in sorted(self.holders[digest]):
+                        results.append({
+                            "router": name,
+                            "ip": self.routers[name][0],
+                            "hash": digest,
+                            "section": section,
+                            "line_no": line_no + 1,
+                            "line": config.lines[line_no]
+                        })
+                        if len(results) >= limit:
+                            return results
+        return results
+
+    def stats(self):
+        return {
+            "routers": len(self.routers),
+            "configs": len(self.configs),
+            "tokens": len(self.postings)
+        }
+
+
+_index = None
+
+def get_config_index():
+    """Shared index instance, refreshed incrementally by callers"""
+    global _index
+    if _index is None:
+        _index = ConfigIndex()
+    return _index
+
+def timed_search(query, limit=MAX_RESULTS):
+    """Search the shared index, returning results and elapsed milliseconds"""
+    start = time.perf_counter()
+    results = get_config_index().search(query, limit)
+    return results, (time.perf_counter() - start) * 1000
@@ -0,0 +1,65 @@
+from pymongo import MongoClient, ASCENDING, DESCENDING
+import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017/")
+db = client["NetworkApp"]
+events = db["Events"]
+
+_indexes_ready = False
+
+def ensure_indexes():
+    """Create the indexes used by the dashboard and timelines"""
+    global _indexes_ready
+    if not _indexes_ready:
+        events.create_index([("timestamp", DESCENDING)])
+        events.create_index([("router", ASCENDING), ("timestamp", DESCENDING)])
+        events.create_index([("type", ASCENDING), ("timestamp", DESCENDING)])
+        events.create_index([("mnemonic", ASCENDING), ("timestamp", DESCENDING)], sparse=True)
+        _indexes_ready = True
+
+def make_event(event_type: str, router: str, severity: str, message: str,
+               timestamp: Optional[datetime.datetime] = None, **details) -> Dict[str, Any]:
+    """Build an event document; details are stored as extra fields"""
+    event = {
+        "timestamp": timestamp or datetime.datetime.now(),
+        "type": event_type,
+        "router": router,
+        "severity": severity,
+        "message": message
+    }
+    event.update(details)
+    return event
+
+def record_events(batch: Iterable[Dict[str, Any]]) -> int:
+    """Insert a batch of events with one round trip, returning how many were stored"""
+    batch = list(batch)
+    if not batch:
+        return 0
+    ensure_indexes()
+    try:
+        return len(events.insert_many(batch, ordered=False).inserted_ids)
+    except Exception as e:
+        print(f"MongoDB Error: {e}")
+        return 0
+
+def record_event(event_type: str, router: str, severity: str, message: str, **details) -> int:
+    return record_events([make_event(event_type, router, severity, message, **details)])
+
+def list_events(router: Optional[str] = None, types: Optional[List[str]] = None,
+                since: Optional[datetime.datetime] = None, limit: int = 200) -> List[Dict[str, Any]]:
+    """Most recent events first, optionally filtered by router, type and start time"""
+    ensure_indexes()
+    query: Dict[str, Any] = {}
+    if router:
+        query["router"] = router
+    if types:
+        query["type"] = {"$in": types}
+    if since:
+        query["timestamp"] = {"$gte": since}
+    try:
+        return list(events.find(query).sort("timestamp", DESCENDING).limit(limit))
+    except Exception as e:
+        print(f"MongoDB Error: {e}")
+        return []
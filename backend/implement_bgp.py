@@ -1,7 +1,9 @@
 import paramiko
 from pymongo import MongoClient
-import time
 from datetime import datetime
+from backend.state_cache import get_state_cache
+from backend.ssh_client import RouterSSHClient
+from backend.operations import ensure_operation, read_until_prompt, send_commands
 
 # MongoDB setup
 client = MongoClient("mongodb://localhost:27017/")
@@ -32,7 +34,8 @@ def load_routers():
         return []
 
 def configure_bgp(router, bgp_type, local_asn, neighbor_ip, neighbor_asn, prefix, mask, 
-                 vpn_local_asn=None, vpn_neighbor_ip=None):
+                 vpn_local_asn=None, vpn_neighbor_ip=None, operation=None):
+    operation = ensure_operation(operation)
     response = {"success": False, "output": "", "error": ""}
     config = {
         "bgp_type": bgp_type,
@@ -47,21 +50,20 @@ def configure_bgp(router, bgp_type, local_asn, neighbor_ip, neighbor_asn, prefix
         }
     }
     
-    ssh = paramiko.SSHClient()
+    ssh = RouterSSHClient(write=True)
     ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
     
     try:
+        operation.step(f"Connecting to {router['name']}")
         ssh.connect(router['ip'],
                    username=router['username'],
                    password=router['password'],
                    timeout=10)
+        operation.check()
         
         chan = ssh.invoke_shell()
         chan.settimeout(10)
-        
-        output = ""
-        while not output.endswith(('#', '>')):
-            output += chan.recv(1024).decode()
+        read_until_prompt(chan, operation)
 
         commands = [
             'configure terminal',
@@ -89,19 +91,10 @@ def configure_bgp(router, bgp_type, local_asn, neighbor_ip, neighbor_asn, prefix
                 f'neighbor {neighbor_ip} route-reflector-client'
             ]
 
-        for cmd in commands:
-            chan.send(cmd + '\n')
-            time.sleep(0.5)
-            output = chan.recv(65535).decode()
-            response['output'] += output
-            
-            if '% Invalid' in output:
-                raise Exception(f"Command failed: {cmd}\n{output}")
-
-        chan.send('end\nwrite memory\n')
-        time.sleep(1)
-        response['output'] += chan.recv(65535).decode()
+        commands += ['end', 'write memory']
+        response['output'] += send_commands(chan, commands, operation)
         response['success'] = True
+        get_state_cache().invalidate(router, ["bgp_neighbors"])
         log_bgp_action("configure", router, config, "success")
         
     except Exception as e:
@@ -114,28 +107,28 @@ def configure_bgp(router, bgp_type, local_asn, neighbor_ip, neighbor_asn, prefix
     return response
 
 # Keep the existing delete_bgp_config function from previous answer
-def delete_bgp_config(router, local_asn):
+def delete_bgp_config(router, local_asn, operation=None):
+    operation = ensure_operation(operation)
     response = {"success": False, "output": "", "error": ""}
     config = {
         "local_asn": local_asn,
         "action": "delete"
     }
     
-    ssh = paramiko.SSHClient()
+    ssh = RouterSSHClient(write=True)
     ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
     
     try:
+        operation.step(f"Connecting to {router['name']}")
         ssh.connect(router['ip'],
                    username=router['username'],
                    password=router['password'],
                    timeout=10)
+        operation.check()
         
         chan = ssh.invoke_shell()
         chan.settimeout(10)
-        
-        output = ""
-        while not output.endswith(('#', '>')):
-            output += chan.recv(1024).decode()
+        read_until_prompt(chan, operation)
 
         commands = [
             'configure terminal',
@@ -144,16 +137,10 @@ def delete_bgp_config(router, local_asn):
             'write memory'
         ]
 
-        for cmd in commands:
-            chan.send(cmd + '\n')
-            time.sleep(0.5)
-            output = chan.recv(65535).decode()
-            response['output'] += output
-            
-            if '% Invalid' in output:
-                raise Exception(f"Command failed: {cmd}\n{output}")
+        response['output'] += send_commands(chan, commands, operation)
 
         response['success'] = True
+        get_state_cache().invalidate(router, ["bgp_neighbors"])
         log_bgp_action("delete", router, config, "success")
         
     except Exception as e:
@@ -165,28 +152,28 @@ def delete_bgp_config(router, local_asn):
     
     return response
 
-def configure_vpnv4(router, local_asn, neighbor_ip):
+def configure_vpnv4(router, local_asn, neighbor_ip, operation=None):
+    operation = ensure_operation(operation)
     response = {"success": False, "output": "", "error": ""}
     config = {
         "local_asn": local_asn,
         "neighbor_ip": neighbor_ip
     }
     
-    ssh = paramiko.SSHClient()
+    ssh = RouterSSHClient(write=True)
     ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
     
     try:
+        operation.step(f"Connecting to {router['name']}")
         ssh.connect(router['ip'],
                    username=router['username'],
                    password=router['password'],
                    timeout=10)
+        operation.check()
         
         chan = ssh.invoke_shell()
         chan.settimeout(10)
-        
-        output = ""
-        while not output.endswith(('#', '>')):
-            output += chan.recv(1024).decode()
+        read_until_prompt(chan, operation)
 
         commands = [
             'configure terminal',
@@ -199,16 +186,10 @@ def configure_vpnv4(router, local_asn, neighbor_ip):
             'write memory'
         ]
 
-        for cmd in commands:
-            chan.send(cmd + '\n')
-            time.sleep(0.5)
-            output = chan.recv(65535).decode()
-            response['output'] += output
-            
-            if '% Invalid' in output:
-                raise Exception(f"Command failed: {cmd}\n{output}")
+        response['output'] += send_commands(chan, commands, operation)
 
         response['success'] = True
+        get_state_cache().invalidate(router, ["bgp_neighbors"])
         log_bgp_action("configure_vpnv4", router, config, "success")
         
     except Exception as e:
@@ -1,7 +1,9 @@
 import paramiko
 from pymongo import MongoClient
-import time
 from datetime import datetime
+from backend.state_cache import get_interfaces
+from backend.ssh_client import RouterSSHClient
+from backend.operations import OperationCancelled, ensure_operation, send_commands
 
 # MongoDB connection setup
 client = MongoClient("mongodb://localhost:27017/")
@@ -19,25 +21,9 @@ def load_routers():
         return []
 def show_interfaces(router):
     try:
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(
-            router['ip'],
-            username=router['username'],
-            password=router['password'],
-            timeout=10
-        )
-        
-        stdin, stdout, stderr = ssh.exec_command("show ip interface brief")
-        output = stdout.read().decode()
-        interfaces = [line.split()[0] for line in output.splitlines() 
-                     if line.strip() and not line.startswith('Interface')]
-        return interfaces
+        return [intf.name for intf in get_interfaces(router)]
     except Exception as e:
         raise Exception(f"SSH Error: {str(e)}")
-    finally:
-        if 'ssh' in locals():
-            ssh.close()
 
 def log_mpls_action(action, router, interfaces, status, error=None):
     log_entry = {
@@ -51,17 +37,20 @@ def log_mpls_action(action, router, interfaces, status, error=None):
     }
     mpls_logs.insert_one(log_entry)
 
-def configure_mpls(router, interfaces):
+def configure_mpls(router, interfaces, operation=None):
+    operation = ensure_operation(operation)
     response = {"success": False, "output": "", "error": ""}
     try:
-        ssh = paramiko.SSHClient()
+        ssh = RouterSSHClient(write=True)
         ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        operation.step(f"Connecting to {router['name']}")
         ssh.connect(
             router['ip'],
             username=router['username'],
             password=router['password'],
             timeout=10
         )
+        operation.check()
 
         chan = ssh.invoke_shell()
         commands = [
@@ -72,18 +61,11 @@ def configure_mpls(router, interfaces):
             "write memory"
         ]
 
-        full_output = ""
-        for cmd in commands:
-            chan.send(f"{cmd}\n")
-            time.sleep(0.5)
-            output = chan.recv(65535).decode()
-            full_output += output
-            
-            if "% Invalid" in output:
-                response["error"] = f"Command failed: {cmd}"
-                break
-        else:
+        try:
+            response["output"] = send_commands(chan, commands, operation)
             response.update({"success": True})
+        except ValueError as e:
+            response["error"] = str(e).splitlines()[0]
 
         log_mpls_action(
             "configure", 
@@ -93,6 +75,9 @@ def configure_mpls(router, interfaces):
             response["error"] if not response["success"] else None
         )
 
+    except OperationCancelled as e:
+        response["error"] = str(e)
+        log_mpls_action("configure", router, interfaces, "cancelled", str(e))
     except Exception as e:
         error_msg = f"Connection error: {str(e)}"
         response["error"] = error_msg
@@ -103,17 +88,20 @@ def configure_mpls(router, interfaces):
     
     return response
 
-def delete_mpls_config(router, interfaces):
+def delete_mpls_config(router, interfaces, operation=None):
+    operation = ensure_operation(operation)
     response = {"success": False, "output": "", "error": ""}
     try:
-        ssh = paramiko.SSHClient()
+        ssh = RouterSSHClient(write=True)
         ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        operation.step(f"Connecting to {router['name']}")
         ssh.connect(
             router['ip'],
             username=router['username'],
             password=router['password'],
             timeout=10
         )
+        operation.check()
 
         chan = ssh.invoke_shell()
         commands = [
@@ -123,18 +111,11 @@ def delete_mpls_config(router, interfaces):
             "write memory"
         ]
 
-        full_output = ""
-        for cmd in commands:
-            chan.send(f"{cmd}\n")
-            time.sleep(0.5)
-            output = chan.recv(65535).decode()
-            full_output += output
-            
-            if "% Invalid" in output:
-                response["error"] = f"Command failed: {cmd}"
-                break
-        else:
+        try:
+            response["output"] = send_commands(chan, commands, operation)
             response.update({"success": True})
+        except ValueError as e:
+            response["error"] = str(e).splitlines()[0]
 
         log_mpls_action(
             "delete", 
@@ -144,6 +125,9 @@ def delete_mpls_config(router, interfaces):
             response["error"] if not response["success"] else None
         )
 
+    except OperationCancelled as e:
+        response["error"] = str(e)
+        log_mpls_action("delete", router, interfaces, "cancelled", str(e))
     except Exception as e:
         error_msg = f"Connection error: {str(e)}"
         response["error"] = error_msg
@@ -0,0 +1,149 @@
+import threading
+import numpy as np
+from typing import Dict, List, Tuple, Any
+
+COUNTER_FIELDS = ("in_octets", "out_octets", "in_errors", "out_errors", "in_drops", "out_drops")
+COUNTER32 = 1 << 32
+# A wrapped delta implying more than this multiple of line rate is a counter
+# reset (reload, 'clear counters') rather than a wrap
+RESET_FACTOR = 1.5
+
+
+class InterfaceRateTable:
+    """Counter history for every interface in the fleet, one row per interface
+
+    Each polling cycle hands in all the new samples at once; deltas, wrap
+    correction, rates and utilization are then computed for every row in a
+    single NumPy pass.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.rows: Dict[Tuple[str, str], int] = {}
+        self.keys: List[Tuple[str, str]] = []
+        self.counters = np.zeros((capacity, len(COUNTER_FIELDS)), dtype=np.uint64)
+        self.timestamps = np.zeros(capacity)
+        self.bandwidth = np.zeros(capacity)
+        self.valid = np.zeros(capacity, dtype=bool)
+        # Latest results: bits/s in and out, errors/s, drops/s, utilization %
+        self.rates = np.full((capacity, 4), np.nan)
+        self.utilization = np.full(capacity, np.nan)
+        self._lock = threading.Lock()
+
+    def _grow(self, needed: int):
+        capacity = len(self.timestamps)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        extra = capacity - len(self.timestamps)
+        self.counters = np.vstack([self.counters, np.zeros((extra, len(COUNTER_FIELDS)), dtype=np.uint64)])
+        self.timestamps = np.concatenate([self.timestamps, np.zeros(extra)])
+        self.bandwidth = np.concatenate([self.bandwidth, np.zeros(extra)])
+        self.valid = np.concatenate([self.valid, np.zeros(extra, dtype=bool)])
+        self.rates = np.vstack([self.rates, np.full((extra, 4), np.nan)])
+        self.utilization = np.concatenate([self.utilization, np.full(extra, np.nan)])
+
+    def _row(self, key: Tuple[str, str]) -> int:
+        row = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = len(self.keys)
+            self.keys.append(key)
+            self._grow(len(self.keys))
+        return row
+
+    def update(self, samples: Dict[str, Tuple[float, List[Dict[str, Any]]]]):
+        """Feed one cycle of samples: {router: (timestamp, [interface counters])}"""
+        with self._lock:
+            rows, times, values, bandwidth = [], [], [], []
+            for router, (timestamp, interfaces) in samples.items():
+                for interface in interfaces:
+                    rows.append(self._row((router, interface['name'])))
+                    times.append(timestamp)
+                    values.append([interface[field] for field in COUNTER_FIELDS])
+                    bandwidth.append(interface['bandwidth_kbps'] * 1000.0)
+            if not rows:
+                return
+
+            rows = np.array(rows)
+            current = np.array(values, dtype=np.uint64)
+            now = np.array(times)
+            line_rate = np.array(bandwidth)
+            previous = self.counters[rows]
+            had_previous = self.valid[rows]
+            elapsed = now - self.timestamps[rows]
+
+            # uint64 arithmetic already wraps modulo 2**64; 32-bit counters
+            # that wrapped need the difference taken modulo 2**32 instead
+            wrapped = current < previous
+            delta = current - previous
+            wrap32 = wrapped & (previous < COUNTER32)
+            delta[wrap32] = (current[wrap32] + np.uint64(COUNTER32)) - previous[wrap32]
+            delta = delta.astype(np.float64)
+
+            usable = had_previous & (elapsed > 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                per_second = delta / elapsed[:, None]
+                bps = per_second[:, :2] * 8
+                # Wrap-corrected octets faster than the line allows mean the counters were reset
+                reset = wrapped[:, :2].any(axis=1) & (line_rate > 0) & \
+                    (bps.max(axis=1) > line_rate * RESET_FACTOR)
+                # Error and drop counters never get near a wrap, so going backwards is a reset
+                reset |= wrapped[:, 2:].any(axis=1)
+                usable &= ~reset
+
+                rates = np.column_stack([
+                    bps[:, 0], bps[:, 1],
+                    per_second[:, 2] + per_second[:, 3],
+                    per_second[:, 4] + per_second[:, 5],
+                ])
+                utilization = np.where(line_rate > 0, bps.max(axis=1) / line_rate * 100, np.nan)
+
+            self.rates[rows] = np.where(usable[:, None], rates, np.nan)
+            self.utilization[rows] = np.where(usable, utilization, np.nan)
+            self.counters[rows] = current
+            self.timestamps[rows] = now
+            self.bandwidth[rows] = line_rate
+            self.valid[rows] = True
+
+    def top(self, count: int = 10) -> List[Dict[str, Any]]:
+        """Busiest interfaces by utilization, highest first"""
+        with self._lock:
+            size = len(self.keys)
+            if not size:
+                return []
+            # Interfaces without a rate yet (first sample, reset, unknown speed) are left out
+            utilization = np.nan_to_num(self.utilization[:size], nan=-1.0)
+            count = min(count, size)
+            candidates = np.argpartition(-utilization, count - 1)[:count]
+            order = candidates[np.argsort(-utilization[candidates])]
+            return [
+                {
+                    'router': self.keys[row][0],
+                    'interface': self.keys[row][1],
+                    'in_bps': float(self.rates[row, 0]),
+                    'out_bps': float(self.rates[row, 1]),
+                    'errors_per_sec': float(self.rates[row, 2]),
+                    'drops_per_sec': float(self.rates[row, 3]),
+                    'utilization': float(self.utilization[row]),
+                }
+                for row in order if not np.isnan(self.utilization[row])
+            ]
+
+    def forget(self, router: str):
+        """Stop reporting a router removed from the inventory"""
+        with self._lock:
+            for key, row in self.rows.items():
+                if key[0] == router:
+                    self.valid[row] = False
+                    self.rates[row] = np.nan
+                    self.utilization[row] = np.nan
+
+
+_rate_table = None
+
+def get_interface_rates():
+    """Shared table fed by the fleet poller and read by the dashboard"""
+    global _rate_table
+    if _rate_table is None:
+        _rate_table = InterfaceRateTable()
+    return _rate_table
@@ -1,9 +1,10 @@
 from pymongo import MongoClient
 import paramiko
-import time
 import socket
 import datetime
 import re
+from backend.ssh_client import RouterSSHClient
+from backend.operations import ensure_operation, read_available, send_commands
 
 # MongoDB configuration
 MONGO_URI = "mongodb://localhost:27017/"
@@ -58,12 +59,14 @@ def log_operation(router_ip, user_ip, commands, output, status):
     except Exception as e:
         print(f"Logging Error: {e}")
 
-def execute_ssh_commands(router, commands):
-    ssh_client = paramiko.SSHClient()
+def execute_ssh_commands(router, commands, operation=None):
+    operation = ensure_operation(operation)
+    ssh_client = RouterSSHClient(write=True)
     ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
     output = ""
     
     try:
+        operation.step(f"Connecting to {router['name']}")
         ssh_client.connect(
             hostname=router["ip"],
             username=router["username"],
@@ -73,24 +76,14 @@ def execute_ssh_commands(router, commands):
             timeout=10
         )
         
+        operation.check()
         shell = ssh_client.invoke_shell()
         shell.settimeout(15)
         
-        time.sleep(1)
-        while shell.recv_ready():
-            shell.recv(1024)
+        operation.sleep(1)
+        read_available(shell, operation)
         
-        for cmd in commands:
-            shell.send(cmd + '\n')
-            time.sleep(1)
-            while not shell.recv_ready():
-                time.sleep(0.5)
-            part = shell.recv(4096).decode('utf-8')
-            output += part
-        
-        shell.send("wr\n")
-        time.sleep(2)
-        output += shell.recv(4096).decode('utf-8')
+        output += send_commands(shell, commands + ["wr"], operation, pause=1, error_markers=())
         
         return True, output
     except Exception as e:
@@ -98,7 +91,7 @@ def execute_ssh_commands(router, commands):
     finally:
         ssh_client.close()
 
-def apply_isis_configuration(router_name, net, area, level):
+def apply_isis_configuration(router_name, net, area, level, operation=None):
     if not validate_net(net):
         return {"status": "error", "message": "Invalid NET format. Use 49.XXXX.XXXX.XXXX.XXXX.XX"}
     if not validate_area(area):
@@ -118,7 +111,7 @@ def apply_isis_configuration(router_name, net, area, level):
         "exit"
     ]
     
-    success, output = execute_ssh_commands(router, commands)
+    success, output = execute_ssh_commands(router, commands, operation)
     user_ip = socket.gethostbyname(socket.gethostname())
     
     status = "success" if success else "error"
@@ -129,7 +122,7 @@ def apply_isis_configuration(router_name, net, area, level):
     else:
         return {"status": "error", "message": f"SSH Error: {output}"}
 
-def delete_isis_configuration(router_name, area):
+def delete_isis_configuration(router_name, area, operation=None):
     if not validate_area(area):
         return {"status": "error", "message": "Invalid Area ID format. Use 49.XXXX"}
     
@@ -143,7 +136,7 @@ def delete_isis_configuration(router_name, area):
         "exit"
     ]
     
-    success, output = execute_ssh_commands(router, commands)
+    success, output = execute_ssh_commands(router, commands, operation)
     user_ip = socket.gethostbyname(socket.gethostname())
     
     status = "success" if success else "error"
@@ -0,0 +1,443 @@
+from pymongo import MongoClient, ASCENDING, DESCENDING, ReturnDocument
+from bson import ObjectId
+import datetime
+import importlib
+import socket
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+from backend.Connect import get_routers
+from backend.operations import Operation
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017/")
+db = client["NetworkApp"]
+jobs = db["Jobs"]
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+JOB_WORKERS = 4          # jobs run at once; per-device limits still come from session_budget
+IDLE_WAIT = 2.0          # seconds an idle worker sleeps unless a job is submitted
+HEARTBEAT_INTERVAL = 10.0
+CANCEL_POLL = 1.0        # seconds between checks for cancel requests on running jobs
+OUTPUT_CHUNKS = 500      # device output chunks kept per job
+STALE_AFTER = 60.0       # a running job without heartbeat for this long is assumed orphaned
+MAX_ATTEMPTS = 3         # orphaned jobs are requeued until they were started this often
+
+# Handler name -> (module, function, argument holding a router dict or None).
+# Imported on first use so the queue does not pull in every backend at start.
+HANDLERS = {
+    "configure_bgp": ("backend.implement_bgp", "configure_bgp", "router"),
+    "delete_bgp_config": ("backend.implement_bgp", "delete_bgp_config", "router"),
+    "configure_vpnv4": ("backend.implement_bgp", "configure_vpnv4", "router"),
+    "apply_ospf_config": ("backend.ospf", "apply_ospf_config", None),
+    "delete_ospf_config": ("backend.ospf", "delete_ospf_config", None),
+    "delete_ospf_network": ("backend.ospf", "delete_ospf_network", None),
+    "configure_mpls": ("backend.implement_mpls", "configure_mpls", "router"),
+    "delete_mpls_config": ("backend.implement_mpls", "delete_mpls_config", "router"),
+    "apply_isis_configuration": ("backend.isis", "apply_isis_configuration", None),
+    "delete_isis_configuration": ("backend.isis", "delete_isis_configuration", None),
+    "send_vrf_configuration": ("backend.vrf_config", "send_vrf_configuration", "router"),
+    "remove_vrf_configuration": ("backend.vrf_config", "remove_vrf_configuration", "router"),
+}
+
+HANDLER_LABELS = {
+    "configure_bgp": "Apply BGP", "delete_bgp_config": "Delete BGP", "configure_vpnv4": "Apply VPNv4",
+    "apply_ospf_config": "Apply OSPF", "delete_ospf_config": "Delete OSPF",
+    "delete_ospf_network": "Delete OSPF network", "configure_mpls": "Apply MPLS",
+    "delete_mpls_config": "Delete MPLS", "apply_isis_configuration": "Apply IS-IS",
+    "delete_isis_configuration": "Delete IS-IS", "send_vrf_configuration": "Apply VRF",
+    "remove_vrf_configuration": "Delete VRF",
+}
+
+_indexes_ready = False
+
+def ensure_indexes():
+    """Create the indexes used to claim jobs and list them"""
+    global _indexes_ready
+    if not _indexes_ready:
+        jobs.create_index([("state", ASCENDING), ("created", ASCENDING)])
+        jobs.create_index([("created", DESCENDING)])
+        _indexes_ready = True
+
+
+def job_outcome(result: Any) -> Tuple[bool, str]:
+    """Read success and error text from the differing handler return shapes"""
+    if result is True:
+        return True, ""
+    if isinstance(result, dict):
+        if "success" in result:
+            return bool(result["success"]), result.get("error") or ""
+        if "status" in result:
+            return result["status"] == "success", result.get("message") or ""
+    if isinstance(result, tuple) and result and isinstance(result[0], bool):
+        return result[0], "" if result[0] else str(result[-1])
+    return False, str(result)
+
+def resolve_handler(name: str):
+    module, function, _ = HANDLERS[name]
+    return getattr(importlib.import_module(module), function)
+
+def resolve_router(name: str) -> Dict[str, Any]:
+    """Fresh router record (credentials included) for a job that stored only its name"""
+    for router in get_routers():
+        if router.get('name') == name:
+            return router
+    raise ValueError(f"Router {name} is no longer in the inventory")
+
+
+def submit_job(handler: str, kwargs: Dict[str, Any], description: str = "") -> Optional[str]:
+    """Queue a call to a registered handler and return the job id
+
+    A router dict argument is stored by name only and looked up again when
+    the job runs, so credentials are not copied into the Jobs collection.
+    """
+    if handler not in HANDLERS:
+        raise ValueError(f"Unknown job handler: {handler}")
+    ensure_indexes()
+    kwargs = dict(kwargs)
+    router_arg = HANDLERS[handler][2]
+    if router_arg and isinstance(kwargs.get(router_arg), dict):
+        router = kwargs[router_arg]['name']
+        kwargs[router_arg] = router
+    else:
+        router = kwargs.get("router_name", "")
+    now = datetime.datetime.now()
+    job = {
+        "handler": handler,
+        "kwargs": kwargs,
+        "router": router,
+        "description": description or f"{HANDLER_LABELS.get(handler, handler)} on {router}",
+        "state": QUEUED,
+        "progress": 0,
+        "message": "Waiting for a worker",
+        "attempts": 0,
+        "cancel_requested": False,
+        "created": now,
+        "updated": now,
+        "started": None,
+        "finished": None,
+        "worker": None,
+        "heartbeat": None,
+        "error": None,
+        "output": [],
+        "output_count": 0,
+    }
+    try:
+        job_id = str(jobs.insert_one(job).inserted_id)
+    except Exception as e:
+        print(f"MongoDB Error: {e}")
+        return None
+    if _queue is not None:
+        _queue.wake()
+    return job_id
+
+def update_progress(job_id: str, progress: int, message: str):
+    """Record how far a running job got; also serves as its heartbeat"""
+    now = datetime.datetime.now()
+    try:
+        jobs.update_one(
+            {"_id": ObjectId(job_id), "state": RUNNING},
+            {"$set": {"progress": max(0, min(100, int(progress))), "message": message,
+                      "updated": now, "heartbeat": now}}
+        )
+    except Exception as e:
+        print(f"MongoDB Error: {e}")
+
+def append_output(job_id: str, text: str):
+    """Stream device output into the job, keeping only the most recent chunks"""
+    try:
+        jobs.update_one(
+            {"_id": ObjectId(job_id)},
+            {"$push": {"output": {"$each": [text], "$slice": -OUTPUT_CHUNKS}},
+             "$inc": {"output_count": 1}}
+        )
+    except Exception as e:
+        print(f"MongoDB Error: {e}")
+
+def job_progress(done: int, total: int) -> int:
+    """Percentage for the progress bar; connecting counts as the first 10%"""
+    return 5 if not total else 10 + int(90 * done / total)
+
+def cancel_job(job_id: str) -> bool:
+    """Cancel a queued job at once, or ask a running one to stop"""
+    now = datetime.datetime.now()
+    try:
+        result = jobs.update_one(
+            {"_id": ObjectId(job_id), "state": QUEUED},
+            {"$set": {"state": CANCELLED, "message": "Cancelled before it started",
+                      "finished": now, "updated": now}}
+        )
+        if result.modified_count:
+            return True
+        result = jobs.update_one(
+            {"_id": ObjectId(job_id), "state": RUNNING},
+            {"$set": {"cancel_requested": True, "message": "Cancellation requested", "updated": now}}
+        )
+        if result.modified_count and _queue is not None:
+            _queue.cancel_running(job_id)
+        return result.modified_count > 0
+    except Exception as e:
+        print(f"MongoDB Error: {e}")
+        return False
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        return jobs.find_one({"_id": ObjectId(job_id)})
+    except Exception as e:
+        print(f"MongoDB Error: {e}")
+        return None
+
+def list_jobs(states: Optional[List[str]] = None, limit: int = 100) -> List[Dict[str, Any]]:
+    """Most recent jobs first, optionally only those in the given states (without their output)"""
+    ensure_indexes()
+    query = {"state": {"$in": states}} if states else {}
+    try:
+        return list(jobs.find(query, {"output": 0}).sort("created", DESCENDING).limit(limit))
+    except Exception as e:
+        print(f"MongoDB Error: {e}")
+        return []
+
+def clear_finished_jobs(before: Optional[datetime.datetime] = None) -> int:
+    """Delete finished jobs, optionally only those older than before"""
+    query: Dict[str, Any] = {"state": {"$in": list(FINISHED_STATES)}}
+    if before:
+        query["finished"] = {"$lt": before}
+    try:
+        return jobs.delete_many(query).deleted_count
+    except Exception as e:
+        print(f"MongoDB Error: {e}")
+        return 0
+
+
+class JobQueue:
+    """Worker pool that runs queued jobs from the Jobs collection
+
+    Workers claim the oldest queued job with one find_one_and_update, so
+    several app instances can share the collection without running a job
+    twice. Each job gets an Operation: device output and command progress
+    are streamed into the job document, and a cancel request (stored in the
+    job, so any instance can make it) stops the handler at its next
+    checkpoint. Running jobs carry a heartbeat; a job whose heartbeat stopped
+    (the app crashed or was killed mid-rollout) is put back in the queue
+    on start and by the periodic sweep, up to MAX_ATTEMPTS starts.
+    """
+
+    def __init__(self, workers=JOB_WORKERS):
+        self.workers = workers
+        self.worker_id = f"{socket.gethostname()}:{id(self):x}"
+        self.listeners = []
+        self._running: Dict[str, Operation] = {}
+        self._threads: List[threading.Thread] = []
+        self._heartbeat_thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Condition()
+        self._pending_wake = False
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return not self._stop.is_set() and any(thread.is_alive() for thread in self._threads)
+
+    def start(self):
+        if self.running:
+            return
+        ensure_indexes()
+        # A new event per run: workers of a stopped run that are still
+        # finishing a job keep the old one and exit, while a full new set
+        # of workers claims jobs from now on
+        self._stop = threading.Event()
+        self.recover_orphans()
+        self._threads = []
+        self._add_workers()
+        if self._heartbeat_thread is None or not self._heartbeat_thread.is_alive():
+            self._heartbeat_thread = threading.Thread(target=self._heartbeat, daemon=True, name="job-heartbeat")
+            self._heartbeat_thread.start()
+
+    def _add_workers(self):
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        for index in range(len(self._threads), self.workers):
+            thread = threading.Thread(target=self._work, args=(index, self._stop), daemon=True,
+                                      name=f"job-worker-{index}")
+            self._threads.append(thread)
+            thread.start()
+
+    def set_workers(self, count: int):
+        """Resize the pool; surplus workers exit after their current job"""
+        self.workers = max(1, count)
+        if self.running:
+            self._add_workers()
+        self.wake()
+
+    def stop(self):
+        """Stop claiming new jobs; jobs already running finish in the background"""
+        self._stop.set()
+        self.wake()
+
+    def wake(self):
+        with self._wake:
+            self._pending_wake = True
+            self._wake.notify_all()
+
+    def recover_orphans(self) -> int:
+        """Requeue running jobs whose worker stopped sending heartbeats"""
+        cutoff = datetime.datetime.now() - datetime.timedelta(seconds=STALE_AFTER)
+        stale = {"state": RUNNING, "$or": [{"heartbeat": {"$lt": cutoff}}, {"heartbeat": None}]}
+        try:
+            cancelled = jobs.update_many(
+                dict(stale, cancel_requested=True),
+                {"$set": {"state": CANCELLED, "finished": datetime.datetime.now(),
+                          "message": "Cancelled while interrupted"}}
+            ).modified_count
+            failed = jobs.update_many(
+                dict(stale, attempts={"$gte": MAX_ATTEMPTS}),
+                {"$set": {"state": FAILED, "finished": datetime.datetime.now(),
+                          "error": f"Interrupted {MAX_ATTEMPTS} times; not retried"}}
+            ).modified_count
+            requeued = jobs.update_many(
+                stale,
+                {"$set": {"state": QUEUED, "worker": None, "progress": 0,
+                          "message": "Requeued after an interrupted run"}}
+            ).modified_count
+        except Exception as e:
+            print(f"MongoDB Error: {e}")
+            return 0
+        if requeued:
+            self.wake()
+        return requeued + failed + cancelled
+
+    def cancel_running(self, job_id: str) -> bool:
+        """Cancel a job running in this process without waiting for the next poll"""
+        with self._lock:
+            operation = self._running.get(job_id)
+        if operation is not None:
+            operation.cancel()
+        return operation is not None
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        now = datetime.datetime.now()
+        try:
+            return jobs.find_one_and_update(
+                {"state": QUEUED},
+                {"$set": {"state": RUNNING, "worker": self.worker_id, "started": now,
+                          "updated": now, "heartbeat": now, "message": "Started"},
+                 "$inc": {"attempts": 1}},
+                sort=[("created", ASCENDING)],
+                return_document=ReturnDocument.AFTER
+            )
+        except Exception as e:
+            print(f"MongoDB Error: {e}")
+            return None
+
+    def run_job(self, job: Dict[str, Any]):
+        """Execute one claimed job and store its final state"""
+        job_id = str(job["_id"])
+        operation = Operation(
+            on_progress=lambda done, total, message: update_progress(job_id, job_progress(done, total), message),
+            on_output=lambda text: append_output(job_id, text)
+        )
+        if job.get("cancel_requested"):
+            operation.cancel()
+        with self._lock:
+            self._running[job_id] = operation
+        self._notify(job)
+        try:
+            kwargs = dict(job["kwargs"])
+            router_arg = HANDLERS[job["handler"]][2]
+            if router_arg and isinstance(kwargs.get(router_arg), str):
+                kwargs[router_arg] = resolve_router(kwargs[router_arg])
+            operation.check()
+            result = resolve_handler(job["handler"])(**kwargs, operation=operation)
+            success, error = job_outcome(result)
+            if operation.cancelled and not success:
+                state, message = CANCELLED, "Cancelled"
+            else:
+                state = SUCCEEDED if success else FAILED
+                message = "Completed" if success else "Failed"
+        except Exception as e:
+            if operation.cancelled:
+                state, message, error = CANCELLED, "Cancelled", str(e)
+            else:
+                traceback.print_exc()
+                state, message, error = FAILED, "Failed", str(e)
+        now = datetime.datetime.now()
+        progress = 100 if state == SUCCEEDED else job_progress(operation.done, operation.total)
+        try:
+            final = jobs.find_one_and_update(
+                {"_id": job["_id"], "worker": self.worker_id},
+                {"$set": {"state": state, "progress": progress, "message": message,
+                          "error": error or None, "finished": now, "updated": now}},
+                return_document=ReturnDocument.AFTER
+            )
+        except Exception as e:
+            print(f"MongoDB Error: {e}")
+            final = None
+        with self._lock:
+            self._running.pop(job_id, None)
+        self._notify(final or job)
+
+    def _notify(self, job):
+        for listener in self.listeners:
+            listener(job)
+
+    def _work(self, index: int, stop: threading.Event):
+        while not stop.is_set() and index < self.workers:
+            job = self.claim()
+            if job is not None:
+                self.run_job(job)
+                continue
+            with self._wake:
+                if not self._pending_wake:
+                    self._wake.wait(IDLE_WAIT)
+                self._pending_wake = False
+
+    def _watch_cancellations(self, running: Dict[str, Operation]):
+        """Forward cancel requests made in the database (any app instance) to the operations"""
+        try:
+            requested = jobs.find(
+                {"_id": {"$in": [ObjectId(job_id) for job_id in running]}, "cancel_requested": True},
+                {"_id": 1}
+            )
+            for job in requested:
+                running[str(job["_id"])].cancel()
+        except Exception as e:
+            print(f"MongoDB Error: {e}")
+
+    def _heartbeat(self):
+        # Outlives stop() until the jobs still running have finished
+        last_sweep = last_beat = time.monotonic()
+        while True:
+            time.sleep(CANCEL_POLL)
+            with self._lock:
+                running = dict(self._running)
+            if self._stop.is_set() and not running:
+                return
+            if running:
+                self._watch_cancellations(running)
+            if running and time.monotonic() - last_beat >= HEARTBEAT_INTERVAL:
+                last_beat = time.monotonic()
+                try:
+                    jobs.update_many({"_id": {"$in": [ObjectId(job_id) for job_id in running]},
+                                      "worker": self.worker_id},
+                                     {"$set": {"heartbeat": datetime.datetime.now()}})
+                except Exception as e:
+                    print(f"MongoDB Error: {e}")
+            if not self._stop.is_set() and time.monotonic() - last_sweep >= STALE_AFTER:
+                self.recover_orphans()
+                last_sweep = time.monotonic()
+
+
+_queue = None
+
+def get_job_queue() -> JobQueue:
+    """Shared worker pool started by the dashboard"""
+    global _queue
+    if _queue is None:
+        _queue = JobQueue()
+    return _queue
@@ -1,5 +1,9 @@
 from pymongo import MongoClient
 
+# Shared by inventory_version, which pollers call every few seconds
+client = MongoClient("mongodb://localhost:27017/")
+routers_collection = client["NetworkApp"]["Routers"]
+
 
 def get_routers():
     try:
@@ -20,7 +24,7 @@ def add_router(router_data):
         
         result = collection.update_one(
             {},
-            {"$push": {"routers": router_data}},
+            {"$push": {"routers": router_data}, "$inc": {"version": 1}},
             upsert=True
         )
         return result.modified_count > 0 or result.upserted_id is not None
@@ -41,9 +45,38 @@ def delete_router(identifier):
                     {"name": identifier},
                     {"ip": identifier}
                 ]
-            }}}
+            }}, "$inc": {"version": 1}}
         )
         return result.modified_count > 0
     except Exception as e:
         print(f"MongoDB Error: {e}")
-        return False
\ No newline at end of file
+        return False
+def set_stats_backend(identifier, backend, community=None):
+    """Choose how a router's stats are collected ('ssh' or 'snmp')"""
+    if backend not in ("ssh", "snmp"):
+        raise ValueError("Stats backend must be 'ssh' or 'snmp'")
+    try:
+        client = MongoClient("mongodb://localhost:27017/")
+        db = client["NetworkApp"]
+        collection = db["Routers"]
+
+        update = {"routers.$.stats_backend": backend}
+        if community:
+            update["routers.$.snmp_community"] = community
+        result = collection.update_one(
+            {"$or": [{"routers.name": identifier}, {"routers.ip": identifier}]},
+            {"$set": update, "$inc": {"version": 1}}
+        )
+        return result.modified_count > 0
+    except Exception as e:
+        print(f"MongoDB Error: {e}")
+        return False
+
+def inventory_version():
+    """Counter bumped by every inventory change, so pollers can notice them cheaply"""
+    try:
+        document = routers_collection.find_one({}, {"_id": 0, "version": 1})
+        return document.get("version", 0) if document else 0
+    except Exception as e:
+        print(f"MongoDB Error: {e}")
+        return None
@@ -0,0 +1,65 @@
+from pymongo import MongoClient, ASCENDING, UpdateOne
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017/")
+db = client["NetworkApp"]
+metrics_history = db["MetricsHistory"]
+
+BUCKET_SECONDS = 3600  # one document per router, metric and hour
+
+_indexes_ready = False
+
+def ensure_indexes():
+    """Create the index used for range reads"""
+    global _indexes_ready
+    if not _indexes_ready:
+        metrics_history.create_index(
+            [("router", ASCENDING), ("metric", ASCENDING), ("bucket", ASCENDING)], unique=True
+        )
+        _indexes_ready = True
+
+def _bucket(timestamp: float) -> int:
+    return int(timestamp // BUCKET_SECONDS * BUCKET_SECONDS)
+
+def record_cycle(samples: Dict[str, Tuple[float, Dict[str, Optional[float]]]]):
+    """Append one polling cycle, {router: (timestamp, {metric: value})}, in a single bulk write"""
+    ensure_indexes()
+    operations = [
+        UpdateOne(
+            {"router": router, "metric": metric, "bucket": _bucket(timestamp)},
+            {"$push": {"t": timestamp, "v": float(value)}, "$inc": {"count": 1}},
+            upsert=True
+        )
+        for router, (timestamp, values) in samples.items()
+        for metric, value in values.items()
+        if value is not None
+    ]
+    if operations:
+        metrics_history.bulk_write(operations, ordered=False)
+
+def load_history(router: str, metric: str, start: float, end: float) -> Tuple[np.ndarray, np.ndarray]:
+    """(timestamps, values) of a metric between start and end, oldest first"""
+    ensure_indexes()
+    times, values = [], []
+    cursor = metrics_history.find(
+        {"router": router, "metric": metric, "bucket": {"$gte": _bucket(start), "$lte": _bucket(end)}},
+        {"t": 1, "v": 1, "_id": 0}
+    ).sort("bucket", ASCENDING)
+    for document in cursor:
+        times.extend(document["t"])
+        values.extend(document["v"])
+    times, values = np.array(times, dtype=np.float64), np.array(values, dtype=np.float64)
+    order = np.argsort(times, kind="stable")
+    times, values = times[order], values[order]
+    keep = (times >= start) & (times <= end)
+    return times[keep], values[keep]
+
+def history_span(router: str, metric: str) -> Optional[Tuple[float, float]]:
+    """Oldest and newest stored timestamps for a series, or None"""
+    first = metrics_history.find_one({"router": router, "metric": metric}, sort=[("bucket", ASCENDING)])
+    last = metrics_history.find_one({"router": router, "metric": metric}, sort=[("bucket", -1)])
+    if not first:
+        return None
+    return min(first["t"]), max(last["t"])
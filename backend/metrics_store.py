@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from typing import Dict, Tuple, Optional
+
+DEFAULT_CAPACITY = 240      # samples per series: one hour at the 15 s base interval
+DEFAULT_MAX_SERIES = 20000  # (router, metric) pairs kept before the stalest is dropped
+
+
+class RingSeries:
+    """Fixed-size sample history with timestamps, backed by NumPy arrays
+
+    Every sample is written twice, at i and i + capacity, so the last n
+    samples are always one contiguous slice and can be returned as a view
+    without copying or reordering.
+    """
+    __slots__ = ("capacity", "times", "values", "head", "count")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.times = np.zeros(2 * capacity)
+        self.values = np.full(2 * capacity, np.nan)
+        self.head = 0    # next write position in [0, capacity)
+        self.count = 0
+
+    def append(self, timestamp: float, value: float):
+        head = self.head
+        self.times[head] = self.times[head + self.capacity] = timestamp
+        self.values[head] = self.values[head + self.capacity] = value
+        self.head = (head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def window(self, count: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Read-only views of the last count samples, oldest first"""
+        count = self.count if count is None else min(count, self.count)
+        end = self.head + self.capacity
+        times, values = self.times[end - count:end], self.values[end - count:end]
+        times.flags.writeable = False
+        values.flags.writeable = False
+        return times, values
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + self.values.nbytes
+
+
+class MetricsStore:
+    """Fleet-wide in-memory metrics, one ring per (router, metric)
+
+    The poller appends and the chart widgets and dashboard read views of the
+    same buffers, so no page keeps its own copy. Memory is fixed per series
+    and the number of series is capped, dropping the least recently updated
+    series first.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, max_series: int = DEFAULT_MAX_SERIES):
+        self.capacity = capacity
+        self.max_series = max_series
+        self._series: "OrderedDict[Tuple[str, str], RingSeries]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: Tuple[str, str]) -> RingSeries:
+        series = self._series.get(key)
+        if series is None:
+            if len(self._series) >= self.max_series:
+                self._series.popitem(last=False)
+            series = self._series[key] = RingSeries(self.capacity)
+        else:
+            self._series.move_to_end(key)
+        return series
+
+    def append(self, router: str, metric: str, value: float, timestamp: Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._get((router, metric)).append(timestamp, value)
+
+    def append_sample(self, router: str, values: Dict[str, Optional[float]], timestamp: Optional[float] = None):
+        """Record several metrics of one poll, skipping the ones that are missing"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            for metric, value in values.items():
+                if value is not None:
+                    self._get((router, metric)).append(timestamp, value)
+
+    def window(self, router: str, metric: str, count: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, values) views of the last count samples; empty if unknown
+
+        The views alias the ring, so read them before the next poll lands
+        rather than holding on to them.
+        """
+        with self._lock:
+            series = self._series.get((router, metric))
+            if series is None:
+                return np.empty(0), np.empty(0)
+            return series.window(count)
+
+    def latest(self, router: str, metric: str) -> Optional[float]:
+        _, values = self.window(router, metric, 1)
+        return float(values[0]) if len(values) else None
+
+    def forget(self, router: str):
+        with self._lock:
+            for key in [key for key in self._series if key[0] == router]:
+                del self._series[key]
+
+    def memory_usage(self) -> int:
+        """Bytes held by all series buffers"""
+        with self._lock:
+            return sum(series.nbytes for series in self._series.values())
+
+
+_store = None
+
+def get_metrics_store() -> MetricsStore:
+    """Shared store written by the pollers and read by the GUI"""
+    global _store
+    if _store is None:
+        _store = MetricsStore()
+    return _store
+
+def set_metrics_store(store):
+    """Swap the process-wide store, e.g. for the collector's shared-memory ring"""
+    global _store
+    _store = store
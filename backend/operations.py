@@ -0,0 +1,116 @@
+import threading
+import time
+from typing import Callable, Optional
+
+READ_QUIET = 0.5         # seconds without new data that end a read
+READ_LIMIT = 10.0        # hard cap on one read, however chatty the device
+READ_MAX_BYTES = 1024 * 1024
+PROMPT_ENDINGS = ('#', '>')
+
+
+class OperationCancelled(Exception):
+    """Raised at the next checkpoint after an operation was cancelled"""
+    pass
+
+
+class Operation:
+    """Cancellation token and progress/output channel for one device operation
+
+    Backends call check() between commands and stream what they do through
+    step() and output(); callers cancel() from any thread. Cancellation is
+    cooperative: the running command finishes, the next checkpoint raises
+    OperationCancelled and the backend's finally block closes the session.
+    """
+
+    def __init__(self, on_progress: Optional[Callable[[int, int, str], None]] = None,
+                 on_output: Optional[Callable[[str], None]] = None):
+        self.on_progress = on_progress
+        self.on_output = on_output
+        self.done = 0
+        self.total = 0
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self):
+        if self._cancelled.is_set():
+            raise OperationCancelled(f"Cancelled after {self.done} of {self.total} commands")
+
+    def sleep(self, seconds: float):
+        """time.sleep that returns early, raising, when the operation is cancelled"""
+        if self._cancelled.wait(seconds):
+            self.check()
+
+    def step(self, message: str, done: Optional[int] = None, total: Optional[int] = None):
+        if total is not None:
+            self.total = total
+        if done is not None:
+            self.done = done
+        if self.on_progress:
+            self.on_progress(self.done, self.total, message)
+
+    def output(self, text: str):
+        if text and self.on_output:
+            self.on_output(text)
+
+
+def ensure_operation(operation: Optional[Operation]) -> Operation:
+    return operation if operation is not None else Operation()
+
+
+def read_available(channel, operation: Operation, quiet: float = READ_QUIET,
+                   limit: float = READ_LIMIT, max_bytes: int = READ_MAX_BYTES) -> str:
+    """Read until the channel stays silent for quiet seconds, bounded in time and size
+
+    Replaces 'while recv_ready()' loops, which never end on a device that
+    keeps sending (a paging prompt, a log storm on the console).
+    """
+    chunks = []
+    received = 0
+    deadline = time.monotonic() + limit
+    last_data = time.monotonic()
+    while time.monotonic() < deadline and received < max_bytes:
+        operation.check()
+        if channel.recv_ready():
+            data = channel.recv(65535).decode('utf-8', 'ignore')
+            chunks.append(data)
+            received += len(data)
+            operation.output(data)
+            last_data = time.monotonic()
+        elif channel.exit_status_ready() or time.monotonic() - last_data >= quiet:
+            break
+        else:
+            time.sleep(0.05)
+    return "".join(chunks)
+
+def read_until_prompt(channel, operation: Operation, limit: float = 10.0) -> str:
+    """Read the login banner up to the exec prompt, giving up after limit seconds"""
+    output = ""
+    deadline = time.monotonic() + limit
+    while not output.rstrip().endswith(PROMPT_ENDINGS):
+        if time.monotonic() >= deadline:
+            raise TimeoutError("No prompt from the device")
+        output += read_available(channel, operation, quiet=0.2, limit=deadline - time.monotonic())
+    return output
+
+def send_commands(channel, commands, operation: Operation, pause: float = 0.5,
+                  error_markers=("% Invalid",)) -> str:
+    """Send commands one by one, streaming each reply and stopping at the first rejection"""
+    output = ""
+    total = len(commands)
+    for index, command in enumerate(commands):
+        operation.check()
+        operation.step(command.splitlines()[0], index, total)
+        channel.send(f"{command}\n")
+        operation.sleep(pause)
+        reply = read_available(channel, operation)
+        output += reply
+        if any(marker in reply for marker in error_markers):
+            raise ValueError(f"Command failed: {command}\n{reply}")
+    operation.step("Done", total, total)
+    return output
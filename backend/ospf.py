@@ -1,7 +1,9 @@
 from pymongo import MongoClient
 import paramiko
-import time
 from datetime import datetime
+from backend.state_cache import get_state_cache
+from backend.ssh_client import RouterSSHClient
+from backend.operations import OperationCancelled, ensure_operation, read_available, send_commands
 
 client = MongoClient("mongodb://localhost:27017/")
 db = client["NetworkApp"]
@@ -22,7 +24,8 @@ def router_connection(router_name):
         raise ValueError("Router not found")
     return doc["routers"][0]
 
-def execute_ssh_commands(router, commands):
+def execute_ssh_commands(router, commands, operation=None):
+    operation = ensure_operation(operation)
     logged_commands = []
     full_output = ""
     status = "failure"
@@ -30,47 +33,51 @@ def execute_ssh_commands(router, commands):
     error = None
 
     try:
-        ssh = paramiko.SSHClient()
+        ssh = RouterSSHClient(write=True)
         ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        operation.step(f"Connecting to {router['name']}")
         ssh.connect(
             router["ip"],
             username=router["username"],
             password=router["password"],
             timeout=10
         )
+        operation.check()
         channel = ssh.invoke_shell()
-        time.sleep(1)
+        operation.sleep(1)
+        output = read_available(channel, operation)
 
         if "enable_password" in router:
             channel.send("enable\n")
-            time.sleep(1)
+            operation.sleep(1)
             channel.send(f"{router['enable_password']}\n")
-            time.sleep(1)
+            operation.sleep(1)
             logged_commands.extend(["enable", "********"])
+            output += read_available(channel, operation)
 
         logged_commands.extend(commands)
-        for cmd in commands:
-            channel.send(f"{cmd}\n")
-            time.sleep(0.5)
-
-        output = ""
-        while True:
-            if channel.recv_ready():
-                output += channel.recv(4096).decode()
-                time.sleep(0.5)
-            else:
-                break
+        # Reads are bounded: a device that keeps sending can no longer hold the loop forever
+        output += send_commands(channel, commands, operation, error_markers=())
         full_output = output.strip()
         
         success = "% Invalid" not in output and "error" not in output.lower()
         status = "success" if success else "failure"
 
+    except OperationCancelled as e:
+        error = str(e)
+        full_output = error
+        status = "cancelled"
+
     except Exception as e:
         error = str(e)
         full_output = f"SSH Error: {error}"
         status = "error"
 
     finally:
+        # Release the session slot and config write lock before touching the database
+        if 'ssh' in locals():
+            ssh.close()
+
         log_entry = {
             "ip": router["ip"],
             "username": router["username"],
@@ -80,20 +87,22 @@ def execute_ssh_commands(router, commands):
             "timestamp": datetime.now(),
             "error": error
         }
-        ssh_logs.insert_one(log_entry)
-        
-        if 'ssh' in locals():
-            ssh.close()
+        try:
+            ssh_logs.insert_one(log_entry)
+        except Exception as e:
+            print(f"MongoDB Error: {e}")
 
     return success if success else full_output
 
-def apply_ospf_config(router_name, networks, ospf_id):
+def apply_ospf_config(router_name, networks, ospf_id, operation=None):
     try:
         router = router_connection(router_name)
         commands = ["configure terminal", f"router ospf {ospf_id}"]
         commands.extend(f"network {n['network']} {n['mask']} area {n['area']}" for n in networks)
         commands += ["end", "write memory"]
-        result = execute_ssh_commands(router, commands)
+        result = execute_ssh_commands(router, commands, operation)
+        if result is True:
+            get_state_cache().invalidate(router, ["ospf_processes"])
         
         log_entry = {
             "action": "apply",
@@ -120,7 +129,7 @@ def apply_ospf_config(router_name, networks, ospf_id):
         config_logs.insert_one(log_entry)
         return str(e)
 
-def delete_ospf_config(router_name, ospf_id):
+def delete_ospf_config(router_name, ospf_id, operation=None):
     try:
         router = router_connection(router_name)
         commands = [
@@ -129,7 +138,9 @@ def delete_ospf_config(router_name, ospf_id):
             "end",
             "write memory"
         ]
-        result = execute_ssh_commands(router, commands)
+        result = execute_ssh_commands(router, commands, operation)
+        if result is True:
+            get_state_cache().invalidate(router, ["ospf_processes"])
         
         log_entry = {
             "action": "delete_all",
@@ -154,7 +165,7 @@ def delete_ospf_config(router_name, ospf_id):
         config_logs.insert_one(log_entry)
         return str(e)
 
-def delete_ospf_network(router_name, network, mask, area, ospf_id):
+def delete_ospf_network(router_name, network, mask, area, ospf_id, operation=None):
     try:
         router = router_connection(router_name)
         commands = [
@@ -164,7 +175,7 @@ def delete_ospf_network(router_name, network, mask, area, ospf_id):
             "end",
             "write memory"
         ]
-        result = execute_ssh_commands(router, commands)
+        result = execute_ssh_commands(router, commands, operation)
         
         log_entry = {
             "action": "delete_network",
@@ -0,0 +1,101 @@
+import random
+import threading
+from typing import Dict, Any, Optional
+
+
+class RouterPollState:
+    """Polling state kept per router"""
+    __slots__ = ("interval", "last_cpu", "last_memory", "failures")
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.last_cpu: Optional[float] = None
+        self.last_memory: Optional[float] = None
+        self.failures = 0
+
+
+class AdaptivePollScheduler:
+    """Per-router polling intervals driven by the last samples
+
+    Routers whose CPU or memory is moving, or sits near a threshold, are
+    polled faster; stable routers drift towards the maximum interval and
+    unreachable ones back off exponentially. Every delay carries random
+    jitter so large inventories do not poll in lockstep.
+    """
+
+    def __init__(self, base: float = 15, minimum: float = 5, maximum: float = 120,
+                 backoff_max: float = 600, jitter: float = 0.1,
+                 cpu_threshold: float = 80, memory_threshold: float = 85,
+                 threshold_margin: float = 10, change_threshold: float = 5):
+        self.base = base
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.cpu_threshold = cpu_threshold
+        self.memory_threshold = memory_threshold
+        self.threshold_margin = threshold_margin
+        self.change_threshold = change_threshold
+        self._states: Dict[str, RouterPollState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, router: str) -> RouterPollState:
+        state = self._states.get(router)
+        if state is None:
+            state = self._states[router] = RouterPollState(self.base)
+        return state
+
+    def _jittered(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def initial_delay(self, router: str) -> float:
+        """Spread the first poll of each router over one base interval"""
+        return random.uniform(0, self.base)
+
+    def _near_threshold(self, cpu: Optional[float], memory: Optional[float]) -> bool:
+        return ((cpu is not None and cpu >= self.cpu_threshold - self.threshold_margin) or
+                (memory is not None and memory >= self.memory_threshold - self.threshold_margin))
+
+    def record_success(self, router: str, stats: Dict[str, Any]) -> float:
+        """Update the router's interval from a successful sample, return the next delay"""
+        cpu, memory = stats.get('cpu'), stats.get('memory')
+        with self._lock:
+            state = self._state(router)
+            if state.failures:
+                state.failures = 0
+                state.interval = self.base
+
+            changes = [abs(new - old) for new, old in ((cpu, state.last_cpu), (memory, state.last_memory))
+                       if new is not None and old is not None]
+            change = max(changes) if changes else None
+
+            if self._near_threshold(cpu, memory) or (change is not None and change >= self.change_threshold):
+                state.interval = max(self.minimum, state.interval / 2)
+            elif change is not None and change < self.change_threshold / 2:
+                state.interval = min(self.maximum, state.interval * 1.5)
+
+            state.last_cpu, state.last_memory = cpu, memory
+            return self._jittered(state.interval)
+
+    def record_failure(self, router: str) -> float:
+        """Back off exponentially while a router is unreachable, return the next delay"""
+        with self._lock:
+            state = self._state(router)
+            state.failures += 1
+            state.interval = min(self.backoff_max, self.base * 2 ** state.failures)
+            return self._jittered(state.interval)
+
+    def interval(self, router: str) -> float:
+        with self._lock:
+            return self._state(router).interval
+
+    def forget(self, router: str):
+        with self._lock:
+            self._states.pop(router, None)
+
+
+_scheduler = AdaptivePollScheduler()
+
+def get_poll_scheduler() -> AdaptivePollScheduler:
+    """Scheduler shared by every poller in the process"""
+    return _scheduler
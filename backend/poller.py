@@ -0,0 +1,192 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
+from backend.Connect import get_routers
+from backend.Router_stats import get_stats_for_router
+from backend.poll_scheduler import get_poll_scheduler
+from backend.interface_rates import get_interface_rates
+from backend.metrics_store import get_metrics_store
+from backend.metrics_history import record_cycle
+from backend.alerts import get_alert_engine
+from backend.reboot_detector import get_reboot_detector
+from backend.session_budget import session_priority, BACKGROUND
+
+MAX_WORKERS = 16
+TICK = 1.0                   # seconds between checks for due routers
+INVENTORY_REFRESH = 60       # seconds between re-reads of the router list
+STALE_SLACK = 64             # dropped-router heap entries tolerated before assign() compacts
+POLL_PROCESSES = int(os.environ.get("NETAPP_POLL_PROCESSES", 0))  # >0 shards polling over processes
+
+
+class FleetPoller:
+    """Polls every router in the inventory in the background
+
+    Each router is due again after the delay the adaptive scheduler returns
+    for its last sample. Routers due in the same tick form one cycle: they
+    are polled in parallel and their results are handed to the interface
+    rate table and the listeners together.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, tick=TICK):
+        self.max_workers = max_workers
+        self.tick = tick
+        self.inventory_refresh = INVENTORY_REFRESH
+        self.scheduler = get_poll_scheduler()
+        self.rates = get_interface_rates()
+        self.store = get_metrics_store()
+        self.alerts = get_alert_engine()
+        self.reboots = get_reboot_detector()
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self.listeners = []
+        self._routers: Dict[str, Dict[str, Any]] = {}
+        self._due = []  # heap of (due time, router ip, generation)
+        self._scheduled: Dict[str, int] = {}  # router ip -> generation of its live heap entry
+        self._generations = itertools.count()
+        self._inventory_loaded = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive() or self._stop.is_set():
+            # A new event per run, so a stopped thread still finishing a cycle
+            # exits on its own instead of blocking this restart
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._loop, args=(self._stop,), daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _refresh_inventory(self):
+        try:
+            routers = {router['ip']: router for router in get_routers()}
+        except Exception as e:
+            print(f"Database error: {e}")
+            return
+        self.assign(routers)
+        self._inventory_loaded = time.monotonic()
+
+    def assign(self, routers: Dict[str, Dict[str, Any]]):
+        """Poll exactly these routers (keyed by ip) from now on"""
+        now = time.monotonic()
+        for ip in self._routers.keys() - routers.keys():
+            self.forget(self._routers[ip])
+        for ip in routers.keys() - self._routers.keys():
+            self._schedule(ip, now + self.scheduler.initial_delay(ip), next(self._generations))
+        self._routers = routers
+        if len(self._due) > 2 * len(self._scheduled) + STALE_SLACK:
+            # Shard workers are reassigned on every rebalance; drop the dead entries
+            self._due = [entry for entry in self._due if self._scheduled.get(entry[1]) == entry[2]]
+            heapq.heapify(self._due)
+
+    def _schedule(self, ip: str, due: float, generation: int):
+        self._scheduled[ip] = generation
+        heapq.heappush(self._due, (due, ip, generation))
+
+    def forget(self, router: Dict[str, Any]):
+        # Its heap entry stays until it pops, then is skipped as stale
+        self._scheduled.pop(router['ip'], None)
+        self.scheduler.forget(router['ip'])
+        self.rates.forget(router['name'])
+        self.store.forget(router['name'])
+        self.alerts.forget(router['name'])
+        self.latest.pop(router['ip'], None)
+
+    def _take_due(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        due = []
+        while self._due and self._due[0][0] <= now:
+            _, ip, generation = heapq.heappop(self._due)
+            # Skip entries of routers dropped (and possibly re-added) meanwhile
+            if self._scheduled.get(ip) == generation:
+                due.append(self._routers[ip])
+        return due
+
+    def _poll_one(self, router: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            # Yield device sessions to interactive work (GUI fetches, config pushes)
+            with session_priority(BACKGROUND):
+                stats = get_stats_for_router(router, interfaces=True)
+        except Exception as e:
+            stats = {'error': str(e)}
+        stats['timestamp'] = time.time()
+        return stats
+
+    def run_cycle(self, routers: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Poll the given routers in parallel and process the results as one batch"""
+        generations = {router['ip']: self._scheduled.get(router['ip']) for router in routers}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = dict(zip((router['name'] for router in routers),
+                               executor.map(self._poll_one, routers)))
+
+        now = time.monotonic()
+        for router in routers:
+            stats = results[router['name']]
+            if stats.get('error'):
+                delay = self.scheduler.record_failure(router['ip'])
+            else:
+                delay = self.scheduler.record_success(router['ip'], stats)
+            generation = generations[router['ip']]
+            if generation is not None and self._scheduled.get(router['ip']) == generation:
+                self._schedule(router['ip'], now + delay, generation)
+        self.ingest(routers, results)
+        return results
+
+    def ingest(self, routers: List[Dict[str, Any]], results: Dict[str, Dict[str, Any]]):
+        """Feed one cycle's results to the store, rate table, detectors and listeners
+
+        Only each router's name and ip are used, so a sharded poller can
+        pass results polled in another process.
+        """
+        samples = {}
+        history = {}
+        for router in routers:
+            stats = results[router['name']]
+            self.latest[router['ip']] = stats
+            if not stats.get('error'):
+                values = {'cpu': stats.get('cpu'), 'memory': stats.get('memory')}
+                self.store.append_sample(router['name'], dict(values, uptime=stats.get('uptime_seconds')),
+                                         stats['timestamp'])
+                history[router['name']] = (stats['timestamp'], values)
+                self.reboots.observe(router['name'], stats['timestamp'], stats.get('uptime_seconds'))
+                if stats.get('interfaces'):
+                    samples[router['name']] = (stats['timestamp'], stats['interfaces'])
+
+        self.rates.update(samples)
+        self.alerts.evaluate(list(history))
+        try:
+            record_cycle(history)
+        except Exception as e:
+            print(f"MongoDB Error: {e}")
+        for listener in self.listeners:
+            listener(results)
+
+    def _loop(self, stop: threading.Event):
+        while not stop.is_set():
+            if time.monotonic() - self._inventory_loaded >= self.inventory_refresh:
+                self._refresh_inventory()
+            due = self._take_due()
+            if due:
+                try:
+                    self.run_cycle(due)
+                except Exception as e:
+                    print(f"Polling cycle failed: {e}")
+            stop.wait(self.tick)
+
+
+_poller = None
+
+def get_fleet_poller():
+    """Shared poller instance started by the dashboard or the collector"""
+    global _poller
+    if _poller is None:
+        if POLL_PROCESSES:
+            from backend.sharded_poller import ShardedPoller
+            _poller = ShardedPoller(POLL_PROCESSES)
+        else:
+            _poller = FleetPoller()
+    return _poller
@@ -0,0 +1,208 @@
+import asyncio
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from backend.Connect import get_routers
+from backend.metrics_store import get_metrics_store
+from backend.metrics_history import record_cycle
+
+PROBE_INTERVAL = 5.0     # seconds between sweeps of the whole inventory
+PROBE_TIMEOUT = 2.0
+CONCURRENCY = 256
+DOWN_AFTER = 2           # consecutive failed sweeps before a router counts as down
+INVENTORY_REFRESH = 60
+
+
+@dataclass
+class ProbeState:
+    """Latest reachability result for one router"""
+    reachable: Optional[bool] = None
+    rtt_ms: Optional[float] = None
+    icmp_rtt_ms: Optional[float] = None
+    failures: int = 0
+    last_probe: float = 0.0
+    last_seen: Optional[float] = None
+    error: str = ""
+
+
+async def tcp_probe(host: str, port: int = 22, timeout: float = PROBE_TIMEOUT) -> float:
+    """Milliseconds to complete a TCP handshake with the SSH port"""
+    start = time.perf_counter()
+    _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    rtt = (time.perf_counter() - start) * 1000
+    writer.close()
+    return rtt
+
+def _checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def icmp_available() -> bool:
+    """Unprivileged ICMP echo sockets need net.ipv4.ping_group_range to include our group"""
+    try:
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP).close()
+        return True
+    except OSError:
+        return False
+
+async def icmp_probe(host: str, timeout: float = PROBE_TIMEOUT, sequence: int = 1) -> float:
+    """Milliseconds for an ICMP echo round trip"""
+    loop = asyncio.get_running_loop()
+    address = (await loop.getaddrinfo(host, None, family=socket.AF_INET))[0][4][0]
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    sock.setblocking(False)
+    try:
+        header = struct.pack("!BBHHH", 8, 0, 0, 0, sequence)
+        payload = b"network-automation-probe"
+        packet = struct.pack("!BBHHH", 8, 0, _checksum(header + payload), 0, sequence) + payload
+        await loop.sock_connect(sock, (address, 0))
+        start = time.perf_counter()
+        await loop.sock_sendall(sock, packet)
+        while True:
+            reply = await asyncio.wait_for(loop.sock_recv(sock, 1024), timeout - (time.perf_counter() - start))
+            # Echo reply with our sequence number; the kernel owns the identifier
+            if reply[0] == 0 and struct.unpack("!H", reply[6:8])[0] == sequence:
+                return (time.perf_counter() - start) * 1000
+    finally:
+        sock.close()
+
+
+class ProbeEngine:
+    """Sweeps the whole inventory for reachability and latency
+
+    A TCP connect to port 22 (plus an ICMP echo when the OS allows it) is
+    made to every router concurrently every few seconds from a background
+    asyncio loop. RTTs go into the shared metrics store and the stored
+    history as the 'rtt' metric. SSH clients consult is_known_down() to
+    fail immediately instead of waiting out a connect timeout.
+    """
+
+    def __init__(self, interval=PROBE_INTERVAL, timeout=PROBE_TIMEOUT, icmp=None, port=22):
+        self.interval = interval
+        self.timeout = timeout
+        self.port = port
+        self.icmp = icmp_available() if icmp is None else icmp
+        self.states: Dict[str, ProbeState] = {}
+        self.listeners = []
+        self.last_sweep_seconds = 0.0
+        self._routers: Dict[str, str] = {}
+        self._inventory_loaded = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def start(self):
+        if not self.running:
+            # A new event per run, so a stopped thread still in a sweep exits on its own
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop,), daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def state(self, host: str) -> Optional[ProbeState]:
+        with self._lock:
+            return self.states.get(host)
+
+    def is_known_down(self, host: str) -> bool:
+        """True while recent sweeps agree the router does not answer"""
+        state = self.state(host)
+        if not self.running or state is None:
+            return False
+        fresh = time.time() - state.last_probe <= self.interval * 3
+        return fresh and state.failures >= DOWN_AFTER
+
+    def _refresh_inventory(self):
+        try:
+            self._routers = {router['ip']: router['name'] for router in get_routers()}
+        except Exception as e:
+            print(f"Database error: {e}")
+        self._inventory_loaded = time.monotonic()
+
+    async def _probe_one(self, host: str, semaphore) -> Dict[str, Any]:
+        async with semaphore:
+            result: Dict[str, Any] = {'host': host, 'rtt_ms': None, 'icmp_rtt_ms': None, 'error': ""}
+            try:
+                result['rtt_ms'] = await tcp_probe(host, self.port, self.timeout)
+            except asyncio.TimeoutError:
+                result['error'] = "timeout"
+            except OSError as e:
+                result['error'] = e.strerror or str(e)
+            if self.icmp:
+                try:
+                    result['icmp_rtt_ms'] = await icmp_probe(host, self.timeout)
+                except (asyncio.TimeoutError, OSError):
+                    pass
+            return result
+
+    async def sweep(self, hosts: List[str]) -> List[Dict[str, Any]]:
+        """Probe every host concurrently and update the reachability states"""
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self._probe_one(host, semaphore) for host in hosts))
+        self.last_sweep_seconds = time.perf_counter() - started
+        now = time.time()
+
+        samples = {}
+        with self._lock:
+            for result in results:
+                state = self.states.setdefault(result['host'], ProbeState())
+                state.last_probe = now
+                state.rtt_ms, state.icmp_rtt_ms, state.error = result['rtt_ms'], result['icmp_rtt_ms'], result['error']
+                if result['rtt_ms'] is not None:
+                    state.reachable, state.failures, state.last_seen = True, 0, now
+                else:
+                    state.failures += 1
+                    state.reachable = state.failures < DOWN_AFTER
+                name = self._routers.get(result['host'], result['host'])
+                samples[name] = (now, {'rtt': result['rtt_ms'], 'icmp_rtt': result['icmp_rtt_ms']})
+
+        store = get_metrics_store()
+        for name, (timestamp, values) in samples.items():
+            store.append_sample(name, values, timestamp)
+        try:
+            record_cycle(samples)
+        except Exception as e:
+            print(f"MongoDB Error: {e}")
+        for listener in self.listeners:
+            listener(results)
+        return results
+
+    def _run(self, stop: threading.Event):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            while not stop.is_set():
+                started = time.monotonic()
+                if started - self._inventory_loaded >= INVENTORY_REFRESH:
+                    self._refresh_inventory()
+                if self._routers:
+                    try:
+                        loop.run_until_complete(self.sweep(list(self._routers)))
+                    except Exception as e:
+                        print(f"Probe sweep failed: {e}")
+                stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+        finally:
+            loop.close()
+
+
+_engine = None
+
+def get_probe_engine() -> ProbeEngine:
+    """Shared engine started by the dashboard"""
+    global _engine
+    if _engine is None:
+        _engine = ProbeEngine()
+    return _engine
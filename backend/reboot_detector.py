@@ -0,0 +1,87 @@
+from pymongo import MongoClient
+import datetime
+import threading
+from typing import Any, Dict, Optional
+from backend.events import make_event, record_events
+
+# MongoDB setup
+client = MongoClient("mongodb://localhost:27017/")
+db = client["NetworkApp"]
+router_boots = db["RouterBoots"]
+
+# CLI uptime has minute resolution and polls take a few seconds, so boot
+# times derived from two samples of the same boot can differ by this much
+TOLERANCE = 180  # seconds
+
+
+class RebootDetector:
+    """Spots uptime resets from one sample at a time
+
+    Each sample gives an estimated boot time (sample time minus uptime). A
+    boot time that moves forward by more than the tolerance means the
+    router restarted since the previous sample, however long the gap was.
+    Only the last boot time per router is kept, in memory and in Mongo, so
+    detection never re-reads history and survives an application restart.
+    """
+
+    def __init__(self, tolerance: float = TOLERANCE):
+        self.tolerance = tolerance
+        self._boots: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _known_boot(self, router: str) -> Optional[float]:
+        boot = self._boots.get(router)
+        if boot is None:
+            try:
+                document = router_boots.find_one({"_id": router})
+            except Exception as e:
+                print(f"MongoDB Error: {e}")
+                document = None
+            if document:
+                boot = self._boots[router] = document["boot_time"]
+        return boot
+
+    def _save_boot(self, router: str, boot_time: float):
+        self._boots[router] = boot_time
+        try:
+            router_boots.update_one(
+                {"_id": router},
+                {"$set": {"boot_time": boot_time, "updated": datetime.datetime.now()}},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"MongoDB Error: {e}")
+
+    def observe(self, router: str, timestamp: float, uptime_seconds: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Check one sample; record and return a reboot event if the uptime was reset"""
+        if uptime_seconds is None:
+            return None
+        boot_time = timestamp - uptime_seconds
+        with self._lock:
+            previous = self._known_boot(router)
+            if previous is not None and boot_time <= previous + self.tolerance:
+                return None
+            self._save_boot(router, boot_time)
+        if previous is None:
+            return None  # first sighting of this router
+
+        booted = datetime.datetime.fromtimestamp(boot_time)
+        event = make_event(
+            "reboot", router, "warning",
+            f"Router restarted around {booted:%Y-%m-%d %H:%M} (uptime reset to {uptime_seconds}s)",
+            boot_time=booted,
+            previous_boot_time=datetime.datetime.fromtimestamp(previous),
+            uptime_seconds=uptime_seconds
+        )
+        record_events([event])
+        return event
+
+
+_detector = None
+
+def get_reboot_detector() -> RebootDetector:
+    """Shared detector fed by every stats poll"""
+    global _detector
+    if _detector is None:
+        _detector = RebootDetector()
+    return _detector
@@ -0,0 +1,177 @@
+import random
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+import paramiko
+
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+
+# Messages that mean trying again will not help
+PERMANENT_MARKERS = ("% Invalid", "% Incomplete", "% Ambiguous", "Authentication failed",
+                     "DNS resolution failed")
+TRANSIENT_MARKERS = ("banner", "timed out", "timeout", "Connection reset", "Unable to connect",
+                     "No existing session", "Error reading SSH protocol")
+
+
+class CircuitOpenError(paramiko.SSHException):
+    """Raised without touching the network while a router's breaker is open"""
+    pass
+
+
+def classify_error(error: BaseException) -> str:
+    """Sort a failure into transient (worth retrying) or permanent (fail fast)"""
+    if isinstance(error, CircuitOpenError):
+        return PERMANENT
+    if isinstance(error, (paramiko.AuthenticationException, paramiko.BadHostKeyException, socket.gaierror)):
+        return PERMANENT
+    if isinstance(error, (socket.timeout, TimeoutError, ConnectionError, EOFError,
+                          paramiko.ssh_exception.NoValidConnectionsError)):
+        return TRANSIENT
+    message = str(error)
+    if any(marker in message for marker in PERMANENT_MARKERS):
+        return PERMANENT
+    if any(marker.lower() in message.lower() for marker in TRANSIENT_MARKERS):
+        return TRANSIENT
+    if isinstance(error, (OSError, paramiko.SSHException)):
+        return TRANSIENT
+    return PERMANENT
+
+
+class RetryPolicy:
+    """Bounded exponential backoff with jitter for transient failures"""
+
+    def __init__(self, attempts: int = 3, base_delay: float = 1.0, max_delay: float = 8.0,
+                 budget: float = 45.0, jitter: float = 0.2):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def run(self, operation: Callable[[], Any], sleep: Callable[[float], None] = time.sleep) -> Any:
+        """Call operation, retrying transient failures until attempts or time budget run out"""
+        deadline = time.monotonic() + self.budget
+        for attempt in range(self.attempts):
+            try:
+                return operation()
+            except Exception as e:
+                if classify_error(e) == PERMANENT or attempt == self.attempts - 1:
+                    raise
+                delay = self.delay(attempt)
+                if time.monotonic() + delay >= deadline:
+                    raise
+                sleep(delay)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Per-router breaker: stops connection attempts to a device that keeps failing
+
+    After failure_threshold consecutive transient failures the breaker opens
+    and every call fails at once. When the cooldown expires one trial call
+    is let through (half-open); success closes the breaker, failure opens
+    it again with a longer cooldown.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown: float = 30.0,
+                 max_cooldown: float = 300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = cooldown
+        self.opened_at = 0.0
+        self.last_error = ""
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def retry_in(self) -> float:
+        """Seconds until the next trial call is allowed (0 when not open)"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def before_call(self):
+        with self._lock:
+            if self.state == OPEN and self.retry_in() <= 0:
+                self.state = HALF_OPEN
+            if self.state == OPEN or (self.state == HALF_OPEN and self._trial_running):
+                raise CircuitOpenError(
+                    f"{self.name}: circuit open after {self.failures} failures "
+                    f"({self.last_error}); next attempt in {self.retry_in():.0f}s"
+                )
+            if self.state == HALF_OPEN:
+                self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.cooldown = self.base_cooldown
+            self._trial_running = False
+
+    def record_failure(self, error: BaseException):
+        with self._lock:
+            self.last_error = str(error)
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._open()
+            elif self.failures >= self.failure_threshold:
+                self._open()
+            self._trial_running = False
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'state': self.state, 'failures': self.failures,
+                'retry_in': self.retry_in(), 'last_error': self.last_error}
+
+
+RETRY_POLICY = RetryPolicy()
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(host: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+        return breaker
+
+def breaker_state(host: str) -> Optional[Dict[str, Any]]:
+    """Breaker snapshot for the UI, or None if the router was never contacted"""
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+    return breaker.snapshot() if breaker else None
+
+def call_with_resilience(host: str, operation: Callable[[], Any], policy: RetryPolicy = RETRY_POLICY) -> Any:
+    """Run operation through the router's breaker with retries on transient failures"""
+    breaker = get_breaker(host)
+    breaker.before_call()
+    try:
+        result = policy.run(operation)
+    except Exception as e:
+        if classify_error(e) == TRANSIENT:
+            breaker.record_failure(e)
+        else:
+            # Rejected, but the device answered: it is reachable
+            breaker.record_success()
+        raise
+    breaker.record_success()
+    return result
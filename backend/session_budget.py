@@ -0,0 +1,242 @@
+import heapq
+import itertools
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: the budget is enforced per process only
+    fcntl = None
+
+INTERACTIVE = 0   # lower value is served first
+BACKGROUND = 1
+
+MAX_SESSIONS = 3  # IOS ships 5 VTY lines; leave room for operators
+WAIT_TIMEOUT = {INTERACTIVE: 60.0, BACKGROUND: 5.0}
+# Per user: another account's lock files are not ours to open (0o600)
+SLOT_DIR = os.environ.get("NETAPP_SESSION_DIR") or os.path.join(
+    tempfile.gettempdir(), f"netapp-sessions-{os.getuid() if hasattr(os, 'getuid') else 0}")
+SLOT_POLL = 0.1   # seconds between tries for a slot held by another process
+
+_context = threading.local()
+
+
+class SessionBudgetError(Exception):
+    """No session slot became free in time"""
+    pass
+
+
+@contextmanager
+def session_priority(priority: int):
+    """Run SSH sessions opened by this thread at the given priority"""
+    previous = getattr(_context, "priority", INTERACTIVE)
+    _context.priority = priority
+    try:
+        yield
+    finally:
+        _context.priority = previous
+
+def current_priority() -> int:
+    return getattr(_context, "priority", INTERACTIVE)
+
+
+class _Waiter:
+    __slots__ = ("priority", "sequence", "write", "granted")
+
+    def __init__(self, priority: int, sequence: int, write: bool):
+        self.priority = priority
+        self.sequence = sequence
+        self.write = write
+        self.granted = False
+
+    def __lt__(self, other):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+def _try_lock(path: str) -> Optional[int]:
+    """Descriptor holding an exclusive lock on path, or None if another holder has it
+
+    OSError from opening the file (e.g. PermissionError) reaches the caller.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return fd
+    except OSError:
+        os.close(fd)
+        return None
+
+def _unlock(fd: int):
+    fcntl.flock(fd, fcntl.LOCK_UN)
+    os.close(fd)
+
+
+class HostSlots:
+    """The device's session slots and write lock, shared by every process of this user
+
+    The GUI, the collector and its poller workers, the API server and the
+    CLI each run their own DeviceSessions, so the limit is kept in lock
+    files: one per slot plus one for config mode. The kernel drops the
+    locks of a process that dies, so a crash never leaks a slot. SLOT_DIR
+    is per user; point NETAPP_SESSION_DIR at a group-writable directory
+    to share the budget between accounts.
+    """
+
+    def __init__(self, host: str, max_sessions: int):
+        os.makedirs(SLOT_DIR, mode=0o700, exist_ok=True)
+        name = re.sub(r"[^\w.-]", "_", host)
+        self.slot_paths = [os.path.join(SLOT_DIR, f"{name}.{index}.lock") for index in range(max_sessions)]
+        self.write_path = os.path.join(SLOT_DIR, f"{name}.write.lock")
+
+    def acquire(self, write: bool, deadline: float) -> Optional[List[int]]:
+        """Lock a free slot (and the write lock) before deadline; the held descriptors or None"""
+        held: List[int] = []
+        try:
+            while True:
+                if write and not held:
+                    fd = _try_lock(self.write_path)
+                    if fd is not None:
+                        held.append(fd)
+                if held or not write:
+                    for path in self.slot_paths:
+                        fd = _try_lock(path)
+                        if fd is not None:
+                            return held + [fd]
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(SLOT_POLL)
+        except OSError:
+            for fd in held:
+                _unlock(fd)
+            raise
+        for fd in held:
+            _unlock(fd)
+        return None
+
+
+class DeviceSessions:
+    """Session slots and the config-mode write lock of one device
+
+    At most max_sessions SSH sessions are open at once and at most one of
+    them may be a writer. Waiters are served by priority, then arrival, so
+    an interactive request overtakes queued background polls. A writer
+    waiting for the lock does not hold up readers behind it.
+
+    The limit holds across all app processes on this machine (HostSlots);
+    priorities only order the waiters within one process.
+    """
+
+    def __init__(self, host: str, max_sessions: int = MAX_SESSIONS):
+        self.host = host
+        self.max_sessions = max_sessions
+        self.active = 0
+        self.writer = False
+        self._waiting: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._shared = None
+        if fcntl is not None:
+            try:
+                self._shared = HostSlots(host, max_sessions)
+            except OSError as e:
+                print(f"Session slot directory unavailable ({e}); limiting {host} per process only")
+        self._held: List[List[int]] = []  # lock descriptors of the open sessions
+
+    def _grant(self):
+        """Hand free slots to the best waiters that can run now"""
+        skipped = []
+        while self._waiting and self.active < self.max_sessions:
+            waiter = heapq.heappop(self._waiting)
+            if waiter.write and self.writer:
+                skipped.append(waiter)
+                continue
+            waiter.granted = True
+            self.active += 1
+            self.writer = self.writer or waiter.write
+        for waiter in skipped:
+            heapq.heappush(self._waiting, waiter)
+        self._condition.notify_all()
+
+    def acquire(self, priority: int = INTERACTIVE, write: bool = False, timeout: Optional[float] = None):
+        timeout = WAIT_TIMEOUT.get(priority, 60.0) if timeout is None else timeout
+        kind = "configuration" if write else "session"
+        with self._condition:
+            waiter = _Waiter(priority, next(self._sequence), write)
+            heapq.heappush(self._waiting, waiter)
+            self._grant()
+            deadline = time.monotonic() + timeout
+            while not waiter.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(waiter)
+                    heapq.heapify(self._waiting)
+                    raise SessionBudgetError(
+                        f"{self.host}: no {kind} slot free after {timeout:.0f}s "
+                        f"({self.active}/{self.max_sessions} sessions in use)"
+                    )
+                self._condition.wait(remaining)
+        if self._shared is None:
+            return
+        # Then one of the host-wide slots, which other processes may hold
+        try:
+            locks = self._shared.acquire(write, deadline)
+        except OSError as e:
+            # Lock files we cannot open must not fail every connect to the device
+            print(f"Session slots unavailable ({e}); limiting {self.host} per process only")
+            self._shared = None
+            return
+        if locks is None:
+            self._release_local(write)
+            raise SessionBudgetError(
+                f"{self.host}: no {kind} slot free after {timeout:.0f}s "
+                f"(all {self.max_sessions} sessions in use across app processes)"
+            )
+        with self._condition:
+            self._held.append(locks)
+
+    def release(self, write: bool = False):
+        with self._condition:
+            # Slots are interchangeable; a writer gives back the set holding the write lock
+            index = next((i for i, locks in enumerate(self._held) if (len(locks) == 2) == write), -1)
+            locks = self._held.pop(index) if self._held else []
+        for fd in locks:
+            _unlock(fd)
+        self._release_local(write)
+
+    def _release_local(self, write: bool):
+        with self._condition:
+            self.active -= 1
+            if write:
+                self.writer = False
+            self._grant()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._condition:
+            return {'active': self.active, 'max': self.max_sessions,
+                    'writer': self.writer, 'waiting': len(self._waiting)}
+
+
+_devices: Dict[str, DeviceSessions] = {}
+_devices_lock = threading.Lock()
+
+def get_device_sessions(host: str) -> DeviceSessions:
+    with _devices_lock:
+        device = _devices.get(host)
+        if device is None:
+            device = _devices[host] = DeviceSessions(host)
+        return device
+
+@contextmanager
+def device_session(host: str, write: bool = False, priority: Optional[int] = None):
+    """Hold one of the device's session slots (and its write lock if write) for the block"""
+    device = get_device_sessions(host)
+    device.acquire(current_priority() if priority is None else priority, write)
+    try:
+        yield device
+    finally:
+        device.release(write)
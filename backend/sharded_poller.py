@@ -0,0 +1,269 @@
+import bisect
+import hashlib
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from backend.Connect import get_routers
+from backend.manage_equipment import inventory_version
+from backend.poller import FleetPoller, MAX_WORKERS, TICK, INVENTORY_REFRESH, POLL_PROCESSES
+
+VIRTUAL_NODES = 64        # points per worker on the hash ring
+SUPERVISE_INTERVAL = 5.0  # seconds between inventory-version and worker liveness checks
+STOP_TIMEOUT = 10.0
+
+
+class HashRing:
+    """Consistent hash ring mapping router addresses to worker names
+
+    Each worker owns VIRTUAL_NODES points on the ring and a router belongs
+    to the first point after its hash, so adding or removing a worker only
+    moves the routers of that worker's arcs. MD5 rather than hash() keeps
+    the placement the same in every process and across restarts.
+    """
+
+    def __init__(self, nodes=(), replicas: int = VIRTUAL_NODES):
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    @property
+    def nodes(self) -> List[str]:
+        return sorted(set(self._owners))
+
+    def add(self, node: str):
+        for replica in range(self.replicas):
+            point = self._hash(f"{node}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str):
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def node(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._owners[index]
+
+
+class ShardWorkerPoller(FleetPoller):
+    """FleetPoller inside a worker process, polling the shard it is sent
+
+    The supervisor sends the full router list of the shard whenever it
+    changes (None to stop), applied with FleetPoller.assign, so a router
+    that moves away and back keeps a single schedule here. Polling,
+    retries and adaptive scheduling run here with this process's own
+    thread pool and per-device session budget; each cycle's results go
+    back to the supervisor.
+    """
+
+    def __init__(self, commands, results, max_workers=MAX_WORKERS, tick=TICK):
+        super().__init__(max_workers, tick)
+        self.commands = commands
+        self.results = results
+        self.inventory_refresh = 0  # check for a new shard every tick
+
+    def _refresh_inventory(self):
+        routers = None
+        while True:
+            try:
+                message = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            if message is None:
+                self._stop.set()
+                return
+            routers = message
+        if routers is not None:
+            self.assign({router['ip']: router for router in routers})
+        self._inventory_loaded = time.monotonic()
+
+    def ingest(self, routers: List[Dict[str, Any]], results: Dict[str, Dict[str, Any]]):
+        # Names and addresses only: credentials stay out of the result queue
+        self.results.put(([{'name': router['name'], 'ip': router['ip']} for router in routers], results))
+
+    def run(self):
+        self._loop(self._stop)
+
+
+def run_shard_worker(commands, results, max_workers=MAX_WORKERS, tick=TICK):
+    """Entry point of a worker process"""
+    try:
+        ShardWorkerPoller(commands, results, max_workers, tick).run()
+    except KeyboardInterrupt:
+        pass
+
+
+class ShardedPoller(FleetPoller):
+    """Supervisor spreading fleet polling over worker processes
+
+    One Python process tops out on the GIL and paramiko's crypto long
+    before thousands of routers, so the inventory is split by consistent
+    hashing over POLL_PROCESSES workers, each running a ShardWorkerPoller.
+    The supervisor re-reads the inventory when manage_equipment bumps its
+    version (or every INVENTORY_REFRESH seconds), sends each worker its
+    new shard, restarts workers that die, and feeds every result through
+    FleetPoller.ingest, so the metrics store, rate table, detectors and
+    listeners of this process see the whole fleet as before.
+    """
+
+    def __init__(self, processes: int = POLL_PROCESSES, max_workers=MAX_WORKERS, tick=TICK):
+        super().__init__(max_workers, tick)
+        self.processes = max(1, processes)
+        self.ring = HashRing()
+        self.workers: Dict[str, Any] = {}
+        self.commands: Dict[str, Any] = {}
+        self.shards: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.restarts = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._results = self._context.Queue()
+        self._version = None
+        self._collector = None
+        self._pool_lock = threading.RLock()  # worker pool changes: supervisor thread vs. callers
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def start(self):
+        if self.running:
+            return
+        # A new event per run, like FleetPoller: threads of a stopped run exit on their own
+        stop = self._stop = threading.Event()
+        with self._pool_lock:
+            for index in range(self.processes):
+                self._spawn(f"shard-{index}")
+        self._thread = threading.Thread(target=self._loop, args=(stop,), daemon=True)
+        self._thread.start()
+        self._collector = threading.Thread(target=self._collect, args=(stop,), daemon=True)
+        self._collector.start()
+
+    def stop(self):
+        """Signal every worker and return; they are reaped in the background"""
+        self._stop.set()
+        with self._pool_lock:
+            self._retire(list(self.workers))
+
+    def set_processes(self, processes: int):
+        """Grow or shrink the pool; only the routers on the changed arcs move"""
+        self.processes = max(1, processes)
+        if not self.running:
+            return
+        names = [f"shard-{index}" for index in range(self.processes)]
+        with self._pool_lock:
+            self._retire(set(self.workers) - set(names))
+            for name in set(names) - set(self.workers):
+                self._spawn(name)
+            self.rebalance()
+
+    def _spawn(self, name: str):
+        commands = self._context.Queue()
+        process = self._context.Process(
+            target=run_shard_worker, args=(commands, self._results, self.max_workers, self.tick),
+            name=f"netapp-poller-{name}", daemon=True
+        )
+        process.start()
+        if name not in self.workers:
+            self.ring.add(name)
+        self.workers[name] = process
+        self.commands[name] = commands
+        self.shards.pop(name, None)  # a new process starts empty
+
+    def _retire(self, names):
+        """Take workers out of the pool and tell them all to stop at once
+
+        Joining happens in a separate thread under one shared deadline, so
+        neither the pool lock nor the caller (often the GUI thread) waits
+        STOP_TIMEOUT per worker.
+        """
+        retiring = []
+        for name in names:
+            commands = self.commands.pop(name)
+            commands.put(None)
+            # The queue goes along: a worker still starting up unpickles it
+            retiring.append((self.workers.pop(name), commands))
+            self.shards.pop(name, None)
+            self.ring.remove(name)
+        if retiring:
+            threading.Thread(target=self._reap, args=(retiring,), daemon=True).start()
+
+    @staticmethod
+    def _reap(retiring):
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for process, _ in retiring:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+
+    def assign(self, routers: Dict[str, Dict[str, Any]]):
+        for ip in self._routers.keys() - routers.keys():
+            self.forget(self._routers[ip])
+        self._routers = routers
+        with self._pool_lock:
+            self.rebalance()
+
+    def rebalance(self):
+        """Send every worker whose shard changed its new router list"""
+        if not self.workers:
+            return
+        shards = {name: {} for name in self.workers}
+        for ip, router in self._routers.items():
+            shards[self.ring.node(ip)][ip] = router
+        for name, shard in shards.items():
+            if shard != self.shards.get(name):
+                self.commands[name].put(list(shard.values()))
+                self.shards[name] = shard
+
+    def _supervise(self, stop: threading.Event):
+        with self._pool_lock:
+            for name, process in list(self.workers.items()):
+                if not process.is_alive() and not stop.is_set():
+                    print(f"Poller worker {name} exited ({process.exitcode}); restarting")
+                    self.restarts += 1
+                    self._spawn(name)
+        version = inventory_version()
+        stale = time.monotonic() - self._inventory_loaded >= INVENTORY_REFRESH
+        if stale or (version is not None and version != self._version):
+            self._version = version
+            self._refresh_inventory()
+        else:
+            with self._pool_lock:
+                self.rebalance()  # hands restarted workers their shard
+
+    def _refresh_inventory(self):
+        try:
+            routers = {router['ip']: router for router in get_routers()}
+        except Exception as e:
+            print(f"Database error: {e}")
+            return
+        self.assign(routers)
+        self._inventory_loaded = time.monotonic()
+
+    def _loop(self, stop: threading.Event):
+        while not stop.is_set():
+            self._supervise(stop)
+            stop.wait(SUPERVISE_INTERVAL)
+
+    def _collect(self, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                routers, results = self._results.get(timeout=1)
+            except queue.Empty:
+                continue
+            # Drop routers deleted while their poll was in flight
+            routers = [router for router in routers if router['ip'] in self._routers]
+            try:
+                self.ingest(routers, results)
+            except Exception as e:
+                print(f"Polling cycle failed: {e}")
@@ -0,0 +1,316 @@
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from backend.metrics_store import DEFAULT_CAPACITY
+
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+SHM_PATH = os.environ.get("NETAPP_METRICS_SHM", os.path.join(SHM_DIR, "netapp-metrics.ring"))
+SHM_MAX_SERIES = int(os.environ.get("NETAPP_METRICS_SHM_SERIES", 4096))
+MAGIC = b"NAMR"
+VERSION = 1
+READ_RETRIES = 100
+REOPEN_INTERVAL = 1.0  # seconds between checks for a restarted writer
+
+HEADER = np.dtype([
+    ("magic", "S4"), ("version", "<u4"), ("capacity", "<u4"), ("max_series", "<u4"),
+    ("series", "<u4"),       # slots handed out so far
+    ("layout", "<u4"),       # bumped whenever a slot changes owner; readers re-index
+    ("closed", "<u4"),       # set by the writer before it goes away
+    ("writer_pid", "<u4"),
+    ("epoch", "<f8"),
+    ("reserved", "V24"),
+])
+SLOT = np.dtype([
+    ("seq", "<u8"),          # odd while the writer is updating the slot
+    ("head", "<u4"), ("count", "<u4"),
+    ("updated", "<f8"),
+    ("router", "S64"), ("metric", "S16"),
+    ("reserved", "V24"),
+])
+RECORD = np.dtype([("time", "<f8"), ("value", "<f8")])
+
+
+def ring_size(capacity: int, max_series: int) -> int:
+    return HEADER.itemsize + max_series * SLOT.itemsize + max_series * 2 * capacity * RECORD.itemsize
+
+
+class SharedMetricsRing:
+    """MetricsStore layout in a memory-mapped file, written by one process
+
+    The collector creates the file and is its only writer; GUI processes
+    map it read-only. Each (router, metric) series owns a slot: a ring of
+    fixed-size (time, value) records written twice, at i and i + capacity,
+    like RingSeries, so window() is a zero-copy NumPy view of the mapping.
+    Readers take no lock: a per-slot sequence number, odd while the writer
+    updates the slot, tells them to retry a torn read of head and count.
+    Appends from several threads of the writer process share a local lock.
+    """
+
+    def __init__(self, path: str, mm: mmap.mmap, writable: bool):
+        self.path = path
+        self.writable = writable
+        self._mm = mm
+        self._map(mm)
+        self._lock = threading.Lock()
+        self._slots: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._free: List[int] = []
+        self._layout = -1
+        self._checked = time.monotonic()
+
+    def _map(self, mm: mmap.mmap):
+        self.header = np.ndarray((), HEADER, buffer=mm)
+        self.capacity = int(self.header["capacity"])
+        self.max_series = int(self.header["max_series"])
+        self.epoch = float(self.header["epoch"])
+        slots = np.ndarray((self.max_series,), SLOT, buffer=mm, offset=HEADER.itemsize)
+        self.seq, self.head, self.count = slots["seq"], slots["head"], slots["count"]
+        self.updated, self.routers, self.metrics = slots["updated"], slots["router"], slots["metric"]
+        self.records = np.ndarray((self.max_series, 2 * self.capacity), RECORD, buffer=mm,
+                                  offset=HEADER.itemsize + self.max_series * SLOT.itemsize)
+
+    @classmethod
+    def create(cls, path: str = SHM_PATH, capacity: int = DEFAULT_CAPACITY,
+               max_series: int = SHM_MAX_SERIES) -> "SharedMetricsRing":
+        """Create a fresh ring for writing, retiring any previous one at path"""
+        if os.path.exists(path):
+            # Readers still map the old file; closing it tells them to reopen
+            with open(path, "r+b") as f:
+                try:
+                    old = mmap.mmap(f.fileno(), HEADER.itemsize)
+                    header = np.ndarray((), HEADER, buffer=old)
+                    if header["magic"] == MAGIC:
+                        header["closed"] = 1
+                    del header
+                    old.close()
+                except (ValueError, OSError, BufferError):
+                    pass
+            os.unlink(path)
+        size = ring_size(capacity, max_series)
+        with open(path, "w+b") as f:
+            f.truncate(size)  # sparse: pages are only backed once a series writes them
+            mm = mmap.mmap(f.fileno(), size)
+        header = np.ndarray((), HEADER, buffer=mm)
+        header["magic"], header["version"] = MAGIC, VERSION
+        header["capacity"], header["max_series"] = capacity, max_series
+        header["writer_pid"], header["epoch"] = os.getpid(), time.time()
+        del header
+        return cls(path, mm, writable=True)
+
+    @classmethod
+    def open(cls, path: str = SHM_PATH) -> Optional["SharedMetricsRing"]:
+        """Map an existing ring read-only; None if there is none or it is not one of ours"""
+        try:
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        header = np.ndarray((), HEADER, buffer=mm)
+        valid = (
+            header["magic"] == MAGIC and header["version"] == VERSION and not header["closed"]
+            and len(mm) == ring_size(int(header["capacity"]), int(header["max_series"]))
+        )
+        del header
+        if not valid:
+            mm.close()
+            return None
+        return cls(path, mm, writable=False)
+
+    def close(self):
+        """Writer: mark the ring closed so readers look for its successor, and remove it"""
+        if self.writable:
+            self.header["closed"] = 1
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    # -- writer ------------------------------------------------------------
+
+    def _slot_for_write(self, key: Tuple[str, str]) -> int:
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._slots.move_to_end(key)
+            return slot
+        if self._free:
+            slot = self._free.pop()
+        elif int(self.header["series"]) < self.max_series:
+            slot = int(self.header["series"])
+            self.header["series"] = slot + 1
+        else:
+            _, slot = self._slots.popitem(last=False)  # least recently updated series
+        self.seq[slot] += 1
+        self.routers[slot], self.metrics[slot] = key[0].encode()[:64], key[1].encode()[:16]
+        self.head[slot] = self.count[slot] = 0
+        self.seq[slot] += 1
+        self.header["layout"] += 1
+        self._slots[key] = slot
+        return slot
+
+    def _write(self, slot: int, timestamp: float, value: float):
+        capacity = self.capacity
+        head = int(self.head[slot])
+        row = self.records[slot]
+        self.seq[slot] += 1
+        row[head] = row[head + capacity] = (timestamp, value)
+        self.head[slot] = (head + 1) % capacity
+        self.count[slot] = min(int(self.count[slot]) + 1, capacity)
+        self.updated[slot] = timestamp
+        self.seq[slot] += 1
+
+    def append(self, router: str, metric: str, value: float, timestamp: Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._write(self._slot_for_write((router, metric)), timestamp, value)
+
+    def append_sample(self, router: str, values: Dict[str, Optional[float]], timestamp: Optional[float] = None):
+        """Record several metrics of one poll, skipping the ones that are missing"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            for metric, value in values.items():
+                if value is not None:
+                    self._write(self._slot_for_write((router, metric)), timestamp, value)
+
+    def forget(self, router: str):
+        if not self.writable:
+            return
+        with self._lock:
+            for key in [key for key in self._slots if key[0] == router]:
+                slot = self._slots.pop(key)
+                self.seq[slot] += 1
+                self.routers[slot] = self.metrics[slot] = b""
+                self.count[slot] = 0
+                self.seq[slot] += 1
+                self._free.append(slot)
+            self.header["layout"] += 1
+
+    # -- reader ------------------------------------------------------------
+
+    def _reindex(self):
+        layout = int(self.header["layout"])
+        series = int(self.header["series"])
+        self._slots = OrderedDict(
+            ((router.decode(), metric.decode()), slot)
+            for slot, (router, metric) in enumerate(zip(self.routers[:series], self.metrics[:series]))
+            if router
+        )
+        self._layout = layout
+
+    def _reopen(self):
+        """Follow a restarted collector to its new ring file"""
+        now = time.monotonic()
+        if now - self._checked < REOPEN_INTERVAL:
+            return
+        self._checked = now
+        if not self.header["closed"]:
+            return
+        successor = SharedMetricsRing.open(self.path)
+        if successor is not None:
+            self._mm = successor._mm
+            self._map(self._mm)
+            self._layout = -1
+
+    def _slot_for_read(self, key: Tuple[str, str]) -> Optional[int]:
+        if self.writable:
+            return self._slots.get(key)
+        self._reopen()
+        if self._layout != int(self.header["layout"]):
+            self._reindex()
+        return self._slots.get(key)
+
+    def window(self, router: str, metric: str, count: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, values) views of the last count samples in the mapping; empty if unknown
+
+        The views alias the ring, so read them before the next poll lands
+        rather than holding on to them. A full ring yields capacity - 1
+        samples: the oldest record is the one the writer overwrites next.
+        """
+        key = (router, metric)
+        slot = self._slot_for_read(key)
+        if slot is None:
+            return np.empty(0), np.empty(0)
+        for _ in range(READ_RETRIES):
+            sequence = int(self.seq[slot])
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            head, available = int(self.head[slot]), int(self.count[slot])
+            owner = (self.routers[slot], self.metrics[slot])
+            if int(self.seq[slot]) == sequence:
+                break
+        else:
+            return np.empty(0), np.empty(0)
+        if owner != (router.encode()[:64], metric.encode()[:16]):
+            return np.empty(0), np.empty(0)  # slot was reused since the last re-index
+        available = min(available, self.capacity - 1)
+        available = available if count is None else min(count, available)
+        end = head + self.capacity
+        records = self.records[slot, end - available:end]
+        times, values = records["time"], records["value"]
+        times.flags.writeable = False
+        values.flags.writeable = False
+        return times, values
+
+    def latest(self, router: str, metric: str) -> Optional[float]:
+        _, values = self.window(router, metric, 1)
+        return float(values[0]) if len(values) else None
+
+    def memory_usage(self) -> int:
+        """Bytes of the mapping (pages never written are not backed by memory)"""
+        return len(self._mm)
+
+
+class SharedStoreView:
+    """Metrics store for a GUI process reading the collector's shared ring
+
+    Reads come from the mapping without copying. Samples the GUI collects
+    itself (a stats window polling its router directly) go to the local
+    store, and a series present in both is merged by time.
+    """
+
+    def __init__(self, ring: SharedMetricsRing, local):
+        self.ring = ring
+        self.local = local
+
+    def append(self, router: str, metric: str, value: float, timestamp: Optional[float] = None):
+        self.local.append(router, metric, value, timestamp)
+
+    def append_sample(self, router: str, values: Dict[str, Optional[float]], timestamp: Optional[float] = None):
+        self.local.append_sample(router, values, timestamp)
+
+    def window(self, router: str, metric: str, count: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        shared = self.ring.window(router, metric, count)
+        local = self.local.window(router, metric, count)
+        if not len(local[0]):
+            return shared
+        if not len(shared[0]):
+            return local
+        times = np.concatenate((shared[0], local[0]))
+        values = np.concatenate((shared[1], local[1]))
+        order = np.argsort(times, kind="stable")
+        if count is not None:
+            order = order[-count:]
+        return times[order], values[order]
+
+    def latest(self, router: str, metric: str) -> Optional[float]:
+        _, values = self.window(router, metric, 1)
+        return float(values[-1]) if len(values) else None
+
+    def forget(self, router: str):
+        self.local.forget(router)
+
+    def memory_usage(self) -> int:
+        return self.local.memory_usage()
+
+
+def create_shared_store(path: str = SHM_PATH) -> Optional[SharedMetricsRing]:
+    try:
+        return SharedMetricsRing.create(path)
+    except OSError as e:
+        print(f"Cannot create shared metrics ring: {e}")
+        return None
+
+def open_shared_store(path: str = SHM_PATH) -> Optional[SharedMetricsRing]:
+    return SharedMetricsRing.open(path)
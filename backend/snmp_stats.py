@@ -0,0 +1,125 @@
+import asyncio
+from typing import Dict, Any, List
+from backend.Router_stats import RouterMonitorError
+from backend.stats_parsers import MemoryPool, format_uptime
+
+try:
+    from pysnmp.hlapi.v3arch.asyncio import (
+        SnmpEngine, CommunityData, UdpTransportTarget, ContextData,
+        ObjectType, ObjectIdentity, bulk_cmd
+    )
+    SNMP_AVAILABLE = True
+except ImportError:
+    SNMP_AVAILABLE = False
+
+SYS_UPTIME = "1.3.6.1.2.1.1.3"                          # sysUpTime (GETNEXT -> .0)
+CPM_CPU_TOTAL_5SEC = "1.3.6.1.4.1.9.9.109.1.1.1.1.3"    # CISCO-PROCESS-MIB cpmCPUTotal5sec
+MEMORY_POOL_NAME = "1.3.6.1.4.1.9.9.48.1.1.1.2"         # CISCO-MEMORY-POOL-MIB ciscoMemoryPoolName
+MEMORY_POOL_USED = "1.3.6.1.4.1.9.9.48.1.1.1.5"         # ciscoMemoryPoolUsed
+MEMORY_POOL_FREE = "1.3.6.1.4.1.9.9.48.1.1.1.6"         # ciscoMemoryPoolFree
+TABLE_COLUMNS = (CPM_CPU_TOTAL_5SEC, MEMORY_POOL_NAME, MEMORY_POOL_USED, MEMORY_POOL_FREE)
+
+DEFAULT_PORT = 161
+MAX_REPETITIONS = 8   # rows per column in the single GETBULK (CPUs / memory pools)
+CONCURRENCY = 64
+
+
+def _column_rows(var_binds, column):
+    """Values of one table column keyed by row index"""
+    prefix = column + "."
+    rows = {}
+    for oid, value in var_binds:
+        oid = str(oid)
+        if oid.startswith(prefix):
+            rows[oid[len(prefix):]] = value
+    return rows
+
+def parse_bulk_response(var_binds) -> Dict[str, Any]:
+    """Turn one GETBULK response into the get_router_stats result shape"""
+    var_binds = [(str(oid), value) for oid, value in var_binds]
+
+    uptime_seconds = None
+    for oid, value in var_binds:
+        if oid == SYS_UPTIME + ".0":
+            uptime_seconds = int(value) // 100  # TimeTicks are hundredths of a second
+            break
+
+    cpu_rows = _column_rows(var_binds, CPM_CPU_TOTAL_5SEC)
+    if not cpu_rows:
+        raise RouterMonitorError("CPU data not found in SNMP response")
+    # First CPU entry is the route processor on single-CPU platforms
+    cpu = float(cpu_rows[min(cpu_rows, key=lambda k: [int(p) for p in k.split(".")])])
+
+    names = _column_rows(var_binds, MEMORY_POOL_NAME)
+    used = _column_rows(var_binds, MEMORY_POOL_USED)
+    free = _column_rows(var_binds, MEMORY_POOL_FREE)
+    pools: List[MemoryPool] = [
+        MemoryPool(str(names.get(idx, idx)), int(used[idx]) + int(free[idx]), int(used[idx]), int(free[idx]))
+        for idx in used if idx in free
+    ]
+    if not pools:
+        raise RouterMonitorError("Memory data not found in SNMP response")
+    primary = next((p for p in pools if p.name == "Processor"), pools[0])
+
+    return {
+        'cpu': cpu,
+        'memory': primary.percent_used,
+        'uptime': format_uptime(uptime_seconds) if uptime_seconds is not None else "N/A",
+        'uptime_seconds': uptime_seconds,
+        'memory_pools': [{'name': p.name, 'total': p.total, 'used': p.used, 'free': p.free} for p in pools],
+        'profile': 'snmp'
+    }
+
+def _error_result(message: str) -> Dict[str, Any]:
+    return {'error': message, 'cpu': None, 'memory': None, 'uptime': "N/A", 'uptime_seconds': None}
+
+async def _collect_one(engine, router, semaphore, timeout=2, retries=1) -> Dict[str, Any]:
+    async with semaphore:
+        try:
+            target = await UdpTransportTarget.create(
+                (router['ip'], int(router.get('snmp_port', DEFAULT_PORT))),
+                timeout=timeout, retries=retries
+            )
+            # One round trip: sysUpTime as a non-repeater, the tables as repeaters
+            error_indication, error_status, error_index, var_binds = await bulk_cmd(
+                engine,
+                CommunityData(router.get('snmp_community', 'public'), mpModel=1),
+                target,
+                ContextData(),
+                1, MAX_REPETITIONS,
+                ObjectType(ObjectIdentity(SYS_UPTIME)),
+                *[ObjectType(ObjectIdentity(column)) for column in TABLE_COLUMNS],
+                # Numeric OIDs are all we need; MIB resolution dominates CPU time
+                lookupMib=False
+            )
+            if error_indication:
+                return _error_result(f"SNMP error: {error_indication}")
+            if error_status:
+                return _error_result(f"SNMP error: {error_status.prettyPrint()} at index {error_index}")
+            return parse_bulk_response(var_binds)
+        except RouterMonitorError as e:
+            return _error_result(str(e))
+        except Exception as e:
+            return _error_result(f"Unexpected SNMP error: {str(e)}")
+
+async def collect_many(routers, concurrency=CONCURRENCY) -> Dict[str, Dict[str, Any]]:
+    """Poll many routers concurrently, one GETBULK each, keyed by router name"""
+    if not SNMP_AVAILABLE:
+        raise RouterMonitorError("SNMP support requires the pysnmp package")
+    engine = SnmpEngine()
+    semaphore = asyncio.Semaphore(concurrency)
+    try:
+        results = await asyncio.gather(*[_collect_one(engine, r, semaphore) for r in routers])
+    finally:
+        engine.close_dispatcher()
+    return {router['name']: result for router, result in zip(routers, results)}
+
+def bulk_router_stats(routers) -> Dict[str, Dict[str, Any]]:
+    """Synchronous wrapper around collect_many"""
+    return asyncio.run(collect_many(routers))
+
+def get_router_stats_snmp(router) -> Dict[str, Any]:
+    """SNMP equivalent of get_router_stats for a single router"""
+    if not SNMP_AVAILABLE:
+        return _error_result("SNMP support requires the pysnmp package")
+    return bulk_router_stats([router])[router['name']]
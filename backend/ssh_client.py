@@ -0,0 +1,53 @@
+import paramiko
+from backend.probe import get_probe_engine
+from backend.resilience import CircuitOpenError, call_with_resilience
+from backend.session_budget import get_device_sessions, current_priority
+
+
+class RouterUnreachableError(CircuitOpenError):
+    """Raised instead of connecting to a router the probe engine sees as down"""
+    pass
+
+
+class RouterSSHClient(paramiko.SSHClient):
+    """paramiko.SSHClient with fail-fast, retry, circuit breaking and session budgets
+
+    Known-down routers (per the probe engine) and routers whose breaker is
+    open are refused without touching the network; transient connect
+    failures are retried with backoff, authentication failures are not.
+    Each connection holds one of the device's session slots until close();
+    clients created with write=True also hold the device's config lock.
+    """
+
+    def __init__(self, write: bool = False):
+        super().__init__()
+        self.write = write
+        self._device = None
+
+    def connect(self, hostname, *args, **kwargs):
+        engine = get_probe_engine()
+        if engine.is_known_down(hostname):
+            state = engine.state(hostname)
+            raise RouterUnreachableError(
+                f"{hostname} is unreachable ({state.failures} failed probes: {state.error or 'no response'})"
+            )
+        device = get_device_sessions(hostname)
+        device.acquire(current_priority(), self.write)
+        self._device = device
+        try:
+            connect = super().connect
+            return call_with_resilience(hostname, lambda: connect(hostname, *args, **kwargs))
+        except Exception:
+            self._release()
+            raise
+
+    def _release(self):
+        device, self._device = self._device, None
+        if device is not None:
+            device.release(self.write)
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._release()
@@ -0,0 +1,187 @@
+import re
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple, Any
+import paramiko
+from backend.ssh_client import RouterSSHClient
+
+
+@dataclass(frozen=True)
+class InterfaceState:
+    name: str
+    ip: str = "unassigned"
+    status: str = ""
+    protocol: str = ""
+
+
+@dataclass(frozen=True)
+class VrfState:
+    name: str
+    rd: str = ""
+    interfaces: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class BgpNeighborState:
+    neighbor: str
+    remote_as: str
+    up_down: str
+    state: str  # prefix count when established, otherwise the FSM state
+
+
+@dataclass(frozen=True)
+class OspfProcessState:
+    process_id: str
+    router_id: str
+
+
+IP_LIKE = re.compile(r"^\d+\.\d+\.\d+\.\d+$")
+VRF_ROW = re.compile(r"^\s*(\S+)\s*(<not set>|\S+)?\s*(.*)$")
+OSPF_PROCESS = re.compile(r'Routing Process "ospf (\S+)" with ID (\S+)')
+
+def parse_interfaces(output: str) -> List[InterfaceState]:
+    """Parse 'show ip interface brief'"""
+    interfaces = []
+    for line in output.splitlines():
+        parts = line.split()
+        if not parts or line.startswith('Interface'):
+            continue
+        if len(parts) >= 6:
+            interfaces.append(InterfaceState(parts[0], parts[1], " ".join(parts[4:-1]), parts[-1]))
+        else:
+            interfaces.append(InterfaceState(parts[0]))
+    return interfaces
+
+def parse_vrfs(output: str) -> List[VrfState]:
+    """Parse 'show ip vrf' (continuation lines list extra interfaces)"""
+    vrfs = []
+    for line in output.splitlines():
+        parts = line.split()
+        if not parts or parts[0] == 'Name':
+            continue
+        if len(parts) == 1 and vrfs and line.startswith((' ' * 20, '\t')):
+            last = vrfs.pop()
+            vrfs.append(VrfState(last.name, last.rd, last.interfaces + (parts[0],)))
+        else:
+            match = VRF_ROW.match(line)
+            vrfs.append(VrfState(match.group(1), match.group(2) or "", tuple(match.group(3).split())))
+    return vrfs
+
+def parse_bgp_neighbors(output: str) -> List[BgpNeighborState]:
+    """Parse the neighbor table of 'show ip bgp summary'"""
+    neighbors = []
+    in_table = False
+    for line in output.splitlines():
+        parts = line.split()
+        if parts[:1] == ['Neighbor']:
+            in_table = True
+            continue
+        if in_table and len(parts) >= 10 and IP_LIKE.match(parts[0]):
+            neighbors.append(BgpNeighborState(parts[0], parts[2], parts[-2], parts[-1]))
+    return neighbors
+
+def parse_ospf_processes(output: str) -> List[OspfProcessState]:
+    """Parse 'show ip ospf' process headers"""
+    return [OspfProcessState(pid, rid) for pid, rid in OSPF_PROCESS.findall(output)]
+
+
+@dataclass(frozen=True)
+class StateType:
+    command: str
+    parser: Callable[[str], Any]
+    ttl: float  # seconds
+
+
+STATE_TYPES: Dict[str, StateType] = {
+    "interfaces": StateType("show ip interface brief", parse_interfaces, 30),
+    "vrfs": StateType("show ip vrf", parse_vrfs, 60),
+    "bgp_neighbors": StateType("show ip bgp summary", parse_bgp_neighbors, 30),
+    "ospf_processes": StateType("show ip ospf | include Routing Process", parse_ospf_processes, 60),
+}
+
+def run_show_command(router, command, timeout=10):
+    """Run one exec-mode command over a short-lived SSH session"""
+    ssh = RouterSSHClient()
+    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        ssh.connect(
+            router['ip'],
+            username=router['username'],
+            password=router['password'],
+            timeout=timeout
+        )
+        stdin, stdout, stderr = ssh.exec_command(command)
+        return stdout.read().decode(errors="ignore")
+    finally:
+        ssh.close()
+
+
+class StateCache:
+    """Operational state per (router, command) with TTLs
+
+    Identical requests that arrive while a fetch is in flight wait for that
+    fetch instead of opening their own SSH session.
+    """
+
+    def __init__(self, fetcher=run_show_command):
+        self.fetcher = fetcher
+        self._entries: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, router, kind, force=False):
+        state_type = STATE_TYPES[kind]
+        key = (router['ip'], state_type.command)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and not force and entry[0] > time.monotonic():
+                return entry[1]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = Future()
+                self._inflight[key] = flight
+
+        if not leader:
+            return flight.result()
+
+        try:
+            value = state_type.parser(self.fetcher(router, state_type.command))
+            with self._lock:
+                self._entries[key] = (time.monotonic() + state_type.ttl, value)
+            flight.set_result(value)
+            return value
+        except Exception as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def invalidate(self, router, kinds=None):
+        """Drop cached state after a configuration change"""
+        commands = {STATE_TYPES[k].command for k in (kinds or STATE_TYPES)}
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == router['ip'] and k[1] in commands]:
+                del self._entries[key]
+
+
+_cache = StateCache()
+
+def get_state_cache():
+    return _cache
+
+def get_interfaces(router, force=False) -> List[InterfaceState]:
+    return _cache.get(router, "interfaces", force)
+
+def get_vrfs(router, force=False) -> List[VrfState]:
+    return _cache.get(router, "vrfs", force)
+
+def get_bgp_neighbors(router, force=False) -> List[BgpNeighborState]:
+    return _cache.get(router, "bgp_neighbors", force)
+
+def get_ospf_processes(router, force=False) -> List[OspfProcessState]:
+    return _cache.get(router, "ospf_processes", force)
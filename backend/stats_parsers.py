@@ -0,0 +1,285 @@
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Pattern
+
+
+class ParseError(Exception):
+    """Raised when a command output does not match the platform template"""
+    pass
+
+
+@dataclass(frozen=True)
+class CpuRecord:
+    five_seconds: Optional[float]
+    one_minute: Optional[float]
+    five_minutes: Optional[float]
+
+    @property
+    def current(self) -> float:
+        """Most recent utilization the platform reports"""
+        for value in (self.five_seconds, self.one_minute, self.five_minutes):
+            if value is not None:
+                return value
+        raise ParseError("CPU record has no values")
+
+
+@dataclass(frozen=True)
+class MemoryPool:
+    name: str
+    total: int  # bytes
+    used: int
+    free: int
+
+    @property
+    def percent_used(self) -> float:
+        if self.total <= 0:
+            raise ParseError(f"Invalid total for memory pool {self.name}")
+        return self.used / self.total * 100
+
+
+@dataclass(frozen=True)
+class InterfaceCounters:
+    name: str
+    in_octets: int
+    out_octets: int
+    in_errors: int
+    out_errors: int
+    in_drops: int
+    out_drops: int
+    bandwidth_kbps: int
+
+
+UNIT_BYTES = {"": 1, "B": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+UNIT_SECONDS = {
+    "year": 365 * 86400, "week": 7 * 86400, "day": 86400,
+    "hour": 3600, "minute": 60, "second": 1
+}
+
+UPTIME_PART = re.compile(r"(\d+)\s+(year|week|day|hour|minute|second)s?")
+UPTIME_LINE = re.compile(r"(?:uptime is|[Uu]ptime:)\s*(.+)")
+
+def parse_uptime_seconds(output: str) -> int:
+    """Convert '3 weeks, 2 days, 4 hours, 10 minutes' style uptime to seconds"""
+    line = UPTIME_LINE.search(output)
+    if not line:
+        raise ParseError("Uptime not found in output")
+    parts = UPTIME_PART.findall(line.group(1))
+    if not parts:
+        raise ParseError("Uptime has no recognizable units")
+    return sum(int(value) * UNIT_SECONDS[unit] for value, unit in parts)
+
+def format_uptime(seconds: int) -> str:
+    """Render seconds in the compact '3w 2d 4h 10m' form shown in the GUI"""
+    parts = []
+    for suffix, unit in (("y", "year"), ("w", "week"), ("d", "day"), ("h", "hour"), ("m", "minute")):
+        value, seconds = divmod(seconds, UNIT_SECONDS[unit])
+        if value:
+            parts.append(f"{value}{suffix}")
+    return " ".join(parts) or "0m"
+
+
+# IOS and IOS-XE
+IOS_CPU = re.compile(
+    r"CPU utilization for five seconds:\s*(?P<five_seconds>\d+)%(?:/\d+%)?;\s*"
+    r"one minute:\s*(?P<one_minute>\d+)%;\s*five minutes:\s*(?P<five_minutes>\d+)%"
+)
+IOS_MEMORY = re.compile(
+    r"^\s*(?P<name>Processor|I/O|lsmpi_io|Driver te|reserve P)\s+[0-9A-Fa-f]+\s+"
+    r"(?P<total>\d+)\s+(?P<used>\d+)\s+(?P<free>\d+)",
+    re.MULTILINE
+)
+
+# IOS-XR
+XR_CPU = re.compile(
+    r"CPU utilization for one minute:\s*(?P<one_minute>\d+)%;\s*"
+    r"five minutes:\s*(?P<five_minutes>\d+)%;\s*fifteen minutes:\s*\d+%"
+)
+XR_MEMORY = re.compile(
+    r"^\s*(?P<name>Physical|Application) Memory\s*:\s*(?P<total>\d+)(?P<total_unit>[KMG])\s*(?:total\s*)?"
+    r"\((?P<free>\d+)(?P<free_unit>[KMG]) available\)",
+    re.MULTILINE
+)
+
+# NX-OS
+NXOS_CPU = re.compile(r"CPU states\s*:\s*[\d.]+% user,\s*[\d.]+% kernel,\s*(?P<idle>[\d.]+)% idle")
+NXOS_MEMORY = re.compile(
+    r"Memory usage:\s*(?P<total>\d+)(?P<unit>[KMG])\s+total,\s*(?P<used>\d+)[KMG]\s+used,\s*"
+    r"(?P<free>\d+)[KMG]\s+free"
+)
+
+# 'show interfaces' blocks; alternatives cover the IOS/XR and NX-OS layouts
+INTERFACE_HEADER = re.compile(r"^(?P<name>\S+) is (?:up|down|administratively down|deleted)", re.MULTILINE)
+INTERFACE_FIELDS = {
+    "in_octets": re.compile(r"\d+ packets input, (\d+) bytes|\d+ input packets\s+(\d+) bytes"),
+    "out_octets": re.compile(r"\d+ packets output, (\d+) bytes|\d+ output packets\s+(\d+) bytes"),
+    "in_errors": re.compile(r"(\d+) input errors?"),
+    "out_errors": re.compile(r"(\d+) output errors?"),
+    "in_drops": re.compile(r"Input queue: \d+/\d+/(\d+)|(\d+) total input drops|(\d+) input discard"),
+    "out_drops": re.compile(r"Total output drops: (\d+)|(\d+) total output drops|(\d+) output discard"),
+    "bandwidth_kbps": re.compile(r"BW (\d+) Kbit"),
+}
+
+def _first_group(match) -> int:
+    return int(next(value for value in match.groups() if value is not None))
+
+def parse_interfaces(output: str) -> List[InterfaceCounters]:
+    """Octet, error and drop counters for every interface in 'show interfaces'"""
+    headers = list(INTERFACE_HEADER.finditer(output))
+    interfaces = []
+    for header, following in zip(headers, headers[1:] + [None]):
+        block = output[header.end():following.start() if following else len(output)]
+        values = {}
+        for field, pattern in INTERFACE_FIELDS.items():
+            match = pattern.search(block)
+            values[field] = _first_group(match) if match else 0
+        interfaces.append(InterfaceCounters(header.group("name"), **values))
+    if headers and not any(i.in_octets or i.out_octets or i.bandwidth_kbps for i in interfaces):
+        raise ParseError("Interface counters not found in output")
+    return interfaces
+
+
+def _optional_float(match, name):
+    value = match.groupdict().get(name)
+    return float(value) if value is not None else None
+
+def parse_ios_cpu(output: str) -> CpuRecord:
+    match = IOS_CPU.search(output)
+    if not match:
+        raise ParseError("CPU data not found in output")
+    return CpuRecord(_optional_float(match, "five_seconds"),
+                     _optional_float(match, "one_minute"),
+                     _optional_float(match, "five_minutes"))
+
+def parse_ios_memory(output: str) -> List[MemoryPool]:
+    pools = [MemoryPool(m.group("name"), int(m.group("total")), int(m.group("used")), int(m.group("free")))
+             for m in IOS_MEMORY.finditer(output)]
+    if not pools:
+        raise ParseError("Memory data not found in output")
+    return pools
+
+def parse_xr_cpu(output: str) -> CpuRecord:
+    match = XR_CPU.search(output)
+    if not match:
+        raise ParseError("CPU data not found in output")
+    return CpuRecord(None, _optional_float(match, "one_minute"), _optional_float(match, "five_minutes"))
+
+def parse_xr_memory(output: str) -> List[MemoryPool]:
+    pools = []
+    for m in XR_MEMORY.finditer(output):
+        total = int(m.group("total")) * UNIT_BYTES[m.group("total_unit")]
+        free = int(m.group("free")) * UNIT_BYTES[m.group("free_unit")]
+        pools.append(MemoryPool(m.group("name"), total, total - free, free))
+    if not pools:
+        raise ParseError("Memory data not found in output")
+    return pools
+
+def parse_nxos_cpu(output: str) -> CpuRecord:
+    match = NXOS_CPU.search(output)
+    if not match:
+        raise ParseError("CPU data not found in output")
+    return CpuRecord(round(100 - float(match.group("idle")), 2), None, None)
+
+def parse_nxos_memory(output: str) -> List[MemoryPool]:
+    match = NXOS_MEMORY.search(output)
+    if not match:
+        raise ParseError("Memory data not found in output")
+    scale = UNIT_BYTES[match.group("unit")]
+    return [MemoryPool("system", int(match.group("total")) * scale,
+                       int(match.group("used")) * scale, int(match.group("free")) * scale)]
+
+
+@dataclass(frozen=True)
+class PlatformParsers:
+    """Commands and parsers used to poll one platform"""
+    platform: str
+    cpu_command: str
+    memory_command: str
+    uptime_command: str
+    parse_cpu: Callable[[str], CpuRecord]
+    parse_memory: Callable[[str], List[MemoryPool]]
+    parse_uptime: Callable[[str], int] = parse_uptime_seconds
+    primary_pool: str = "Processor"
+    # Lean profile: device-side filters so only the lines we parse are sent
+    lean_cpu_command: str = ""
+    lean_memory_command: str = ""
+    # Pattern that means the CPU fields have arrived and reading can stop
+    cpu_done: Optional[Pattern] = None
+    interface_command: str = "show interfaces"
+    lean_interface_command: str = (
+        "show interfaces | include is (up|down|admin)|BW|packets (input|output)|"
+        "(input|output) errors|drops"
+    )
+    parse_interfaces: Callable[[str], List[InterfaceCounters]] = parse_interfaces
+
+    def commands(self, profile: str):
+        """(cpu, memory, uptime) commands for the 'lean' or 'full' profile"""
+        if profile == "lean" and self.lean_cpu_command:
+            return self.lean_cpu_command, self.lean_memory_command, self.uptime_command
+        return self.cpu_command, self.memory_command, self.uptime_command
+
+    def interfaces_command(self, profile: str) -> str:
+        return self.lean_interface_command if profile == "lean" else self.interface_command
+
+
+PARSER_REGISTRY: Dict[str, PlatformParsers] = {
+    "IOS": PlatformParsers(
+        "IOS", "show processes cpu", "show memory statistics",
+        "show version | include uptime", parse_ios_cpu, parse_ios_memory,
+        lean_cpu_command="show processes cpu | include CPU utilization",
+        lean_memory_command="show memory statistics | include Processor",
+        cpu_done=IOS_CPU
+    ),
+    "IOS-XE": PlatformParsers(
+        "IOS-XE", "show processes cpu", "show memory statistics",
+        "show version | include uptime", parse_ios_cpu, parse_ios_memory,
+        lean_cpu_command="show processes cpu | include CPU utilization",
+        lean_memory_command="show memory statistics | include Processor",
+        cpu_done=IOS_CPU
+    ),
+    "IOS-XR": PlatformParsers(
+        "IOS-XR", "show processes cpu", "show memory summary",
+        "show version | include uptime", parse_xr_cpu, parse_xr_memory,
+        primary_pool="Application",
+        lean_cpu_command="show processes cpu | include CPU utilization",
+        lean_memory_command="show memory summary | include Memory",
+        cpu_done=XR_CPU
+    ),
+    "NX-OS": PlatformParsers(
+        "NX-OS", "show system resources", "show system resources",
+        "show system uptime", parse_nxos_cpu, parse_nxos_memory,
+        primary_pool="system",
+        lean_cpu_command='show system resources | egrep "CPU states|Memory usage"',
+        lean_memory_command='show system resources | egrep "CPU states|Memory usage"',
+        # CPU and memory share one command and the memory line comes last
+        cpu_done=NXOS_MEMORY,
+        interface_command="show interface",
+        lean_interface_command=(
+            'show interface | egrep "is up|is down|BW|input packets|output packets|'
+            'input error|output error|discard"'
+        )
+    ),
+}
+
+PLATFORM_SIGNATURES = [
+    ("IOS-XR", re.compile(r"IOS[ -]XR", re.IGNORECASE)),
+    ("NX-OS", re.compile(r"NX-OS|Nexus Operating System", re.IGNORECASE)),
+    ("IOS-XE", re.compile(r"IOS[ -]XE", re.IGNORECASE)),
+    ("IOS", re.compile(r"Cisco IOS Software|IOS \(tm\)", re.IGNORECASE)),
+]
+
+def detect_platform(show_version: str) -> str:
+    """Identify the platform from 'show version' output, defaulting to IOS"""
+    for platform, signature in PLATFORM_SIGNATURES:
+        if signature.search(show_version):
+            return platform
+    return "IOS"
+
+def get_parsers(platform: str) -> PlatformParsers:
+    return PARSER_REGISTRY.get(platform, PARSER_REGISTRY["IOS"])
+
+def primary_memory_percent(parsers: PlatformParsers, pools: List[MemoryPool]) -> float:
+    """Usage of the pool the GUI charts, falling back to the first pool"""
+    for pool in pools:
+        if pool.name == parsers.primary_pool:
+            return pool.percent_used
+    return pools[0].percent_used
@@ -0,0 +1,228 @@
+import asyncio
+import re
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from backend.Connect import get_routers
+from backend.events import make_event, record_events
+
+SYSLOG_HOST = "0.0.0.0"
+SYSLOG_PORT = 5514       # 514 needs root; point the routers' 'logging host ... transport udp port 5514' here
+BATCH_SIZE = 500         # events per insert_many
+FLUSH_INTERVAL = 1.0     # seconds a partial batch may wait
+INVENTORY_REFRESH = 60
+RECEIVE_BUFFER = 4 * 1024 * 1024  # absorbs bursts (e.g. a flapping link on many routers)
+
+# <189>123: R1: *Mar  1 00:01:02.123: %OSPF-5-ADJCHG: Process 1, Nbr 2.2.2.2 on Gi0/0 from LOADING to FULL
+SYSLOG_PRI = re.compile(r"^<(?P<pri>\d{1,3})>")
+CISCO_MESSAGE = re.compile(
+    r"%(?P<facility>[A-Z0-9_]+)(?:-(?P<subfacility>[A-Z0-9_]+))?-(?P<level>[0-7])-"
+    r"(?P<mnemonic>[A-Z0-9_]+):\s*(?P<text>.*)$",
+    re.DOTALL
+)
+DEVICE_TIMESTAMP = re.compile(r"[*.]?(?P<stamp>[A-Z][a-z]{2}\s+\d+\s+(?:\d{4}\s+)?\d{2}:\d{2}:\d{2}(?:\.\d+)?)")
+
+SEVERITIES = ["critical", "critical", "critical", "error", "warning", "notice", "info", "debug"]
+LEVEL_NAMES = ["emergencies", "alerts", "critical", "errors", "warnings",
+               "notifications", "informational", "debugging"]
+
+def parse_syslog(message: str, source_ip: str, routers_by_ip: Dict[str, str]) -> Dict[str, Any]:
+    """Turn one syslog line into an event, extracting Cisco facility, level and mnemonic"""
+    message = message.strip()
+    pri = SYSLOG_PRI.match(message)
+    level = int(pri.group("pri")) % 8 if pri else 6
+    body = message[pri.end():] if pri else message
+
+    details: Dict[str, Any] = {"source_ip": source_ip, "raw": message}
+    cisco = CISCO_MESSAGE.search(body)
+    if cisco:
+        level = int(cisco.group("level"))
+        mnemonic = cisco.group("mnemonic")
+        facility = cisco.group("facility")
+        if cisco.group("subfacility"):
+            facility = f"{facility}-{cisco.group('subfacility')}"
+        details.update({
+            "facility": facility,
+            "mnemonic": mnemonic,
+            "code": f"%{facility}-{level}-{mnemonic}",
+        })
+        text = cisco.group("text").strip()
+        stamp = DEVICE_TIMESTAMP.search(body[:cisco.start()])
+        if stamp:
+            details["device_timestamp"] = stamp.group("stamp")
+    else:
+        text = body.strip()
+    details["level"] = level
+    details["level_name"] = LEVEL_NAMES[level]
+
+    summary = f"{details['code']}: {text}" if cisco else text
+    return make_event("syslog", routers_by_ip.get(source_ip, source_ip), SEVERITIES[level], summary, **details)
+
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    def __init__(self, receiver):
+        self.receiver = receiver
+
+    def datagram_received(self, data, addr):
+        self.receiver.submit(data.decode("utf-8", "ignore"), addr[0])
+
+
+class SyslogReceiver:
+    """UDP and TCP syslog listener that writes parsed messages in batches
+
+    Runs its own asyncio loop in a daemon thread. Parsed events are buffered
+    and stored with one insert_many per batch; every stored batch is also
+    passed to the listeners, which is how the dashboard shows them live.
+    """
+
+    def __init__(self, host=SYSLOG_HOST, port=SYSLOG_PORT, tcp=True):
+        self.host = host
+        self.port = port
+        self.tcp = tcp
+        self.listeners = []
+        self.received = 0
+        self.stored = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._routers_by_ip: Dict[str, str] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread = None
+        self._ready = threading.Event()
+        self.error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Start listening; returns False if the ports could not be bound"""
+        if self.running:
+            return True
+        self._ready.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+        return self.error is None and self.running
+
+    def stop(self):
+        if self._loop is not None and self.running:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+
+    def _refresh_inventory(self):
+        try:
+            self._routers_by_ip = {router['ip']: router['name'] for router in get_routers()}
+        except Exception as e:
+            print(f"Database error: {e}")
+
+    async def _refresh_periodically(self):
+        # get_routers blocks on MongoDB; run it in the executor, off the receive loop
+        while True:
+            await self._loop.run_in_executor(None, self._refresh_inventory)
+            await asyncio.sleep(INVENTORY_REFRESH)
+
+    def submit(self, message: str, source_ip: str):
+        """Parse one message into the pending batch (called on the receiver loop)"""
+        self.received += 1
+        try:
+            self._buffer.append(parse_syslog(message, source_ip, self._routers_by_ip))
+        except Exception as e:
+            print(f"Unparseable syslog message from {source_ip}: {e}")
+        if len(self._buffer) >= BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        # insert_many blocks; keep the receive loop free to read datagrams
+        self._loop.run_in_executor(None, self._store, batch)
+
+    def _store(self, batch):
+        self.stored += record_events(batch)
+        for listener in self.listeners:
+            listener(batch)
+
+    async def _handle_tcp(self, reader, writer):
+        source_ip = writer.get_extra_info("peername")[0]
+        try:
+            while True:
+                # RFC 6587: octet counting ('123 <189>...', no trailer) starts
+                # with the frame length; non-transparent framing with '<PRI>'
+                first = await reader.read(1)
+                if not first:
+                    break
+                if first.isdigit():
+                    count = first + await reader.readuntil(b" ")
+                    frame = await reader.readexactly(int(count[:-1]))
+                else:
+                    frame = first + await reader.readline()
+                self.submit(frame.decode("utf-8", "ignore"), source_ip)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass  # peer closed mid-frame or sent a malformed length
+        finally:
+            writer.close()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            self._flush()
+
+    def _run(self):
+        self._loop = loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            transport, _ = loop.run_until_complete(
+                loop.create_datagram_endpoint(lambda: _UdpProtocol(self), local_addr=(self.host, self.port))
+            )
+            udp_socket = transport.get_extra_info("socket")
+            udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER)
+            server = None
+            if self.tcp:
+                server = loop.run_until_complete(asyncio.start_server(self._handle_tcp, self.host, self.port))
+        except OSError as e:
+            self.error = f"Cannot listen on port {self.port}: {e}"
+            self._ready.set()
+            loop.close()
+            return
+        tasks = [loop.create_task(self._flush_periodically()), loop.create_task(self._refresh_periodically())]
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+            transport.close()
+            if server is not None:
+                server.close()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+            if self._buffer:
+                batch, self._buffer = self._buffer, []
+                self._store(batch)
+
+
+_receiver = None
+
+def get_syslog_receiver() -> SyslogReceiver:
+    """Shared receiver started from the dashboard"""
+    global _receiver
+    if _receiver is None:
+        _receiver = SyslogReceiver()
+    return _receiver
+
+
+if __name__ == "__main__":
+    # Companion process: python -m backend.syslog_receiver [port]
+    import sys
+    receiver = SyslogReceiver(port=int(sys.argv[1]) if len(sys.argv) > 1 else SYSLOG_PORT)
+    if not receiver.start():
+        raise SystemExit(receiver.error)
+    print(f"Listening for syslog on {receiver.host}:{receiver.port} (udp/tcp)")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"received {receiver.received}, stored {receiver.stored}")
+    except KeyboardInterrupt:
+        receiver.stop()
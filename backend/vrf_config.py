@@ -1,8 +1,10 @@
 import paramiko
 from pymongo import MongoClient
 import re
-import time
 from datetime import datetime
+from backend.state_cache import get_interfaces, get_state_cache
+from backend.ssh_client import RouterSSHClient
+from backend.operations import ensure_operation, read_until_prompt, send_commands
 
 # MongoDB Configuration
 VRF_LOGS = MongoClient("mongodb://localhost:27017/")["NetworkApp"]["Logs"]
@@ -33,26 +35,9 @@ def fetch_routers_from_db():
         return []
 
 def fetch_interfaces(router):
-    """Fetch router interfaces via SSH with logging"""
-    ssh = paramiko.SSHClient()
-    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    
+    """Fetch router interfaces through the shared state cache with logging"""
     try:
-        ssh.connect(
-            router['ip'],
-            username=router['username'],
-            password=router['password'],
-            timeout=10
-        )
-        
-        stdin, stdout, stderr = ssh.exec_command("show ip interface brief")
-        output = stdout.read().decode()
-        
-        interfaces = [
-            line.split()[0] 
-            for line in output.splitlines() 
-            if line.strip() and not line.startswith('Interface')
-        ]
+        interfaces = [intf.name for intf in get_interfaces(router)]
         
         # Log interface fetch operation
         VRF_LOGS.insert_one({
@@ -80,51 +65,42 @@ def fetch_interfaces(router):
         }
         VRF_LOGS.insert_one(log_entry)
         raise Exception(error_msg)
-    finally:
-        ssh.close()
 
 def validate_vrf_name(name):
     """Validate VRF naming convention"""
     return re.match(r"^[a-zA-Z0-9_-]{1,32}$", name)
 
-def execute_ssh_commands(router, commands):
+def execute_ssh_commands(router, commands, operation=None):
     """Execute SSH commands with enhanced logging"""
-    ssh = paramiko.SSHClient()
+    operation = ensure_operation(operation)
+    ssh = RouterSSHClient(write=True)
     ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
     full_output = ""
     
     try:
+        operation.step(f"Connecting to {router['name']}")
         ssh.connect(
             router['ip'],
             username=router['username'],
             password=router['password'],
             timeout=10
         )
+        operation.check()
         chan = ssh.invoke_shell()
         
         # Read initial prompt
-        while not full_output.endswith(('#', '>')):
-            full_output += chan.recv(1024).decode()
-
-        # Execute commands
-        for cmd in commands:
-            chan.send(f"{cmd}\n")
-            time.sleep(0.5)
-            resp = chan.recv(4096).decode()
-            full_output += resp
-            if any(err in resp for err in ["% Invalid", "% Error"]):
-                raise ValueError(f"Command failed: {cmd}\n{resp}")
+        full_output += read_until_prompt(chan, operation)
 
-        # Save configuration
-        chan.send("write memory\n")
-        time.sleep(1)
+        # Execute commands, then save the configuration
+        full_output += send_commands(chan, commands + ["write memory"], operation,
+                                     error_markers=("% Invalid", "% Error"))
         return full_output
     
     except Exception as e:
         raise  # Re-raise for upper layer handling
     finally:
         ssh.close()
-def send_vrf_configuration(router, vrf_name, rd_value, rt_value, interface=None):
+def send_vrf_configuration(router, vrf_name, rd_value, rt_value, interface=None, operation=None):
     """Main VRF configuration function with full logging"""
     response = {"success": False, "output": "", "error": ""}
     config = {
@@ -157,7 +133,8 @@ def send_vrf_configuration(router, vrf_name, rd_value, rt_value, interface=None)
         commands.append("end")
         
         # Execute
-        output = execute_ssh_commands(router, commands)
+        output = execute_ssh_commands(router, commands, operation)
+        get_state_cache().invalidate(router, ["vrfs", "interfaces"])
         response.update(success=True, output=output)
         log_vrf_action("create", "success", router, config)
 
@@ -168,7 +145,7 @@ def send_vrf_configuration(router, vrf_name, rd_value, rt_value, interface=None)
     
     return response
 
-def remove_vrf_configuration(router, vrf_name):
+def remove_vrf_configuration(router, vrf_name, operation=None):
     """VRF removal function with full logging"""
     response = {"success": False, "output": "", "error": ""}
     config = {"vrf_name": vrf_name}
@@ -180,7 +157,8 @@ def remove_vrf_configuration(router, vrf_name):
             "end",
             "write memory"
         ]
-        output = execute_ssh_commands(router, commands)
+        output = execute_ssh_commands(router, commands, operation)
+        get_state_cache().invalidate(router, ["vrfs", "interfaces"])
         response.update(success=True, output=output)
         log_vrf_action("delete", "success", router, config)
 
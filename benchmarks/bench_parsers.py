@@ -0,0 +1,57 @@
+"""Benchmark the Router_stats parser registry against recorded device output.
+
+Run from the repository root:
+    python -m benchmarks.bench_parsers [iterations]
+"""
+import os
+import sys
+import timeit
+from backend.stats_parsers import detect_platform, get_parsers, primary_memory_percent
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "parser_corpus")
+
+# platform -> (version file, cpu file, memory file, uptime file, expected values)
+CORPUS = {
+    "IOS": ("ios_show_version", "ios_show_processes_cpu", "ios_show_memory_statistics",
+            "ios_show_version", {"cpu": 7.0, "memory": 22.38, "uptime": 2002200}),
+    "IOS-XE": ("ios_xe_show_version", "ios_xe_show_processes_cpu", "ios_xe_show_memory_statistics",
+               "ios_xe_show_version", {"cpu": 12.0, "memory": 18.57, "uptime": 32140740}),
+    "IOS-XR": ("ios_xr_show_version", "ios_xr_show_processes_cpu", "ios_xr_show_memory_summary",
+               "ios_xr_show_version", {"cpu": 5.0, "memory": 22.18, "uptime": 1307100}),
+    "NX-OS": ("nx_os_show_version", "nx_os_show_system_resources", "nx_os_show_system_resources",
+              "nx_os_show_system_uptime", {"cpu": 5.5, "memory": 45.44, "uptime": 1047866}),
+}
+
+def load(name):
+    with open(os.path.join(CORPUS_DIR, f"{name}.txt")) as f:
+        return f.read()
+
+def check(platform, parsers, cpu_out, mem_out, up_out, expected):
+    cpu = parsers.parse_cpu(cpu_out).current
+    memory = round(primary_memory_percent(parsers, parsers.parse_memory(mem_out)), 2)
+    uptime = parsers.parse_uptime(up_out)
+    actual = {"cpu": cpu, "memory": memory, "uptime": uptime}
+    if actual != expected:
+        raise AssertionError(f"{platform}: expected {expected}, got {actual}")
+
+def main(iterations=20000):
+    print(f"{'platform':<8} {'detect':>10} {'cpu':>10} {'memory':>10} {'uptime':>10}  (us per call)")
+    for platform, (version, cpu, memory, uptime, expected) in CORPUS.items():
+        version_out, cpu_out, mem_out, up_out = load(version), load(cpu), load(memory), load(uptime)
+        detected = detect_platform(version_out)
+        if detected != platform:
+            raise AssertionError(f"{version}: detected {detected}, expected {platform}")
+        parsers = get_parsers(detected)
+        check(platform, parsers, cpu_out, mem_out, up_out, expected)
+
+        timings = [
+            timeit.timeit(lambda: detect_platform(version_out), number=iterations),
+            timeit.timeit(lambda: parsers.parse_cpu(cpu_out), number=iterations),
+            timeit.timeit(lambda: parsers.parse_memory(mem_out), number=iterations),
+            timeit.timeit(lambda: parsers.parse_uptime(up_out), number=iterations),
+        ]
+        print(f"{platform:<8} " + " ".join(f"{t / iterations * 1e6:>10.2f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,111 @@
+"""Compare bytes and modelled wall time of the 'full' and 'lean' stats polls.
+
+A fake shell channel replays the recorded corpus through SSHRouterMonitor, so
+the byte counts come from the real read path. The full 'show processes cpu'
+output is padded to a typical process count. Wall time is modelled from the
+link parameters below, both for the previous 100 ms recv polling loop and
+for the event-driven reads.
+
+Run from the repository root:
+    python -m benchmarks.bench_poll_profiles
+"""
+import os
+import re
+from backend.Router_stats import SSHRouterMonitor
+from backend.stats_parsers import get_parsers
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "parser_corpus")
+PROCESS_LINES = 350
+RTT = 0.02              # seconds per command round trip
+BANDWIDTH = 2_000_000   # bytes per second the device shell sustains
+CHUNK = 4096            # bytes per recv()
+LEGACY_SLEEP = 0.1      # the old loop slept this long after every recv()
+
+
+def load(name):
+    with open(os.path.join(CORPUS_DIR, f"{name}.txt")) as f:
+        return f.read()
+
+
+class ReplayChannel:
+    """Minimal stand-in for a paramiko shell channel"""
+
+    def __init__(self, outputs, prompt="PE1#"):
+        self.outputs = outputs
+        self.prompt = prompt
+        self.buffer = b""
+        self.closed = False
+        self.commands = []
+
+    def send(self, command):
+        command = command.strip()
+        self.commands.append(command)
+        output = self.outputs[command]
+        self.buffer += f"{command}\r\n{output}\r\n{self.prompt}".encode()
+
+    def recv_ready(self):
+        return bool(self.buffer)
+
+    def recv(self, size):
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+def include(output, pattern):
+    return "\n".join(line for line in output.splitlines() if re.search(pattern, line))
+
+
+def build_outputs():
+    cpu = load("ios_show_processes_cpu")
+    header, rows = cpu.split("\n", 1)
+    template = rows.splitlines()[-1]
+    padding = "\n".join(template.replace("  15 ", f"{i:4d} ") for i in range(16, PROCESS_LINES))
+    cpu_full = f"{cpu.rstrip()}\n{padding}"
+    memory = load("ios_show_memory_statistics")
+    version = load("ios_show_version")
+    return {
+        "show version | include uptime": include(version, "uptime"),
+        "show processes cpu": cpu_full,
+        "show memory statistics": memory,
+        "show processes cpu | include CPU utilization": include(cpu_full, "CPU utilization"),
+        "show memory statistics | include Processor": include(memory, "Processor"),
+    }
+
+
+def run(profile, outputs):
+    monitor = SSHRouterMonitor("bench", "user", "password", profile)
+    monitor.parsers = get_parsers("IOS")
+    monitor.platform = "IOS"
+    monitor.channel = ReplayChannel(outputs)
+    monitor.connected = True
+    stats = monitor.get_stats()
+    return stats, len(monitor.channel.commands), len(monitor.channel.buffer)
+
+
+def modelled_seconds(commands, received, legacy):
+    chunks = -(-received // CHUNK)
+    transfer = received / BANDWIDTH
+    if legacy:
+        return commands * RTT + transfer + chunks * LEGACY_SLEEP
+    return commands * RTT + transfer
+
+
+def main():
+    outputs = build_outputs()
+    results = {}
+    for profile in ("full", "lean"):
+        stats, commands, unread = run(profile, outputs)
+        received = stats['poll_bytes']
+        results[profile] = received
+        # The previous loop always read everything up to the prompt
+        legacy = modelled_seconds(commands, received + unread, True)
+        print(f"{profile:<5} cpu={stats['cpu']:.1f}% memory={stats['memory']:.1f}% "
+              f"bytes read={received:6d} left unread={unread:6d} "
+              f"modelled time={modelled_seconds(commands, received, False) * 1000:7.1f} ms "
+              f"(100 ms polling loop: {legacy * 1000:7.1f} ms)")
+    saved = results['full'] - results['lean']
+    print(f"lean profile saves {saved} bytes per poll ({saved / results['full']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
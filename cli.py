@@ -0,0 +1,225 @@
+"""Headless command-line interface to the backend, for cron jobs and pipelines.
+
+No Qt, matplotlib or login: the backend is called directly and every result
+is printed as one JSON object per line. Backend modules are imported only by
+the command that needs them, so '--help' and bad arguments return at once.
+
+Run from the repository root:
+    python cli.py inventory
+    python cli.py stats R1 R2 [--interfaces]      (or --all)
+    python cli.py config R1
+    python cli.py ospf apply --router R1 --set ospf_id=1 \\
+        --set 'networks=[{"network": "10.0.0.0", "mask": "0.0.0.255", "area": "0"}]'
+    python cli.py batch tasks.yaml [--workers 8]  ('-' reads stdin)
+
+A batch file is a JSON or YAML list of tasks (or {"tasks": [...]}); each task
+names an op ('stats', 'config' or '<protocol>.<action>', e.g. 'vrf.apply'),
+a router and the handler's arguments:
+    - {op: bgp.apply, router: PE1, bgp_type: iBGP, local_asn: 65000,
+       neighbor_ip: 2.2.2.2, neighbor_asn: 65000, prefix: 10.0.0.0, mask: 255.255.255.0}
+    - {op: mpls.apply, router: PE1, interfaces: [GigabitEthernet0/1]}
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# (protocol, action) -> job handler name in backend.jobs.HANDLERS
+ACTIONS = {
+    ("ospf", "apply"): "apply_ospf_config",
+    ("ospf", "delete"): "delete_ospf_config",
+    ("ospf", "delete-network"): "delete_ospf_network",
+    ("bgp", "apply"): "configure_bgp",
+    ("bgp", "delete"): "delete_bgp_config",
+    ("bgp", "vpnv4"): "configure_vpnv4",
+    ("mpls", "apply"): "configure_mpls",
+    ("mpls", "delete"): "delete_mpls_config",
+    ("isis", "apply"): "apply_isis_configuration",
+    ("isis", "delete"): "delete_isis_configuration",
+    ("vrf", "apply"): "send_vrf_configuration",
+    ("vrf", "delete"): "remove_vrf_configuration",
+}
+PROTOCOLS = sorted({protocol for protocol, _ in ACTIONS})
+DEFAULT_WORKERS = 8
+PUBLIC_FIELDS = ("name", "ip", "type", "platform", "stats_backend")
+
+
+def emit(record):
+    """Write one JSON line and flush so pipelines see results as they finish"""
+    sys.stdout.write(json.dumps(record, default=str) + "\n")
+    sys.stdout.flush()
+
+def load_inventory():
+    from backend.Connect import get_routers
+    return {router['name']: router for router in get_routers()}
+
+def find_router(inventory, name):
+    router = inventory.get(name)
+    if router is None:
+        raise ValueError(f"Router {name} not found in the inventory")
+    return router
+
+def parse_value(text):
+    """Values from --set are JSON when they parse as JSON, plain strings otherwise"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+def load_tasks(path):
+    """Read a JSON or YAML batch file ('-' for stdin) into a list of task dicts"""
+    text = sys.stdin.read() if path == "-" else open(path).read()
+    if path.endswith((".yaml", ".yml")) or (path == "-" and not text.lstrip().startswith(("[", "{"))):
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit("YAML batch files need PyYAML (pip install pyyaml); JSON works without it")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    tasks = data.get("tasks", []) if isinstance(data, dict) else data
+    if not isinstance(tasks, list) or not all(isinstance(task, dict) for task in tasks):
+        raise SystemExit("A batch file must contain a list of task objects")
+    return tasks
+
+
+def run_stats(router, interfaces=False):
+    from backend.Router_stats import get_stats_for_router
+    return get_stats_for_router(router, interfaces=interfaces)
+
+def run_config(router):
+    from backend.config import ssh_get_running_config
+    return {"config": ssh_get_running_config(router, socket.gethostbyname(socket.gethostname()))}
+
+def run_handler(handler, router, arguments):
+    from backend.jobs import HANDLERS, resolve_handler, job_outcome
+    kwargs = dict(arguments)
+    if HANDLERS[handler][2] == "router":
+        kwargs["router"] = router
+    else:
+        kwargs["router_name"] = router['name']
+    result = resolve_handler(handler)(**kwargs)
+    success, error = job_outcome(result)
+    return {"success": success, "error": error or None,
+            "output": result.get("output") if isinstance(result, dict) else None}
+
+def run_task(task, inventory):
+    """Run one task and return its JSON-lines record; never raises"""
+    task = dict(task)
+    op = task.pop("op", "")
+    name = task.pop("router", "")
+    record = {"op": op, "router": name}
+    started = time.perf_counter()
+    try:
+        router = find_router(inventory, name)
+        if op == "stats":
+            result = run_stats(router, bool(task.get("interfaces")))
+            record.update(success=not result.get("error"), error=result.get("error") or None, result=result)
+        elif op == "config":
+            record.update(success=True, result=run_config(router))
+        else:
+            protocol, _, action = op.partition(".")
+            handler = ACTIONS.get((protocol, action))
+            if handler is None:
+                raise ValueError(f"Unknown op '{op}'")
+            outcome = run_handler(handler, router, task)
+            record.update(success=outcome["success"], error=outcome["error"], output=outcome["output"])
+    except Exception as e:
+        record.update(success=False, error=str(e))
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+def run_tasks(tasks, workers):
+    """Run tasks in parallel, printing each result as it completes; returns the failure count"""
+    inventory = load_inventory()
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(run_task, task, inventory): index for index, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            record = future.result()
+            record["task"] = futures[future]
+            failures += not record["success"]
+            emit(record)
+    return failures
+
+
+def cmd_inventory(args):
+    for router in load_inventory().values():
+        emit({field: router.get(field) for field in PUBLIC_FIELDS if field in router})
+    return 0
+
+def cmd_stats(args):
+    names = list(load_inventory()) if args.all else args.routers
+    if not names:
+        raise SystemExit("Name at least one router or pass --all")
+    tasks = [{"op": "stats", "router": name, "interfaces": args.interfaces} for name in names]
+    return 1 if run_tasks(tasks, args.workers) else 0
+
+def cmd_config(args):
+    tasks = [{"op": "config", "router": name} for name in args.routers]
+    return 1 if run_tasks(tasks, args.workers) else 0
+
+def cmd_protocol(args):
+    arguments = {}
+    for item in args.set or []:
+        key, separator, value = item.partition("=")
+        if not separator:
+            raise SystemExit(f"--set expects key=value, got '{item}'")
+        arguments[key] = parse_value(value)
+    tasks = [dict(arguments, op=f"{args.protocol}.{args.action}", router=name) for name in args.router]
+    return 1 if run_tasks(tasks, args.workers) else 0
+
+def cmd_batch(args):
+    return 1 if run_tasks(load_tasks(args.file), args.workers) else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Headless network automation commands")
+    workers = int(os.environ.get("NETAPP_WORKERS", DEFAULT_WORKERS))
+    parser.add_argument("--workers", type=int, default=workers,
+                        help=f"tasks run in parallel (default {workers})")
+    # Also accepted after the command; SUPPRESS keeps the top-level value when it is not repeated there
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--workers", type=int, default=argparse.SUPPRESS,
+                        help=f"tasks run in parallel (default {workers})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    inventory = commands.add_parser("inventory", parents=[common], help="list routers (without credentials)")
+    inventory.set_defaults(func=cmd_inventory)
+
+    stats = commands.add_parser("stats", parents=[common], help="collect CPU, memory and uptime")
+    stats.add_argument("routers", nargs="*")
+    stats.add_argument("--all", action="store_true", help="every router in the inventory")
+    stats.add_argument("--interfaces", action="store_true", help="include interface counters")
+    stats.set_defaults(func=cmd_stats)
+
+    config = commands.add_parser("config", parents=[common], help="fetch the running configuration")
+    config.add_argument("routers", nargs="+")
+    config.set_defaults(func=cmd_config)
+
+    for protocol in PROTOCOLS:
+        command = commands.add_parser(protocol, parents=[common], help=f"apply or delete {protocol.upper()} configuration")
+        command.add_argument("action", choices=[action for p, action in ACTIONS if p == protocol])
+        command.add_argument("--router", action="append", required=True, help="repeat for several routers")
+        command.add_argument("--set", action="append", metavar="KEY=VALUE",
+                             help="handler argument; JSON values are decoded")
+        command.set_defaults(func=cmd_protocol, protocol=protocol)
+
+    batch = commands.add_parser("batch", parents=[common], help="run tasks from a JSON or YAML file")
+    batch.add_argument("file", help="batch file, or '-' for stdin")
+    batch.set_defaults(func=cmd_batch)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Local SNMP agent stand-in for exercising backend.snmp_stats.
+
+Serves SNMPv2c GET, GETNEXT and GETBULK from a snmpsim-style .snmprec file
+(OID|type|value per line, the community is the file name without extension).
+
+    python -m devtools.snmp_standin --port 11161
+    python -m devtools.snmp_standin --port 11161 --check
+
+--check starts the agent, polls it through backend.snmp_stats and prints
+the result in the get_router_stats shape.
+"""
+import argparse
+import asyncio
+import bisect
+import os
+from pyasn1.codec.ber import decoder, encoder
+from pyasn1.type import univ
+from pysnmp.proto import api, rfc1902
+
+DEFAULT_RECORDING = os.path.join(os.path.dirname(__file__), "snmp", "public.snmprec")
+
+TYPES = {
+    "2": rfc1902.Integer32,
+    "4": rfc1902.OctetString,
+    "6": rfc1902.ObjectIdentifier,
+    "64": rfc1902.IpAddress,
+    "65": rfc1902.Counter32,
+    "66": rfc1902.Gauge32,
+    "67": rfc1902.TimeTicks,
+    "70": rfc1902.Counter64,
+}
+
+
+def load_recording(path):
+    records = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            oid, tag, value = line.split("|", 2)
+            syntax = TYPES[tag]
+            parsed = value if tag in ("4", "6", "64") else int(value)
+            records.append((univ.ObjectIdentifier(oid), syntax(parsed)))
+    records.sort(key=lambda r: r[0])
+    return records
+
+
+class StandinAgent(asyncio.DatagramProtocol):
+    def __init__(self, records, community):
+        self.oids = [oid for oid, _ in records]
+        self.values = [value for _, value in records]
+        self.community = community
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def _get(self, oid, pmod):
+        index = bisect.bisect_left(self.oids, oid)
+        if index < len(self.oids) and self.oids[index] == oid:
+            return oid, self.values[index]
+        return oid, pmod.NoSuchInstance()
+
+    def _next(self, oid, pmod):
+        index = bisect.bisect_right(self.oids, oid)
+        if index < len(self.oids):
+            return self.oids[index], self.values[index]
+        return oid, pmod.EndOfMibView()
+
+    def datagram_received(self, data, addr):
+        version = int(api.decodeMessageVersion(data))
+        if version != api.SNMP_VERSION_2C:
+            return
+        pmod = api.PROTOCOL_MODULES[version]
+        request, _ = decoder.decode(data, asn1Spec=pmod.Message())
+        if str(pmod.apiMessage.get_community(request)) != self.community:
+            return
+        request_pdu = pmod.apiMessage.get_pdu(request)
+        response = pmod.apiMessage.get_response(request)
+        response_pdu = pmod.apiMessage.get_pdu(response)
+        oids = [oid for oid, _ in pmod.apiPDU.get_varbinds(request_pdu)]
+
+        if request_pdu.isSameTypeWith(pmod.GetRequestPDU()):
+            var_binds = [self._get(oid, pmod) for oid in oids]
+        elif request_pdu.isSameTypeWith(pmod.GetNextRequestPDU()):
+            var_binds = [self._next(oid, pmod) for oid in oids]
+        elif request_pdu.isSameTypeWith(pmod.GetBulkRequestPDU()):
+            non_repeaters = int(pmod.apiBulkPDU.get_non_repeaters(request_pdu))
+            repetitions = int(pmod.apiBulkPDU.get_max_repetitions(request_pdu))
+            var_binds = [self._next(oid, pmod) for oid in oids[:non_repeaters]]
+            cursors = oids[non_repeaters:]
+            for _ in range(repetitions):
+                row = [self._next(oid, pmod) for oid in cursors]
+                var_binds.extend(row)
+                cursors = [oid for oid, _ in row]
+        else:
+            return
+
+        pmod.apiPDU.set_varbinds(response_pdu, var_binds)
+        self.transport.sendto(encoder.encode(response), addr)
+
+
+async def serve(path, host, port):
+    community = os.path.splitext(os.path.basename(path))[0]
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: StandinAgent(load_recording(path), community),
+        local_addr=(host, port)
+    )
+    return transport
+
+
+async def check(path, port):
+    from backend.snmp_stats import collect_many
+    transport = await serve(path, "127.0.0.1", port)
+    try:
+        community = os.path.splitext(os.path.basename(path))[0]
+        router = {'name': 'standin', 'ip': '127.0.0.1', 'snmp_port': port, 'snmp_community': community}
+        print((await collect_many([router]))['standin'])
+    finally:
+        transport.close()
+
+
+async def run_forever(path, host, port):
+    await serve(path, host, port)
+    print(f"SNMP stand-in serving {path} on {host}:{port}")
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recording", default=DEFAULT_RECORDING)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11161)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+    if args.check:
+        asyncio.run(check(args.recording, args.port))
+    else:
+        asyncio.run(run_forever(args.recording, args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
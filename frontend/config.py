@@ -1,17 +1,184 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QComboBox, QTableWidget, QTableWidgetItem, QHeaderView,
-    QScrollArea, QGroupBox, QMessageBox
+    QComboBox, QTreeView, QLineEdit, QGroupBox, QMessageBox,
+    QTabWidget, QTableView, QHeaderView
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
-from backend.config import get_router_list, get_running_config_sections
+from PyQt6.QtCore import Qt, QAbstractItemModel, QAbstractTableModel, QModelIndex, QTimer
+from PyQt6.QtGui import QFont, QColor, QBrush
+from backend.config import get_router_list, parse_config_tree
+from backend.config_diff import diff_configs, diff_summary
+from backend.config_backup import fetch_and_store, list_snapshots, load_snapshot, get_backup_scheduler
 import socket
 
+FETCH_BATCH = 500
+
+
+class ConfigTreeModel(QAbstractItemModel):
+    """Lazily populated tree model over a parsed ConfigTree"""
+
+    def __init__(self, tree=None, parent=None):
+        super().__init__(parent)
+        self.tree = tree
+        self.fetched = {}
+        self.matches = set()
+        self.current_match = None
+        self.section_font = QFont("Arial", 12, QFont.Weight.Bold)
+        self.line_font = QFont("Arial", 12)
+        self.match_brush = QBrush(QColor("#ffeaa7"))
+        self.current_brush = QBrush(QColor("#fdcb6e"))
+
+    def set_tree(self, tree):
+        self.beginResetModel()
+        self.tree = tree
+        self.fetched = {}
+        self.matches = set()
+        self.current_match = None
+        self.endResetModel()
+
+    def node_from_index(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self.tree.root if self.tree else None
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node_from_index(parent)
+        if node is None or row >= self.fetched.get(id(node), 0):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self.tree.root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = self.node_from_index(parent)
+        return self.fetched.get(id(node), 0) if node is not None else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self.node_from_index(parent)
+        return bool(node and node.children)
+
+    def canFetchMore(self, parent):
+        node = self.node_from_index(parent)
+        return bool(node) and self.fetched.get(id(node), 0) < len(node.children)
+
+    def fetchMore(self, parent):
+        node = self.node_from_index(parent)
+        self.fetch_rows(parent, node, self.fetched.get(id(node), 0) + FETCH_BATCH)
+
+    def fetch_rows(self, parent, node, upto):
+        """Expose children of node up to row upto"""
+        start = self.fetched.get(id(node), 0)
+        end = min(upto, len(node.children))
+        if end <= start:
+            return
+        self.beginInsertRows(parent, start, end - 1)
+        self.fetched[id(node)] = end
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return node.text
+        if role == Qt.ItemDataRole.FontRole:
+            return self.section_font if node.children else self.line_font
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if node.line_no == self.current_match:
+                return self.current_brush
+            if node.line_no in self.matches:
+                return self.match_brush
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return "Configuration"
+        return None
+
+    def index_for_line(self, line_no):
+        """Return the index for a config line, fetching its ancestors' rows as needed"""
+        node = self.tree.nodes[line_no]
+        chain = []
+        while node is not self.tree.root:
+            chain.append(node)
+            node = node.parent
+        index = QModelIndex()
+        for node in reversed(chain):
+            self.fetch_rows(index, node.parent, node.row + 1)
+            index = self.index(node.row, 0, index)
+        return index
+
+    def set_matches(self, matches, current=None):
+        """Highlighting is read in data(), so the view only needs a repaint"""
+        self.matches = set(matches)
+        self.current_match = current
+
+class DiffTableModel(QAbstractTableModel):
+    """Side-by-side view over a list of DiffRow"""
+
+    TAG_COLORS = {
+        "changed": "#ffeaa7",
+        "removed": "#fab1a0",
+        "added": "#55efc4",
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.headers = ["Left", "Right"]
+        self.brushes = {tag: QBrush(QColor(color)) for tag, color in self.TAG_COLORS.items()}
+        self.header_font = QFont("Arial", 12, QFont.Weight.Bold)
+
+    def set_diff(self, rows, left_title, right_title):
+        self.beginResetModel()
+        self.rows = rows
+        self.headers = [left_title, right_title]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 2
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        text = row.left if index.column() == 0 else row.right
+        if role == Qt.ItemDataRole.DisplayRole:
+            return "    " * row.depth + text if text else ""
+        if role == Qt.ItemDataRole.BackgroundRole and text:
+            return self.brushes.get(row.tag)
+        if role == Qt.ItemDataRole.FontRole and row.depth == 0:
+            return self.header_font
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return None
+
+
 class ConfigPage(QWidget):
     def __init__(self, stacked_widget=None):
         super().__init__()
         self.stacked_widget = stacked_widget
+        self.current_tree = None
+        self.current_router = None
+        self.current_hash = None  # snapshot stored by the last fetch
+        self.previous_trees = {}
+        self.routers = []
         self.setup_ui()
         self.apply_styles()
         self.load_routers()
@@ -42,7 +209,13 @@ class ConfigPage(QWidget):
                 color: white;
             }
             QPushButton:hover { background-color: #0984e3; }
-            QTableWidget {
+            QLineEdit {
+                border: 1px solid #74b9ff;
+                border-radius: 5px;
+                padding: 8px;
+                font-size: 14px;
+            }
+            QTreeView, QTableView {
                 background-color: white;
                 border: 1px solid #dcdde1;
             }
@@ -51,7 +224,6 @@ class ConfigPage(QWidget):
                 color: white;
                 padding: 8px;
             }
-            QTableWidget::item { padding: 8px; border-bottom: 1px solid #dcdde1; }
         """)
 
     def setup_ui(self):
@@ -75,26 +247,81 @@ class ConfigPage(QWidget):
         self.fetch_btn = QPushButton("Fetch Configuration")
         self.fetch_btn.setFixedHeight(40)
         self.fetch_btn.clicked.connect(self.fetch_configuration)
+        self.backup_btn = QPushButton("Backup All Routers")
+        self.backup_btn.setFixedHeight(40)
+        self.backup_btn.clicked.connect(self.backup_all)
         router_layout.addWidget(self.router_selector, 4)
         router_layout.addWidget(self.fetch_btn, 1)
+        router_layout.addWidget(self.backup_btn, 1)
         router_group.setLayout(router_layout)
         main_layout.addWidget(router_group)
 
-        # Configuration Table
+        # Configuration Tree
         table_group = QGroupBox("Configuration Details")
         table_layout = QVBoxLayout()
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        self.table = QTableWidget()
-        self.table.setColumnCount(2)
-        self.table.setHorizontalHeaderLabels(["Section", "Configuration"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table.verticalHeader().setVisible(False)
-        scroll.setWidget(self.table)
-        table_layout.addWidget(scroll)
+
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search configuration...")
+        self.search_input.textChanged.connect(self.schedule_search)
+        self.search_input.returnPressed.connect(self.next_match)
+        self.match_label = QLabel("")
+        prev_btn = QPushButton("Previous")
+        prev_btn.clicked.connect(self.previous_match)
+        next_btn = QPushButton("Next")
+        next_btn.clicked.connect(self.next_match)
+        search_layout.addWidget(self.search_input, 4)
+        search_layout.addWidget(self.match_label, 1)
+        search_layout.addWidget(prev_btn)
+        search_layout.addWidget(next_btn)
+        table_layout.addLayout(search_layout)
+
+        # Debounce keystrokes so large configs are searched once per pause
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+
+        self.model = ConfigTreeModel()
+        self.tree_view = QTreeView()
+        self.tree_view.setModel(self.model)
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.setFont(QFont("Arial", 12))
+
+        # Comparison against the previous fetch or another router
+        compare_layout = QHBoxLayout()
+        self.compare_selector = QComboBox()
+        self.compare_btn = QPushButton("Compare")
+        self.compare_btn.clicked.connect(self.compare_configuration)
+        self.diff_label = QLabel("")
+        compare_layout.addWidget(QLabel("Compare with:"))
+        compare_layout.addWidget(self.compare_selector, 3)
+        compare_layout.addWidget(self.compare_btn)
+        compare_layout.addWidget(self.diff_label, 2)
+
+        self.diff_model = DiffTableModel()
+        self.diff_view = QTableView()
+        self.diff_view.setModel(self.diff_model)
+        self.diff_view.verticalHeader().setVisible(False)
+        self.diff_view.verticalHeader().setDefaultSectionSize(28)
+        self.diff_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.diff_view.setFont(QFont("Arial", 12))
+
+        diff_page = QWidget()
+        diff_layout = QVBoxLayout(diff_page)
+        diff_layout.addLayout(compare_layout)
+        diff_layout.addWidget(self.diff_view)
+
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.tree_view, "Configuration")
+        self.tabs.addTab(diff_page, "Differences")
+        table_layout.addWidget(self.tabs)
         table_group.setLayout(table_layout)
         main_layout.addWidget(table_group)
 
+        self.matches = []
+        self.match_pos = -1
+
         # Navigation
         back_btn = QPushButton("Back")
         back_btn.clicked.connect(self.close)
@@ -116,16 +343,53 @@ class ConfigPage(QWidget):
 
     def load_routers(self):
         self.router_selector.clear()
-        routers = get_router_list()
-        if not routers:
+        self.routers = get_router_list()
+        self.load_compare_targets()
+        if not self.routers:
             QMessageBox.warning(self, "Warning", "No configured routers found")
             return
-        for router in routers:
+        for router in self.routers:
             self.router_selector.addItem(
                 f"{router['name']} ({router['ip']})",
                 userData=router
             )
 
+    def load_compare_targets(self):
+        """Previous fetch, other routers and stored snapshots of the current router"""
+        self.compare_selector.clear()
+        self.compare_selector.addItem("Previous fetch", userData=None)
+        for router in self.routers:
+            self.compare_selector.addItem(
+                f"{router['name']} ({router['ip']})",
+                userData=router
+            )
+        if self.current_router is None:
+            return
+        try:
+            snapshots = list_snapshots(self.current_router['name'], changed_only=True)
+        except Exception as e:
+            print(f"Snapshot history error: {e}")
+            return
+        # The newest change is usually the fetch on screen; diffing it with itself shows nothing
+        snapshots = [snapshot for snapshot in snapshots if snapshot['hash'] != self.current_hash]
+        for snapshot in snapshots:
+            self.compare_selector.addItem(
+                f"Snapshot {snapshot['timestamp']:%Y-%m-%d %H:%M:%S} ({snapshot['hash'][:10]})",
+                userData=snapshot
+            )
+        if snapshots and self.current_router['ip'] not in self.previous_trees:
+            # No earlier fetch this session: default to the last stored change
+            self.compare_selector.setCurrentIndex(1 + len(self.routers))
+
+    def backup_all(self):
+        scheduler = get_backup_scheduler()
+        if scheduler.running:
+            QMessageBox.information(self, "Backup", "A backup run is already in progress")
+            return
+        scheduler.run_now()
+        QMessageBox.information(self, "Backup",
+            "Backup of all routers started in the background")
+
     def fetch_configuration(self):
         if not self.router_selector.currentData():
             QMessageBox.warning(self, "Warning", "Please select a router first")
@@ -134,20 +398,96 @@ class ConfigPage(QWidget):
         try:
             router = self.router_selector.currentData()
             user_ip = self.get_user_ip()
-            sections = get_running_config_sections(router, user_ip)
-            self.populate_table(sections)
+            entry, config = fetch_and_store(router, user_ip)
+            tree = parse_config_tree(config)
+            if self.current_tree is not None:
+                self.previous_trees[self.current_router['ip']] = self.current_tree
+            self.current_tree = tree
+            self.current_router = router
+            self.current_hash = entry['hash'] if entry else None
+            self.populate_tree(tree)
+            self.load_compare_targets()
         except Exception as e:
             QMessageBox.critical(self, "Error", 
                 f"Failed to retrieve configuration:\n{str(e)}")
 
-    def populate_table(self, sections):
-        self.table.setRowCount(0)
-        for row, (section, config) in enumerate(sections.items()):
-            self.table.insertRow(row)
-            section_item = QTableWidgetItem(section)
-            section_item.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-            config_item = QTableWidgetItem(config)
-            config_item.setFont(QFont("Arial", 12))
-            self.table.setItem(row, 0, section_item)
-            self.table.setItem(row, 1, config_item)
-            self.table.resizeRowToContents(row)
\ No newline at end of file
+    def populate_tree(self, tree):
+        self.model.set_tree(tree)
+        self.matches = []
+        self.match_pos = -1
+        if self.search_input.text():
+            self.run_search()
+
+    def compare_configuration(self):
+        if self.current_tree is None:
+            QMessageBox.warning(self, "Warning", "Fetch a configuration first")
+            return
+
+        target = self.compare_selector.currentData()
+        try:
+            if target is None:
+                other = self.previous_trees.get(self.current_router['ip'])
+                if other is None:
+                    QMessageBox.information(self, "Info",
+                        "No earlier fetch of this router to compare with")
+                    return
+                left_title = f"{self.current_router['name']} (previous)"
+            elif 'hash' in target:
+                other = parse_config_tree(load_snapshot(target['hash']))
+                left_title = f"{target['router']} ({target['timestamp']:%Y-%m-%d %H:%M})"
+            else:
+                _, config = fetch_and_store(target, self.get_user_ip())
+                other = parse_config_tree(config)
+                left_title = target['name']
+        except Exception as e:
+            QMessageBox.critical(self, "Error",
+                f"Failed to retrieve configuration:\n{str(e)}")
+            return
+
+        rows = diff_configs(other, self.current_tree)
+        self.diff_model.set_diff(rows, left_title, f"{self.current_router['name']} (current)")
+        summary = diff_summary(rows)
+        if rows:
+            self.diff_label.setText(
+                f"{summary['changed']} changed, {summary['removed']} removed, {summary['added']} added"
+            )
+        else:
+            self.diff_label.setText("Configurations are identical")
+        self.tabs.setCurrentIndex(1)
+
+    def schedule_search(self):
+        self.search_timer.start()
+
+    def run_search(self):
+        if self.model.tree is None:
+            return
+        self.matches = self.model.tree.search(self.search_input.text())
+        self.match_pos = -1
+        self.model.set_matches(self.matches)
+        if self.matches:
+            self.next_match()
+        else:
+            self.match_label.setText("No matches" if self.search_input.text() else "")
+            self.tree_view.viewport().update()
+
+    def next_match(self):
+        self.goto_match(1)
+
+    def previous_match(self):
+        self.goto_match(-1)
+
+    def goto_match(self, step):
+        if not self.matches:
+            return
+        self.match_pos = (self.match_pos + step) % len(self.matches)
+        line_no = self.matches[self.match_pos]
+        self.model.set_matches(self.matches, line_no)
+        index = self.model.index_for_line(line_no)
+        parent = index.parent()
+        while parent.isValid():
+            self.tree_view.expand(parent)
+            parent = parent.parent()
+        self.tree_view.setCurrentIndex(index)
+        self.tree_view.scrollTo(index)
+        self.tree_view.viewport().update()
+        self.match_label.setText(f"{self.match_pos + 1} of {len(self.matches)}")
\ No newline at end of file
@@ -2,7 +2,8 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
                             QComboBox, QLineEdit, QMessageBox, QGroupBox, QFormLayout)
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
-from backend.implement_bgp import configure_bgp, delete_bgp_config, load_routers
+from backend.implement_bgp import load_routers
+from frontend.jobs_page import queue_job
 
 class ImplementBGPPage(QWidget):
     def __init__(self, stacked_widget=None):
@@ -151,7 +152,7 @@ class ImplementBGPPage(QWidget):
 
         try:
             # Include VPNv4 parameters in the configuration call
-            response = configure_bgp(
+            queue_job(self, "configure_bgp", dict(
                 router=selected_router,
                 bgp_type=self.bgp_type.currentText(),
                 local_asn=self.local_asn_input.text(),
@@ -161,13 +162,7 @@ class ImplementBGPPage(QWidget):
                 mask=self.subnet_mask_input.text(),
                 vpn_local_asn=self.vpn_local_asn.text(),
                 vpn_neighbor_ip=self.vpn_neighbor_ip.text()
-            )
-            
-            if response["success"]:
-                QMessageBox.information(self, "Success", "BGP configuration applied successfully!")
-            else:
-                QMessageBox.critical(self, "Error", f"Failed: {response['error']}")
-                
+            ))
         except Exception as e:
             QMessageBox.critical(self, "Exception", f"Error: {str(e)}")
 
@@ -191,16 +186,11 @@ class ImplementBGPPage(QWidget):
             )
             
             if confirm == QMessageBox.StandardButton.Yes:
-                response = delete_bgp_config(
+                queue_job(self, "delete_bgp_config", dict(
                     router=selected_router,
                     local_asn=local_asn
-                )
-                
-                if response["success"]:
-                    QMessageBox.information(self, "Success", "BGP configuration deleted successfully!")
-                else:
-                    QMessageBox.critical(self, "Error", f"Failed: {response['error']}")
-                
+                ))
+
         except Exception as e:
             QMessageBox.critical(self, "Exception", f"Error: {str(e)}")
 
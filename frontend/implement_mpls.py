@@ -4,7 +4,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
-from backend.implement_mpls import load_routers, show_interfaces, configure_mpls, delete_mpls_config
+from backend.implement_mpls import load_routers, show_interfaces
+from frontend.jobs_page import queue_job
 
 class MPLSPage(QWidget):
     def __init__(self, stacked_widget=None):
@@ -163,16 +164,10 @@ class MPLSPage(QWidget):
             return
         
         try:
-            response = configure_mpls(selected_router, selected_interfaces)
-            if response["success"]:
-                QMessageBox.information(self, "Success", 
-                    f"MPLS configured successfully on {selected_router['name']}!\n"
-                    f"Interfaces: {', '.join(selected_interfaces)}\n"
-                    f"Output:\n{response['output']}")
-            else:
-                QMessageBox.critical(self, "Error", 
-                    f"Configuration failed:\n{response['error']}")
-                
+            queue_job(self, "configure_mpls",
+                      dict(router=selected_router, interfaces=selected_interfaces),
+                      f"Apply MPLS on {selected_router['name']} ({', '.join(selected_interfaces)})")
+
         except Exception as e:
             QMessageBox.critical(self, "Exception", f"An error occurred: {str(e)}")
 
@@ -195,15 +190,9 @@ class MPLSPage(QWidget):
         
         if confirm == QMessageBox.StandardButton.Yes:
             try:
-                response = delete_mpls_config(selected_router, selected_interfaces)
-                if response["success"]:
-                    QMessageBox.information(self, "Success", 
-                        f"MPLS removed successfully on {selected_router['name']}!\n"
-                        f"Interfaces: {', '.join(selected_interfaces)}\n"
-                        f"Output:\n{response['output']}")
-                else:
-                    QMessageBox.critical(self, "Error", 
-                        f"Deletion failed:\n{response['error']}")
-                        
+                queue_job(self, "delete_mpls_config",
+                          dict(router=selected_router, interfaces=selected_interfaces),
+                          f"Delete MPLS on {selected_router['name']} ({', '.join(selected_interfaces)})")
+
             except Exception as e:
                 QMessageBox.critical(self, "Exception", f"An error occurred: {str(e)}")
\ No newline at end of file
@@ -4,7 +4,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
-from backend.isis import load_routers, apply_isis_configuration, delete_isis_configuration
+from backend.isis import load_routers, validate_net, validate_area
+from frontend.jobs_page import queue_job
 
 class ISISConfig(QWidget):
     def __init__(self, stacked_widget=None):
@@ -148,11 +149,16 @@ class ISISConfig(QWidget):
             QMessageBox.warning(self, "Error", "NET and Area fields are required!")
             return
 
-        result = apply_isis_configuration(router_name, net, area, level)
-        if result["status"] == "success":
-            QMessageBox.information(self, "Success", "IS-IS configuration applied successfully!")
-        else:
-            QMessageBox.critical(self, "Error", f"Failed to apply configuration:\n{result['message']}")
+        if not validate_net(net):
+            QMessageBox.warning(self, "Error", "Invalid NET format. Use 49.XXXX.XXXX.XXXX.XXXX.XX")
+            return
+        if not validate_area(area):
+            QMessageBox.warning(self, "Error", "Invalid Area ID format. Use 49.XXXX")
+            return
+
+        queue_job(self, "apply_isis_configuration",
+                  dict(router_name=router_name, net=net, area=area, level=level),
+                  f"Apply IS-IS area {area} on {router_name}")
 
     def delete_config(self):
         router_name = self.router_selector.currentText()
@@ -164,6 +170,9 @@ class ISISConfig(QWidget):
         if not area:
             QMessageBox.warning(self, "Error", "Area field is required for deletion!")
             return
+        if not validate_area(area):
+            QMessageBox.warning(self, "Error", "Invalid Area ID format. Use 49.XXXX")
+            return
 
         confirm = QMessageBox.question(
             self, "Confirm Deletion",
@@ -172,8 +181,6 @@ class ISISConfig(QWidget):
         )
         
         if confirm == QMessageBox.StandardButton.Yes:
-            result = delete_isis_configuration(router_name, area)
-            if result["status"] == "success":
-                QMessageBox.information(self, "Success", "IS-IS configuration removed successfully!")
-            else:
-                QMessageBox.critical(self, "Error", f"Failed to remove configuration:\n{result['message']}")
\ No newline at end of file
+            queue_job(self, "delete_isis_configuration",
+                      dict(router_name=router_name, area=area),
+                      f"Delete IS-IS area {area} on {router_name}")
\ No newline at end of file
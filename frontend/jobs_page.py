@@ -0,0 +1,221 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QComboBox, QTableWidget, QTableWidgetItem, QHeaderView,
+    QProgressBar, QMessageBox, QSpinBox, QPlainTextEdit, QGroupBox
+)
+from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtCore import Qt, QTimer
+from backend.jobs import (
+    submit_job, cancel_job, get_job, list_jobs, clear_finished_jobs, get_job_queue,
+    QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED, FINISHED_STATES
+)
+
+STATE_FILTERS = {
+    "All jobs": None,
+    "Active": [QUEUED, RUNNING],
+    "Failed": [FAILED],
+    "Finished": list(FINISHED_STATES),
+}
+STATE_COLORS = {QUEUED: "#636e72", RUNNING: "#0984e3", SUCCEEDED: "#00b894",
+                FAILED: "#d63031", CANCELLED: "#fdcb6e"}
+REFRESH_INTERVAL = 2000  # ms
+
+def queue_job(parent, handler, kwargs, description=""):
+    """Submit a deployment job from a config page and tell the user where to follow it"""
+    get_job_queue().start()
+    job_id = submit_job(handler, kwargs, description)
+    if job_id is None:
+        QMessageBox.critical(parent, "Error", "Could not queue the job: the database is unavailable.")
+        return None
+    QMessageBox.information(
+        parent, "Job Queued",
+        "The change was queued as a deployment job.\n"
+        "Follow its progress under 'Deployment Jobs' on the dashboard."
+    )
+    return job_id
+
+class JobsPage(QWidget):
+    def __init__(self, stacked_widget=None):
+        super().__init__()
+        self.stacked_widget = stacked_widget
+        self.queue = get_job_queue()
+        self.job_ids = []
+        self.selected_job = None
+        self.setWindowTitle("Deployment Jobs")
+        self.setMinimumSize(1200, 700)
+        self.setup_ui()
+        self.apply_styles()
+        self.load_jobs()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.load_jobs)
+        self.refresh_timer.start(REFRESH_INTERVAL)
+
+    def apply_styles(self):
+        self.setStyleSheet("""
+            QWidget { background-color: #f5f6fa; color: #2d3436; }
+            QComboBox, QPushButton, QSpinBox {
+                border: 1px solid #74b9ff;
+                border-radius: 5px;
+                padding: 8px;
+                font-size: 14px;
+            }
+            QPushButton {
+                background-color: #74b9ff;
+                color: white;
+            }
+            QPushButton:hover { background-color: #0984e3; }
+            QTableWidget {
+                background-color: white;
+                border: 1px solid #dcdde1;
+            }
+            QGroupBox {
+                border: 2px solid #74b9ff;
+                border-radius: 10px;
+                margin-top: 1ex;
+                padding-top: 10px;
+            }
+            QGroupBox::title {
+                color: #0984e3;
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 3px;
+            }
+            QPlainTextEdit {
+                background-color: #2d3436;
+                color: #dfe6e9;
+                font-family: monospace;
+            }
+            QHeaderView::section {
+                background-color: #74b9ff;
+                color: white;
+                padding: 8px;
+            }
+        """)
+
+    def setup_ui(self):
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(30, 30, 30, 30)
+        main_layout.setSpacing(20)
+
+        header = QLabel("Deployment Jobs")
+        header.setFont(QFont("Arial", 24, QFont.Weight.Bold))
+        header.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        header.setStyleSheet("color: #0984e3; margin-bottom: 20px;")
+        main_layout.addWidget(header)
+
+        controls = QHBoxLayout()
+        self.state_selector = QComboBox()
+        self.state_selector.addItems(STATE_FILTERS.keys())
+        self.state_selector.currentTextChanged.connect(self.load_jobs)
+        controls.addWidget(self.state_selector)
+        controls.addStretch()
+        controls.addWidget(QLabel("Workers:"))
+        self.workers_input = QSpinBox()
+        self.workers_input.setRange(1, 32)
+        self.workers_input.setValue(self.queue.workers)
+        self.workers_input.setToolTip("Jobs run at once")
+        self.workers_input.valueChanged.connect(self.change_workers)
+        controls.addWidget(self.workers_input)
+        clear_btn = QPushButton("Clear Finished")
+        clear_btn.clicked.connect(self.clear_finished)
+        controls.addWidget(clear_btn)
+        main_layout.addLayout(controls)
+
+        self.jobs_table = QTableWidget()
+        self.jobs_table.setColumnCount(7)
+        self.jobs_table.setHorizontalHeaderLabels(
+            ["Created", "Job", "State", "Progress", "Status", "Attempts", ""]
+        )
+        self.jobs_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.jobs_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.jobs_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.jobs_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.jobs_table.itemSelectionChanged.connect(self.select_job)
+        main_layout.addWidget(self.jobs_table, stretch=2)
+
+        # Command-by-command output of the selected job, streamed while it runs
+        output_group = QGroupBox("Device Output")
+        output_layout = QVBoxLayout()
+        self.output_view = QPlainTextEdit()
+        self.output_view.setReadOnly(True)
+        output_layout.addWidget(self.output_view)
+        output_group.setLayout(output_layout)
+        main_layout.addWidget(output_group, stretch=1)
+
+        self.status_label = QLabel("")
+        main_layout.addWidget(self.status_label)
+
+        back_btn = QPushButton("Back")
+        back_btn.clicked.connect(self.close)
+        main_layout.addWidget(back_btn)
+
+        self.setLayout(main_layout)
+
+    def load_jobs(self):
+        jobs = list_jobs(STATE_FILTERS[self.state_selector.currentText()])
+        self.job_ids = [str(job['_id']) for job in jobs]
+        self.jobs_table.blockSignals(True)
+        self.jobs_table.setUpdatesEnabled(False)
+        self.jobs_table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            self.jobs_table.setItem(row, 0, QTableWidgetItem(job['created'].strftime("%Y-%m-%d %H:%M:%S")))
+            self.jobs_table.setItem(row, 1, QTableWidgetItem(job.get('description', job['handler'])))
+            state_item = QTableWidgetItem(job['state'])
+            state_item.setForeground(QColor(STATE_COLORS.get(job['state'], "#2d3436")))
+            self.jobs_table.setItem(row, 2, state_item)
+
+            progress = self.jobs_table.cellWidget(row, 3)
+            if progress is None:
+                progress = QProgressBar()
+                self.jobs_table.setCellWidget(row, 3, progress)
+            progress.setValue(job.get('progress', 0))
+
+            status = job.get('error') or job.get('message', '')
+            status_item = QTableWidgetItem(status)
+            status_item.setToolTip(status)
+            self.jobs_table.setItem(row, 4, status_item)
+            self.jobs_table.setItem(row, 5, QTableWidgetItem(str(job.get('attempts', 0))))
+
+            if job['state'] in (QUEUED, RUNNING) and not job.get('cancel_requested'):
+                cancel_btn = QPushButton("Cancel")
+                cancel_btn.clicked.connect(lambda _, job_id=str(job['_id']): self.cancel(job_id))
+                self.jobs_table.setCellWidget(row, 6, cancel_btn)
+            else:
+                self.jobs_table.removeCellWidget(row, 6)
+        if self.selected_job in self.job_ids:
+            self.jobs_table.selectRow(self.job_ids.index(self.selected_job))
+        self.jobs_table.setUpdatesEnabled(True)
+        self.jobs_table.blockSignals(False)
+        self.show_output()
+
+        active = sum(job['state'] in (QUEUED, RUNNING) for job in jobs)
+        queue_state = "running" if self.queue.running else "stopped"
+        self.status_label.setText(f"{len(jobs)} jobs shown, {active} active - worker pool {queue_state}")
+
+    def select_job(self):
+        row = self.jobs_table.currentRow()
+        self.selected_job = self.job_ids[row] if 0 <= row < len(self.job_ids) else None
+        self.show_output()
+
+    def show_output(self):
+        job = get_job(self.selected_job) if self.selected_job else None
+        text = "".join(job.get('output', [])) if job else ""
+        if text != self.output_view.toPlainText():
+            self.output_view.setPlainText(text)
+            scrollbar = self.output_view.verticalScrollBar()
+            scrollbar.setValue(scrollbar.maximum())
+
+    def cancel(self, job_id):
+        if not cancel_job(job_id):
+            QMessageBox.information(self, "Cancel", "The job already finished.")
+        self.load_jobs()
+
+    def change_workers(self, value):
+        self.queue.set_workers(value)
+
+    def clear_finished(self):
+        removed = clear_finished_jobs()
+        self.status_label.setText(f"Removed {removed} finished jobs")
+        self.load_jobs()
@@ -1,11 +1,13 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea,
     QLineEdit, QPushButton, QMessageBox, QGroupBox, QFormLayout,
-    QFrame, QGridLayout
+    QFrame, QGridLayout, QComboBox
 )
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
-from backend.manage_equipment import get_routers, add_router, delete_router
+from backend.manage_equipment import get_routers, add_router, delete_router, set_stats_backend
+
+STATS_BACKENDS = [("SSH (CLI)", "ssh"), ("SNMP", "snmp")]
 
 class EquipmentManager(QWidget):
     def __init__(self, stacked_widget=None):
@@ -29,7 +31,7 @@ class EquipmentManager(QWidget):
                 margin-top: 1ex;
                 padding: 15px;
             }
-            QLineEdit {
+            QLineEdit, QComboBox {
                 border: 1px solid #74b9ff;
                 border-radius: 5px;
                 padding: 8px;
@@ -101,11 +103,16 @@ class EquipmentManager(QWidget):
         self.user_input = QLineEdit()
         self.pass_input = QLineEdit()
         self.pass_input.setEchoMode(QLineEdit.EchoMode.Password)
+        self.backend_input = self.create_backend_selector()
+        self.community_input = QLineEdit()
+        self.community_input.setPlaceholderText("public")
 
         layout.addRow(QLabel("Name:"), self.name_input)
         layout.addRow(QLabel("IP Address:"), self.ip_input)
         layout.addRow(QLabel("Username:"), self.user_input)
         layout.addRow(QLabel("Password:"), self.pass_input)
+        layout.addRow(QLabel("Stats Backend:"), self.backend_input)
+        layout.addRow(QLabel("SNMP Community:"), self.community_input)
 
         add_btn = QPushButton("Add Router")
         add_btn.clicked.connect(self.add_router)
@@ -164,10 +171,31 @@ class EquipmentManager(QWidget):
         info_layout = QVBoxLayout()
         info_layout.addWidget(self.create_info_label("Name", router['name']))
         info_layout.addWidget(self.create_info_label("IP", router['ip']))
+
+        backend_layout = QHBoxLayout()
+        backend_selector = self.create_backend_selector(router.get('stats_backend', 'ssh'))
+        backend_selector.currentIndexChanged.connect(
+            lambda _, name=router['name'], selector=backend_selector:
+                self.change_stats_backend(name, selector.currentData())
+        )
+        backend_layout.addWidget(QLabel("Stats:"))
+        backend_layout.addWidget(backend_selector)
         
         layout.addLayout(info_layout)
+        layout.addLayout(backend_layout)
         return card
 
+    def create_backend_selector(self, current="ssh"):
+        selector = QComboBox()
+        for label, value in STATS_BACKENDS:
+            selector.addItem(label, userData=value)
+        selector.setCurrentIndex(selector.findData(current))
+        return selector
+
+    def change_stats_backend(self, name, backend):
+        if not set_stats_backend(name, backend):
+            QMessageBox.critical(self, "Error", f"Failed to update stats backend for {name}!")
+
     def create_info_label(self, title, value):
         label = QLabel(f"<b>{title}:</b> {value}")
         label.setStyleSheet("font-size: 14px; color: #2d3436;")
@@ -190,6 +218,10 @@ class EquipmentManager(QWidget):
         if not all(router_data.values()):
             QMessageBox.warning(self, "Error", "All fields are required!")
             return
+
+        router_data["stats_backend"] = self.backend_input.currentData()
+        if self.community_input.text().strip():
+            router_data["snmp_community"] = self.community_input.text().strip()
             
         if add_router(router_data):
             self.load_routers()
@@ -223,4 +255,6 @@ class EquipmentManager(QWidget):
         self.name_input.clear()
         self.ip_input.clear()
         self.user_input.clear()
-        self.pass_input.clear()
\ No newline at end of file
+        self.pass_input.clear()
+        self.community_input.clear()
+        self.backend_input.setCurrentIndex(0)
\ No newline at end of file
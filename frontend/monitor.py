@@ -1,7 +1,8 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, 
     QListWidget, QFrame, QGridLayout, QPushButton, QGroupBox, 
-    QMessageBox, QInputDialog, QLineEdit, QStackedWidget
+    QMessageBox, QInputDialog, QLineEdit, QStackedWidget,
+    QTableWidget, QTableWidgetItem, QHeaderView
 )
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
@@ -9,9 +10,20 @@ from backend.monitor import fetch_routers, validate_router_credentials, handle_l
 from frontend.stats_page import StatsWindow
 from frontend.modify import ModifyPage
 from frontend.manage_equipment import EquipmentManager
+from frontend.search_page import ConfigSearchPage
+from frontend.timeline_page import EventTimelinePage
+from frontend.jobs_page import JobsPage
+from backend.config_backup import get_backup_scheduler
+from backend.metrics_store import get_metrics_store
+from backend.syslog_receiver import get_syslog_receiver
+from backend.collector import connect_live_view
+from backend.jobs import get_job_queue
+from backend.resilience import CLOSED
 from datetime import datetime
 from bson import ObjectId
 
+BADGE_COLORS = {"critical": "#d63031", "warning": "#e17055"}
+
 class LogEntrySection(QGroupBox):
     def __init__(self, log_data, parent=None):
         super().__init__(parent)
@@ -76,6 +88,60 @@ class LogEntrySection(QGroupBox):
             return "N/A"
         return "\n".join([f"{n.get('network', '?')}/{n.get('mask', '?')} (Area {n.get('area', '?')})" for n in networks])
 
+def format_bps(value):
+    for unit, scale in (("Gb/s", 1e9), ("Mb/s", 1e6), ("kb/s", 1e3)):
+        if value >= scale:
+            return f"{value / scale:.1f} {unit}"
+    return f"{value:.0f} b/s"
+
+class TopInterfacesPanel(QGroupBox):
+    """Busiest interfaces across all routers, fed by the fleet poller"""
+    COLUMNS = ["Router", "Interface", "In", "Out", "Utilization", "Errors/s", "Drops/s"]
+
+    def __init__(self, live_view, count=10, parent=None):
+        super().__init__("Top Interfaces", parent)
+        self.live_view = live_view
+        self.count = count
+        self.setup_ui()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(5000)
+
+    def setup_ui(self):
+        self.setStyleSheet("""
+            QGroupBox {
+                background-color: #ffffff;
+                border: 2px solid #74b9ff;
+                border-radius: 10px;
+                margin-top: 1ex;
+                font-size: 14px;
+                color: #0984e3;
+            }
+            QTableWidget { border: none; color: #2d3436; }
+        """)
+        layout = QVBoxLayout()
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setMaximumHeight(260)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+    def refresh(self):
+        rows = self.live_view.top_interfaces(self.count)
+        self.table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            values = [
+                row['router'], row['interface'],
+                format_bps(row['in_bps']), format_bps(row['out_bps']),
+                f"{row['utilization']:.1f}%",
+                f"{row['errors_per_sec']:.2f}", f"{row['drops_per_sec']:.2f}"
+            ]
+            for column, value in enumerate(values):
+                self.table.setItem(i, column, QTableWidgetItem(value))
+
 class RouterCard(QGroupBox):
     status_requested = pyqtSignal(dict)
 
@@ -100,6 +166,13 @@ class RouterCard(QGroupBox):
         title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
         title.setStyleSheet("color: #0984e3;")
 
+        # Reachability dot and latency from the probe engine
+        self.reachability_label = QLabel("● probing...")
+        self.reachability_label.setStyleSheet("color: #b2bec3; font-size: 13px;")
+        self.breaker_label = QLabel()
+        self.breaker_label.setStyleSheet("color: #d63031; font-size: 12px;")
+        self.breaker_label.hide()
+
         status_btn = QPushButton("View Statistics")
         status_btn.setStyleSheet("""
             QPushButton {
@@ -112,11 +185,74 @@ class RouterCard(QGroupBox):
         """)
         status_btn.clicked.connect(self.on_status_clicked)
 
+        self.stats_label = QLabel("CPU: --   Memory: --")
+        self.stats_label.setStyleSheet("color: #636e72; font-size: 13px;")
+
+        # Active alerts for this router, filled by refresh_stats
+        self.badge_layout = QHBoxLayout()
+        self.badge_layout.setSpacing(4)
+
         layout.addWidget(title)
+        layout.addWidget(self.reachability_label)
+        layout.addWidget(self.breaker_label)
         layout.addWidget(QLabel(f"IP Address: {self.router_data['ip']}"))
+        layout.addWidget(self.stats_label)
+        layout.addLayout(self.badge_layout)
         layout.addWidget(status_btn)
         self.setLayout(layout)
 
+    def refresh_stats(self, store, live_view):
+        """Show the latest polled values from the shared metrics store"""
+        cpu = store.latest(self.router_data['name'], 'cpu')
+        memory = store.latest(self.router_data['name'], 'memory')
+        cpu_text = f"{cpu:.1f}%" if cpu is not None else "--"
+        memory_text = f"{memory:.1f}%" if memory is not None else "--"
+        self.stats_label.setText(f"CPU: {cpu_text}   Memory: {memory_text}")
+        self.show_alerts(live_view.active_alerts(self.router_data['name']))
+        self.show_reachability(live_view.probe_state(self.router_data['ip']))
+        self.show_breaker(live_view.breaker(self.router_data['ip']))
+
+    def show_breaker(self, breaker):
+        """SSH circuit breaker state, shown only while it is not closed"""
+        if breaker is None or breaker['state'] == CLOSED:
+            self.breaker_label.hide()
+            return
+        self.breaker_label.setText(
+            f"SSH circuit {breaker['state']} ({breaker['failures']} failures, "
+            f"retry in {breaker['retry_in']:.0f}s)"
+        )
+        self.breaker_label.setToolTip(breaker['last_error'])
+        self.breaker_label.show()
+
+    def show_reachability(self, state):
+        if state is None or state.reachable is None:
+            text, color = "● probing...", "#b2bec3"
+        elif state.rtt_ms is not None:
+            text, color = f"● reachable ({state.rtt_ms:.1f} ms)", "#00b894"
+        elif state.reachable:
+            text, color = "● no reply to last probe", "#fdcb6e"
+        else:
+            text, color = f"● unreachable ({state.error or 'no response'})", "#d63031"
+        self.reachability_label.setText(text)
+        self.reachability_label.setStyleSheet(f"color: {color}; font-size: 13px;")
+
+    def show_alerts(self, alerts):
+        while self.badge_layout.count():
+            item = self.badge_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+        for label, severity in alerts:
+            badge = QLabel(label)
+            badge.setStyleSheet(f"""
+                background-color: {BADGE_COLORS.get(severity, '#fdcb6e')};
+                color: white;
+                border-radius: 8px;
+                padding: 2px 8px;
+                font-size: 12px;
+            """)
+            self.badge_layout.addWidget(badge)
+        self.badge_layout.addStretch()
+
     def on_status_clicked(self):
         if validate_router_credentials(self.router_data):
             self.status_requested.emit(self.router_data)
@@ -124,6 +260,77 @@ class RouterCard(QGroupBox):
             QMessageBox.warning(self, "Invalid Credentials", 
                               "Missing required router credentials")
 
+class LiveSyslogPanel(QGroupBox):
+    """Most recent syslog messages pushed by the receiver"""
+    batch_received = pyqtSignal(list)
+    MAX_ITEMS = 200
+
+    def __init__(self, parent=None):
+        super().__init__("Live Syslog", parent)
+        self.receiver = get_syslog_receiver()
+        self.setup_ui()
+        # The receiver calls listeners from its own thread; the signal hands
+        # each batch over to the GUI thread
+        self.batch_received.connect(self.show_batch)
+        self._listener = self.batch_received.emit  # one bound object, so detach() can remove it
+        self.receiver.listeners.append(self._listener)
+        self.update_button()
+
+    def setup_ui(self):
+        self.setStyleSheet("""
+            QGroupBox {
+                background-color: #ffffff;
+                border: 2px solid #74b9ff;
+                border-radius: 10px;
+                margin-top: 1ex;
+                font-size: 14px;
+                color: #0984e3;
+            }
+            QListWidget { border: none; color: #2d3436; font-family: monospace; }
+        """)
+        layout = QVBoxLayout()
+        self.toggle_btn = QPushButton()
+        self.toggle_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #74b9ff;
+                color: white;
+                border-radius: 5px;
+                padding: 6px;
+            }
+            QPushButton:hover { background-color: #0984e3; }
+        """)
+        self.toggle_btn.clicked.connect(self.toggle_listener)
+        self.messages = QListWidget()
+        self.messages.setMaximumHeight(220)
+        layout.addWidget(self.toggle_btn)
+        layout.addWidget(self.messages)
+        self.setLayout(layout)
+
+    def update_button(self):
+        if self.receiver.running:
+            self.toggle_btn.setText(f"Stop Listener (port {self.receiver.port})")
+        else:
+            self.toggle_btn.setText(f"Start Listener (port {self.receiver.port})")
+
+    def toggle_listener(self):
+        if self.receiver.running:
+            self.receiver.stop()
+        elif not self.receiver.start():
+            QMessageBox.critical(self, "Syslog", self.receiver.error or "Failed to start syslog listener")
+        self.update_button()
+
+    def show_batch(self, batch):
+        for event in batch[-self.MAX_ITEMS:]:
+            self.messages.insertItem(
+                0, f"{event['timestamp']:%H:%M:%S}  {event['router']:<15} {event['message']}"
+            )
+        while self.messages.count() > self.MAX_ITEMS:
+            self.messages.takeItem(self.messages.count() - 1)
+
+    def detach(self):
+        if self._listener in self.receiver.listeners:
+            self.receiver.listeners.remove(self._listener)
+
 class MonitorPage(QWidget):
     logout_requested = pyqtSignal()
     refresh_needed = pyqtSignal()
@@ -132,10 +339,18 @@ class MonitorPage(QWidget):
         super().__init__()
         self.stacked_widget = stacked_widget
         self.child_windows = []
+        self.router_cards = []
         self.admin_clicks = 0
+        # Live data from the collector process when one runs, else polled here
+        self.live_view = connect_live_view()
         self.setup_ui()
         self.setStyleSheet("background-color: #f5f6fa;")
         self.refresh_needed.connect(self.load_routers)
+        get_backup_scheduler().start()
+        get_job_queue().start()
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.refresh_card_stats)
+        self.stats_timer.start(5000)
 
     def setup_ui(self):
         main_layout = QHBoxLayout()
@@ -155,6 +370,12 @@ class MonitorPage(QWidget):
         content_layout = QVBoxLayout(self.content_page)
         content_layout.addWidget(self.create_header())
         content_layout.addWidget(self.create_router_grid())
+        panels = QHBoxLayout()
+        self.top_interfaces = TopInterfacesPanel(self.live_view)
+        self.live_syslog = LiveSyslogPanel()
+        panels.addWidget(self.top_interfaces, stretch=3)
+        panels.addWidget(self.live_syslog, stretch=2)
+        content_layout.addLayout(panels)
         self.stacked_right.addWidget(self.content_page)
 
         # Create logs page
@@ -203,7 +424,8 @@ class MonitorPage(QWidget):
         
         self.nav_list = QListWidget()
         self.nav_list.addItems(["Dashboard", "Manage Configuration", 
-                              "Manage Equipment", "Logout"])
+                              "Manage Equipment", "Search Configurations",
+                              "Event Timeline", "Deployment Jobs", "Logout"])
         self.nav_list.itemClicked.connect(self.handle_navigation)
         self.nav_list.setStyleSheet("""
             QListWidget {
@@ -300,12 +522,20 @@ class MonitorPage(QWidget):
 
     def load_routers(self):
         self.clear_layout(self.grid_layout)
+        self.router_cards = []
         routers = fetch_routers()
         
         for i, router in enumerate(routers):
             card = RouterCard(router)
             card.status_requested.connect(self.show_router_stats)
             self.grid_layout.addWidget(card, i // 3, i % 3)
+            self.router_cards.append(card)
+        self.refresh_card_stats()
+
+    def refresh_card_stats(self):
+        store = get_metrics_store()
+        for card in self.router_cards:
+            card.refresh_stats(store, self.live_view)
 
     def clear_layout(self, layout):
         while layout.count():
@@ -319,7 +549,8 @@ class MonitorPage(QWidget):
             router_name=router_data['name'],
             host=router_data['ip'],
             username=router_data['username'],
-            password=router_data['password']
+            password=router_data['password'],
+            router=router_data
         )
         self.add_child_window(stats_window)
         stats_window.show()
@@ -334,6 +565,9 @@ class MonitorPage(QWidget):
             "Logout": self.handle_logout,
             "Manage Configuration": self.open_modify_page,
             "Manage Equipment": self.open_equipment_manager,
+            "Search Configurations": self.open_config_search,
+            "Event Timeline": self.open_event_timeline,
+            "Deployment Jobs": self.open_jobs_page,
             "Dashboard": self.refresh_needed.emit
         }.get(action, lambda: None)()
 
@@ -347,6 +581,13 @@ class MonitorPage(QWidget):
                 for window in self.child_windows:
                     window.close()
                 self.child_windows.clear()
+                get_backup_scheduler().stop()
+                # Unsubscribes from a collector process (which keeps polling)
+                # or stops the in-process poller and probe engine
+                self.live_view.stop()
+                get_job_queue().stop()
+                self.live_syslog.detach()
+                get_syslog_receiver().stop()
                 self.logout_requested.emit()
 
     def open_modify_page(self):
@@ -354,6 +595,21 @@ class MonitorPage(QWidget):
         self.add_child_window(window)
         window.show()
 
+    def open_config_search(self):
+        window = ConfigSearchPage(self.stacked_widget)
+        self.add_child_window(window)
+        window.show()
+
+    def open_event_timeline(self):
+        window = EventTimelinePage(self.stacked_widget)
+        self.add_child_window(window)
+        window.show()
+
+    def open_jobs_page(self):
+        window = JobsPage(self.stacked_widget)
+        self.add_child_window(window)
+        window.show()
+
     def open_equipment_manager(self):
         window = EquipmentManager(self.stacked_widget)
         self.add_child_window(window)
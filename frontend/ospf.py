@@ -5,7 +5,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
-from backend.ospf import get_routers, apply_ospf_config, delete_ospf_config, delete_ospf_network
+from backend.ospf import get_routers
+from frontend.jobs_page import queue_job
 
 class OSPFConfig(QWidget):
     def __init__(self, stacked_widget=None):
@@ -220,8 +221,9 @@ class OSPFConfig(QWidget):
             QMessageBox.warning(self, "Error", "Add at least one valid network configuration!")
             return
 
-        result = apply_ospf_config(router, networks, ospf_id)
-        self.show_result("OSPF Configuration", result)
+        queue_job(self, "apply_ospf_config",
+                  dict(router_name=router, networks=networks, ospf_id=ospf_id),
+                  f"Apply OSPF {ospf_id} on {router}")
 
     def delete_all_config(self):
         router = self.router_selector.currentText()
@@ -240,8 +242,9 @@ class OSPFConfig(QWidget):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if confirm == QMessageBox.StandardButton.Yes:
-            result = delete_ospf_config(router, ospf_id)
-            self.show_result("OSPF Deletion", result)
+            queue_job(self, "delete_ospf_config",
+                      dict(router_name=router, ospf_id=ospf_id),
+                      f"Delete OSPF {ospf_id} on {router}")
 
     def delete_single_network(self):
         router = self.router_selector.currentText()
@@ -269,15 +272,10 @@ class OSPFConfig(QWidget):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if confirm == QMessageBox.StandardButton.Yes:
-            result = delete_ospf_network(router, network['network'], network['mask'], network['area'], ospf_id)
-            self.show_result("Network Deletion", result)
-
-    def show_result(self, title, result):
-        if isinstance(result, bool) and result:
-            QMessageBox.information(self, title, "Operation completed successfully!")
-            self.load_routers()
-        else:
-            QMessageBox.critical(self, "Error", f"Operation failed:\n{str(result)}")
+            queue_job(self, "delete_ospf_network",
+                      dict(router_name=router, network=network['network'], mask=network['mask'],
+                           area=network['area'], ospf_id=ospf_id),
+                      f"Delete OSPF {ospf_id} network {network['network']} on {router}")
 
     def go_back(self):
         if self.stacked_widget:
@@ -0,0 +1,147 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QLineEdit, QTableWidget, QTableWidgetItem, QHeaderView,
+    QGroupBox, QMessageBox
+)
+from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt
+from backend.config_index import get_config_index, timed_search
+from backend.config_backup import get_backup_scheduler
+
+class ConfigSearchPage(QWidget):
+    def __init__(self, stacked_widget=None):
+        super().__init__()
+        self.stacked_widget = stacked_widget
+        self.setWindowTitle("Configuration Search")
+        self.setMinimumSize(1200, 800)
+        self.setup_ui()
+        self.apply_styles()
+        get_backup_scheduler().listeners.append(self.on_backup_finished)
+        self.refresh_index()
+
+    def apply_styles(self):
+        self.setStyleSheet("""
+            QWidget { background-color: #f5f6fa; color: #2d3436; }
+            QGroupBox {
+                border: 2px solid #74b9ff;
+                border-radius: 10px;
+                margin-top: 1ex;
+                padding-top: 10px;
+            }
+            QGroupBox::title {
+                color: #0984e3;
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 3px;
+            }
+            QLineEdit, QPushButton {
+                border: 1px solid #74b9ff;
+                border-radius: 5px;
+                padding: 8px;
+                font-size: 14px;
+            }
+            QPushButton {
+                background-color: #74b9ff;
+                color: white;
+            }
+            QPushButton:hover { background-color: #0984e3; }
+            QTableWidget {
+                background-color: white;
+                border: 1px solid #dcdde1;
+            }
+            QHeaderView::section {
+                background-color: #74b9ff;
+                color: white;
+                padding: 8px;
+            }
+        """)
+
+    def setup_ui(self):
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(30, 30, 30, 30)
+        main_layout.setSpacing(20)
+
+        # Header
+        header = QLabel("Fleet Configuration Search")
+        header.setFont(QFont("Arial", 24, QFont.Weight.Bold))
+        header.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        header.setStyleSheet("color: #0984e3; margin-bottom: 20px;")
+        main_layout.addWidget(header)
+
+        # Query
+        query_group = QGroupBox("Query")
+        query_layout = QVBoxLayout()
+        input_layout = QHBoxLayout()
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText('e.g. neighbor 10.0.0.5, vrf definition CUST-A, in:interface mpls ip, neighbor 10.0.0.*')
+        self.query_input.returnPressed.connect(self.run_search)
+        search_btn = QPushButton("Search")
+        search_btn.clicked.connect(self.run_search)
+        refresh_btn = QPushButton("Refresh Index")
+        refresh_btn.clicked.connect(self.refresh_index)
+        input_layout.addWidget(self.query_input, 4)
+        input_layout.addWidget(search_btn, 1)
+        input_layout.addWidget(refresh_btn, 1)
+        self.status_label = QLabel("")
+        query_layout.addLayout(input_layout)
+        query_layout.addWidget(self.status_label)
+        query_group.setLayout(query_layout)
+        main_layout.addWidget(query_group)
+
+        # Results
+        results_group = QGroupBox("Results")
+        results_layout = QVBoxLayout()
+        self.results_table = QTableWidget()
+        self.results_table.setColumnCount(4)
+        self.results_table.setHorizontalHeaderLabels(["Router", "Section", "Line", "Configuration"])
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.results_table.verticalHeader().setVisible(False)
+        self.results_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        results_layout.addWidget(self.results_table)
+        results_group.setLayout(results_layout)
+        main_layout.addWidget(results_group)
+
+        back_btn = QPushButton("Back")
+        back_btn.clicked.connect(self.close)
+        main_layout.addWidget(back_btn)
+
+        self.setLayout(main_layout)
+
+    def refresh_index(self):
+        try:
+            get_config_index().refresh()
+            stats = get_config_index().stats()
+            self.status_label.setText(
+                f"Indexed {stats['routers']} routers ({stats['configs']} distinct configurations)"
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load stored configurations: {str(e)}")
+
+    def on_backup_finished(self, results):
+        # Called from the backup thread; the index guards itself with a lock
+        get_config_index().refresh()
+
+    def run_search(self):
+        query = self.query_input.text().strip()
+        if not query:
+            return
+        results, elapsed = timed_search(query)
+        routers = {r['router'] for r in results}
+        self.status_label.setText(
+            f"{len(results)} matching lines on {len(routers)} routers ({elapsed:.1f} ms)"
+        )
+
+        self.results_table.setUpdatesEnabled(False)
+        self.results_table.setRowCount(len(results))
+        for row, result in enumerate(results):
+            self.results_table.setItem(row, 0, QTableWidgetItem(f"{result['router']} ({result['ip']})"))
+            self.results_table.setItem(row, 1, QTableWidgetItem(result['section']))
+            self.results_table.setItem(row, 2, QTableWidgetItem(str(result['line_no'])))
+            self.results_table.setItem(row, 3, QTableWidgetItem(result['line']))
+        self.results_table.setUpdatesEnabled(True)
+
+    def closeEvent(self, event):
+        listeners = get_backup_scheduler().listeners
+        if self.on_backup_finished in listeners:
+            listeners.remove(self.on_backup_finished)
+        super().closeEvent(event)
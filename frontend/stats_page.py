@@ -1,38 +1,76 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QGridLayout, 
     QHBoxLayout, QPushButton, QGroupBox, QFrame,
-    QMessageBox
+    QMessageBox, QComboBox
 )
 from PyQt6.QtCore import QTimer, Qt, pyqtSignal
 from PyQt6.QtGui import QFont
+import time
+import datetime
+import threading
+import numpy as np
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from backend.Router_stats import get_router_stats
+from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
+from backend.Router_stats import get_stats_for_router
+from backend.metrics_store import get_metrics_store
+from backend.metrics_history import load_history
+from backend.downsample import lttb
+from backend.stats_parsers import format_uptime
+from backend.resilience import breaker_state, OPEN
+
+# Display mode -> seconds of history shown (None: live window from the store)
+HISTORY_RANGES = {
+    "Live": None,
+    "Last hour": 3600,
+    "Last 24 hours": 86400,
+    "Last 7 days": 7 * 86400,
+    "Last 30 days": 30 * 86400,
+}
+STORE_REFRESH = 5000  # ms between redraws from the metrics store
+STALE_AFTER = 300     # seconds without a sample before the router is shown as not answering
+UTC_OFFSET = datetime.datetime.now().astimezone().utcoffset().total_seconds()
+
+def to_plot_time(timestamps):
+    """Epoch seconds to matplotlib date numbers in local time"""
+    return (np.asarray(timestamps) + UTC_OFFSET) / 86400.0
+
+def from_plot_time(value):
+    return value * 86400.0 - UTC_OFFSET
 
 class StatsWindow(QWidget):
     update_error = pyqtSignal(str)
+    stats_fetched = pyqtSignal(dict)
     
-    def __init__(self, router_name, host, username, password, parent=None):
+    def __init__(self, router_name, host, username, password, parent=None, router=None):
         super().__init__(parent)
         self.router_name = router_name
         self.host = host  # accepts hostnames
         self.credentials = (username, password)
+        # Full router record carries the per-router stats backend setting
+        self.router = router or {
+            'name': router_name, 'ip': host, 'username': username, 'password': password
+        }
         
         self.setWindowTitle(f"{router_name} Statistics")
         self.setGeometry(200, 100, 800, 650)
         
-        # Data storage
-        self.cpu_data = []
-        self.memory_data = []
+        # Samples live in the shared metrics store, charts read views of it
+        self.store = get_metrics_store()
         self.max_points = 20
         self.last_uptime = "N/A"
+        # History mode: raw samples loaded for the covered range, per metric
+        self.history_range = None
+        self.history = {}
+        # One dialog per outage; later failures only update the status line
+        self.error_reported = False
         
         # UI elements
         self.init_ui()
         self.setup_charts()
-        self.start_monitoring()
-
         self.update_error.connect(self.show_error_message)
+        self.start_monitoring()
 
     def init_ui(self):
         main_layout = QVBoxLayout()
@@ -49,9 +87,14 @@ class StatsWindow(QWidget):
         
         self.btn_back = QPushButton("← Back")
         self.btn_back.clicked.connect(self.close)
+
+        self.range_selector = QComboBox()
+        self.range_selector.addItems(HISTORY_RANGES.keys())
+        self.range_selector.currentTextChanged.connect(self.change_range)
         
         header.addWidget(self.btn_back)
         header.addWidget(self.title)
+        header.addWidget(self.range_selector)
         header.addWidget(self.status_label)
         main_layout.addLayout(header)
 
@@ -95,12 +138,16 @@ class StatsWindow(QWidget):
         ax.set_facecolor("#f5f6fa")
         ax.tick_params(colors="#2d3436")
         ax.set_ylim(0, 100)
-        ax.set_xlim(0, self.max_points)
+        ax.xaxis_date()
+        ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(ax.xaxis.get_major_locator()))
         
         canvas = FigureCanvas(fig)
         canvas.setStyleSheet("background: transparent;")
+        # Zoom and pan; the new range is refetched at screen resolution
+        toolbar = NavigationToolbar(canvas, self)
         
         layout.addWidget(lbl)
+        layout.addWidget(toolbar)
         layout.addWidget(canvas)
         box.setLayout(layout)
         return box
@@ -114,58 +161,103 @@ class StatsWindow(QWidget):
         self.mem_ax = self.mem_group.findChild(FigureCanvas).figure.axes[0]
         self.mem_line, = self.mem_ax.plot([], [], color="#2ecc71")
 
+        self.charts = {
+            'cpu': (self.cpu_ax, self.cpu_line, self.cpu_group.findChild(FigureCanvas)),
+            'memory': (self.mem_ax, self.mem_line, self.mem_group.findChild(FigureCanvas)),
+        }
+        # Refetch after zoom/pan settles rather than on every intermediate limit
+        self.zoom_timer = QTimer(self)
+        self.zoom_timer.setSingleShot(True)
+        self.zoom_timer.setInterval(200)
+        self.zoom_timer.timeout.connect(self.redraw_history)
+        self._redrawing = False
+        self._zoom_source = self.cpu_ax
+        for ax, _, _ in self.charts.values():
+            ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+
     def start_monitoring(self):
+        # The fleet poller (or the collector process) keeps the store filled;
+        # this window only redraws from it, so the router is not polled twice
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.safe_update)
-        self.timer.start(15000)  # 15 seconds
-        self.safe_update()  # Initial update
+        self.timer.timeout.connect(self.refresh_from_store)
+        self.stats_fetched.connect(self.process_stats)
+        self.closed = False
+        self.timer.start(STORE_REFRESH)
+        if self.store.latest(self.router_name, 'cpu') is None:
+            # Not polled yet: fetch one sample now instead of waiting for the poller's turn
+            self.status_label.setText("◌ Fetching first sample...")
+            threading.Thread(target=self.poll_router, daemon=True).start()
+        else:
+            self.refresh_from_store()
 
-    def safe_update(self):
+    def poll_router(self):
+        # Connect retries and timeouts can take tens of seconds: keep them off the GUI thread
         try:
-            stats = get_router_stats(self.host, *self.credentials)
-            if stats.get('error'):
-                raise Exception(stats['error'])
-                
-            self.process_stats(stats)
-            self.status_label.setText("◌ Connected")
-            self.status_label.setStyleSheet("color: #27ae60;")
+            stats = get_stats_for_router(self.router)
         except Exception as e:
-            self.handle_error(str(e))
-            self.status_label.setText("◌ Connection Error")
-            self.status_label.setStyleSheet("color: #e74c3c;")
+            stats = {'error': str(e)}
+        stats['timestamp'] = time.time()
+        try:
+            self.stats_fetched.emit(stats)
+        except RuntimeError:
+            pass  # window deleted while the poll ran
 
     def process_stats(self, stats):
-        """Update all stats with validation"""
-        # CPU
-        if stats.get('cpu') is not None and 0 <= stats['cpu'] <= 100:
-            self.update_dataset(self.cpu_data, stats['cpu'])
-            self.update_cpu_chart()
-        
-        # Memory
-        if stats.get('memory') is not None and 0 <= stats['memory'] <= 100:
-            self.update_dataset(self.memory_data, stats['memory'])
-            self.update_mem_chart()
-        
-        # Uptime
-        uptime = stats.get('uptime', "N/A")
-        if uptime != "N/A":
-            self.last_uptime = uptime
-        self.uptime_label.setText(f"Uptime: {self.last_uptime}")
+        """Store the first sample unless the poller got there first"""
+        if self.closed:
+            return
+        if stats.get('error'):
+            self.handle_error(stats['error'])
+            self.status_label.setText("◌ Connection Error (waiting for the fleet poller)")
+            self.status_label.setStyleSheet("color: #e74c3c;")
+            return
+        if self.store.latest(self.router_name, 'cpu') is None:
+            valid = {
+                metric: stats.get(metric)
+                for metric in ('cpu', 'memory')
+                if stats.get(metric) is not None and 0 <= stats[metric] <= 100
+            }
+            valid['uptime'] = stats.get('uptime_seconds')
+            self.store.append_sample(self.router_name, valid, stats['timestamp'])
+        self.refresh_from_store()
 
-    def update_dataset(self, dataset, value):
-        """Maintain rolling data window"""
-        dataset.append(value)
-        if len(dataset) > self.max_points:
-            dataset.pop(0)
+    def refresh_from_store(self):
+        """Redraw from the shared metrics store and show how fresh its data is"""
+        self.update_cpu_chart()
+        self.update_mem_chart()
+        times, _ = self.store.window(self.router_name, 'cpu', 1)
+        if not len(times):
+            return
+        uptime = self.store.latest(self.router_name, 'uptime')
+        if uptime is not None:
+            self.last_uptime = format_uptime(int(uptime))
+        age = time.time() - times[-1]
+        if age <= STALE_AFTER:
+            self.error_reported = False
+            self.status_label.setText(f"◌ Connected (last sample {age:.0f}s ago)")
+            self.status_label.setStyleSheet("color: #27ae60;")
+            self.uptime_label.setText(f"Uptime: {self.last_uptime}")
+            return
+        breaker = breaker_state(self.host)
+        if breaker and breaker['state'] == OPEN:
+            self.status_label.setText(f"◌ Circuit open after {breaker['failures']} failures "
+                                      f"(next attempt in {breaker['retry_in']:.0f}s)")
+        else:
+            self.status_label.setText(f"◌ No sample for {age:.0f}s")
+        self.status_label.setStyleSheet("color: #e74c3c;")
+        self.uptime_label.setText(f"Uptime: {self.last_uptime} (Last Known)")
 
     def update_cpu_chart(self):
         """Update CPU chart specifically"""
         value_label = self.cpu_group.findChild(QLabel, "value_label")
         canvas = self.cpu_group.findChild(FigureCanvas)
         
-        if self.cpu_data:
-            value_label.setText(f"{self.cpu_data[-1]:.1f}%")
-            self.cpu_line.set_data(range(len(self.cpu_data)), self.cpu_data)
+        times, values = self.store.window(self.router_name, "cpu", self.max_points)
+        if len(values):
+            value_label.setText(f"{values[-1]:.1f}%")
+            if self.history_range is not None:
+                return  # history mode keeps its own view; only the value label is live
+            self.cpu_line.set_data(to_plot_time(times), values)
             self.cpu_ax.relim()
             self.cpu_ax.autoscale_view(True, True, True)
             canvas.draw_idle()
@@ -175,16 +267,85 @@ class StatsWindow(QWidget):
         value_label = self.mem_group.findChild(QLabel, "value_label")
         canvas = self.mem_group.findChild(FigureCanvas)
         
-        if self.memory_data:
-            value_label.setText(f"{self.memory_data[-1]:.1f}%")
-            self.mem_line.set_data(range(len(self.memory_data)), self.memory_data)
+        times, values = self.store.window(self.router_name, "memory", self.max_points)
+        if len(values):
+            value_label.setText(f"{values[-1]:.1f}%")
+            if self.history_range is not None:
+                return  # history mode keeps its own view; only the value label is live
+            self.mem_line.set_data(to_plot_time(times), values)
             self.mem_ax.relim()
             self.mem_ax.autoscale_view(True, True, True)
             canvas.draw_idle()
 
+    def change_range(self, label):
+        """Switch between the live window and a stored history range"""
+        span = HISTORY_RANGES[label]
+        if span is None:
+            self.history_range = None
+            self.history = {}
+            self.update_cpu_chart()
+            self.update_mem_chart()
+            return
+        end = time.time()
+        self.load_history_range(end - span, end)
+        self._redrawing = True
+        try:
+            for ax, _, _ in self.charts.values():
+                ax.set_xlim(to_plot_time(end - span), to_plot_time(end))
+        finally:
+            self._redrawing = False
+        self._zoom_source = self.cpu_ax
+        self.redraw_history()
+
+    def load_history_range(self, start, end):
+        try:
+            self.history = {metric: load_history(self.router_name, metric, start, end)
+                            for metric in self.charts}
+            self.history_range = (start, end)
+        except Exception as e:
+            self.history = {metric: (np.empty(0), np.empty(0)) for metric in self.charts}
+            self.history_range = (start, end)
+            QMessageBox.warning(self, "History", f"Failed to load stored metrics: {str(e)}")
+
+    def on_xlim_changed(self, ax):
+        if self.history_range is not None and not self._redrawing:
+            self._zoom_source = ax
+            self.zoom_timer.start()
+
+    def redraw_history(self):
+        """Draw the visible range downsampled to the chart's pixel width"""
+        if self.history_range is None:
+            return
+        limits = self._zoom_source.get_xlim()
+        start, end = (from_plot_time(value) for value in limits)
+        loaded_start, loaded_end = self.history_range
+        if start < loaded_start or end > loaded_end:
+            # Panned or zoomed out past what is loaded: fetch the new range
+            self.load_history_range(start, end)
+
+        for metric, (ax, line, canvas) in self.charts.items():
+            if ax is not self._zoom_source:
+                # Both charts follow the one that was zoomed or panned
+                self._redrawing = True
+                try:
+                    ax.set_xlim(limits)
+                finally:
+                    self._redrawing = False
+            times, values = self.history.get(metric, (np.empty(0), np.empty(0)))
+            lo, hi = np.searchsorted(times, [start, end])
+            # Keep one point either side so lines run to the chart edges
+            lo, hi = max(lo - 1, 0), min(hi + 1, len(times))
+            width = max(int(canvas.width()), 100)
+            x, y = lttb(times[lo:hi], values[lo:hi], width)
+            line.set_data(to_plot_time(x), y)
+            canvas.draw_idle()
+
     def handle_error(self, message):
         """Handle error states"""
-        self.update_error.emit(message)
+        self.status_label.setToolTip(message)
+        if not self.error_reported:
+            self.error_reported = True
+            self.update_error.emit(message)
         self.uptime_label.setText(f"Uptime: {self.last_uptime} (Last Known)")
 
     def show_error_message(self, message):
@@ -237,5 +398,6 @@ class StatsWindow(QWidget):
         """)
 
     def closeEvent(self, event):
+        self.closed = True
         self.timer.stop()
         super().closeEvent(event)
\ No newline at end of file
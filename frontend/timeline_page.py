@@ -0,0 +1,170 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QComboBox, QTableWidget, QTableWidgetItem, QHeaderView,
+    QGroupBox
+)
+from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt
+import datetime
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from backend.events import list_events
+from backend.monitor import fetch_routers
+
+EVENT_TYPES = {"All events": None, "Reboots": ["reboot"], "Alerts": ["alert"], "Syslog": ["syslog"]}
+RANGES = {"Last 24 hours": 1, "Last 7 days": 7, "Last 30 days": 30}
+TYPE_COLORS = {"reboot": "#d63031", "alert": "#e17055", "syslog": "#6c5ce7"}
+ALL_ROUTERS = "All routers"
+
+class EventTimelinePage(QWidget):
+    def __init__(self, stacked_widget=None):
+        super().__init__()
+        self.stacked_widget = stacked_widget
+        self.setWindowTitle("Event Timeline")
+        self.setMinimumSize(1200, 800)
+        self.setup_ui()
+        self.apply_styles()
+        self.load_events()
+
+    def apply_styles(self):
+        self.setStyleSheet("""
+            QWidget { background-color: #f5f6fa; color: #2d3436; }
+            QGroupBox {
+                border: 2px solid #74b9ff;
+                border-radius: 10px;
+                margin-top: 1ex;
+                padding-top: 10px;
+            }
+            QGroupBox::title {
+                color: #0984e3;
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 3px;
+            }
+            QComboBox, QPushButton {
+                border: 1px solid #74b9ff;
+                border-radius: 5px;
+                padding: 8px;
+                font-size: 14px;
+            }
+            QPushButton {
+                background-color: #74b9ff;
+                color: white;
+            }
+            QPushButton:hover { background-color: #0984e3; }
+            QTableWidget {
+                background-color: white;
+                border: 1px solid #dcdde1;
+            }
+            QHeaderView::section {
+                background-color: #74b9ff;
+                color: white;
+                padding: 8px;
+            }
+        """)
+
+    def setup_ui(self):
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(30, 30, 30, 30)
+        main_layout.setSpacing(20)
+
+        header = QLabel("Event Timeline")
+        header.setFont(QFont("Arial", 24, QFont.Weight.Bold))
+        header.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        header.setStyleSheet("color: #0984e3; margin-bottom: 20px;")
+        main_layout.addWidget(header)
+
+        # Filters
+        filter_layout = QHBoxLayout()
+        self.router_selector = QComboBox()
+        self.router_selector.addItem(ALL_ROUTERS)
+        self.router_selector.addItems([router['name'] for router in fetch_routers()])
+        self.type_selector = QComboBox()
+        self.type_selector.addItems(EVENT_TYPES.keys())
+        self.range_selector = QComboBox()
+        self.range_selector.addItems(RANGES.keys())
+        for selector in (self.router_selector, self.type_selector, self.range_selector):
+            selector.currentTextChanged.connect(self.load_events)
+            filter_layout.addWidget(selector)
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.load_events)
+        filter_layout.addWidget(refresh_btn)
+        main_layout.addLayout(filter_layout)
+
+        # Timeline chart: one row per router, one marker per event
+        chart_group = QGroupBox("Timeline")
+        chart_layout = QVBoxLayout()
+        self.figure, self.ax = plt.subplots(figsize=(10, 3))
+        self.canvas = FigureCanvas(self.figure)
+        chart_layout.addWidget(self.canvas)
+        chart_group.setLayout(chart_layout)
+        main_layout.addWidget(chart_group)
+
+        # Event list
+        list_group = QGroupBox("Events")
+        list_layout = QVBoxLayout()
+        self.events_table = QTableWidget()
+        self.events_table.setColumnCount(5)
+        self.events_table.setHorizontalHeaderLabels(["Time", "Router", "Type", "Severity", "Message"])
+        self.events_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.events_table.horizontalHeader().setStretchLastSection(True)
+        self.events_table.verticalHeader().setVisible(False)
+        self.events_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        list_layout.addWidget(self.events_table)
+        self.status_label = QLabel("")
+        list_layout.addWidget(self.status_label)
+        list_group.setLayout(list_layout)
+        main_layout.addWidget(list_group, stretch=1)
+
+        back_btn = QPushButton("Back")
+        back_btn.clicked.connect(self.close)
+        main_layout.addWidget(back_btn)
+
+        self.setLayout(main_layout)
+
+    def load_events(self):
+        router = self.router_selector.currentText()
+        since = datetime.datetime.now() - datetime.timedelta(days=RANGES[self.range_selector.currentText()])
+        events = list_events(
+            router=None if router == ALL_ROUTERS else router,
+            types=EVENT_TYPES[self.type_selector.currentText()],
+            since=since,
+            limit=2000
+        )
+        self.populate_table(events)
+        self.draw_timeline(events, since)
+        self.status_label.setText(f"{len(events)} events")
+
+    def populate_table(self, events):
+        self.events_table.setUpdatesEnabled(False)
+        self.events_table.setRowCount(len(events))
+        for row, event in enumerate(events):
+            values = [
+                event['timestamp'].strftime("%Y-%m-%d %H:%M:%S"),
+                event.get('router', ''), event.get('type', ''),
+                event.get('severity', ''), event.get('message', '')
+            ]
+            for column, value in enumerate(values):
+                self.events_table.setItem(row, column, QTableWidgetItem(value))
+        self.events_table.setUpdatesEnabled(True)
+
+    def draw_timeline(self, events, since):
+        self.ax.clear()
+        routers = sorted({event.get('router', '') for event in events})
+        positions = {router: i for i, router in enumerate(routers)}
+        for event_type in sorted({event.get('type', '') for event in events}):
+            selected = [event for event in events if event.get('type') == event_type]
+            self.ax.scatter(
+                [event['timestamp'] for event in selected],
+                [positions[event.get('router', '')] for event in selected],
+                color=TYPE_COLORS.get(event_type, "#0984e3"), label=event_type, s=30
+            )
+        self.ax.set_yticks(range(len(routers)))
+        self.ax.set_yticklabels(routers)
+        self.ax.set_xlim(since, datetime.datetime.now())
+        self.ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(self.ax.xaxis.get_major_locator()))
+        if events:
+            self.ax.legend(loc="upper left", fontsize=8)
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
@@ -4,7 +4,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
-from backend.vrf_config import fetch_routers_from_db, fetch_interfaces, send_vrf_configuration, remove_vrf_configuration
+from backend.vrf_config import fetch_routers_from_db, fetch_interfaces
+from frontend.jobs_page import queue_job
 
 class VRFConfig(QWidget):
     def __init__(self, stacked_widget=None):
@@ -167,22 +168,15 @@ class VRFConfig(QWidget):
         interface = fields["Interface"] if fields["Interface"] != "-- Optional Interface --" else None
 
         try:
-            response = send_vrf_configuration(
+            job_id = queue_job(self, "send_vrf_configuration", dict(
                 router=fields["Router"],
                 vrf_name=fields["VRF Name"],
                 rd_value=fields["Route Distinguisher"],
                 rt_value=fields["Route Target"],
                 interface=interface
-            )
-
-            if response["success"]:
-                QMessageBox.information(self, "Success", 
-                    f"VRF '{fields['VRF Name']}' created successfully!\n"
-                    f"Router: {fields['Router']['name']}\n")
+            ), f"Apply VRF '{fields['VRF Name']}' on {fields['Router']['name']}")
+            if job_id:
                 self.clear_form()
-            else:
-                QMessageBox.critical(self, "Error", 
-                    f"Configuration failed:\n{response['error']}")
 
         except Exception as e:
             QMessageBox.critical(self, "Exception", f"An error occurred: {str(e)}")
@@ -206,15 +200,12 @@ class VRFConfig(QWidget):
         
         if confirm == QMessageBox.StandardButton.Yes:
             try:
-                response = remove_vrf_configuration(router, vrf_name)
-                if response["success"]:
-                    QMessageBox.information(self, "Success", 
-                        f"VRF '{vrf_name}' removed successfully!\n")
+                job_id = queue_job(self, "remove_vrf_configuration",
+                                   dict(router=router, vrf_name=vrf_name),
+                                   f"Delete VRF '{vrf_name}' on {router['name']}")
+                if job_id:
                     self.remove_vrf_input.clear()
-                else:
-                    QMessageBox.critical(self, "Error", 
-                        f"Removal failed:\n{response['error']}")
-                        
+
             except Exception as e:
                 QMessageBox.critical(self, "Exception", f"An error occurred: {str(e)}")
 